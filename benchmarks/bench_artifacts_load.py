@@ -0,0 +1,104 @@
+"""Artifact-browsing load test: per-request boto3 client + inline call vs shared client + AWS pool.
+
+S3 is faked with a botocore ``before-call`` hook that sleeps for the given
+latency, so real client construction and request serialisation costs are
+kept while no network or credentials are needed.
+
+    uv run python -m benchmarks.bench_artifacts_load [--requests 200] [--rate 100]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+
+import boto3
+
+from gamma.services.aws import get_boto_client, run_aws, shutdown_aws_executor
+from gamma.services.s3_service import S3Service
+
+LISTING = {
+    "Contents": [
+        {
+            "Key": f"ckpt/step-{i}.pt",
+            "Size": 1024,
+            "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "ETag": '"etag"',
+        }
+        for i in range(100)
+    ],
+    "IsTruncated": False,
+}
+
+
+class _FakeHTTP:
+    status_code = 200
+
+
+def _install_fake_s3(client, latency: float) -> None:
+    def respond(**kwargs):
+        time.sleep(latency)
+        return _FakeHTTP(), LISTING
+
+    client.meta.events.register("before-call.s3.ListObjectsV2", respond)
+
+
+def _before(latency: float) -> None:
+    # Old path: build a client per request and call it on the event loop
+    client = boto3.client("s3", region_name="us-east-1")
+    _install_fake_s3(client, latency)
+    client.list_objects_v2(Bucket="bucket", Prefix="ckpt/", MaxKeys=1000)
+
+
+async def _handler_before(latency: float) -> None:
+    _before(latency)
+
+
+async def _handler_after(latency: float) -> None:
+    await run_aws(S3Service().list_objects_page, "bucket", "ckpt/")
+
+
+async def _run(handler, requests: int, rate: float, latency: float) -> list[float]:
+    """Open-loop load: request i arrives at t0 + i / rate whether or not the
+    worker is keeping up, and latency is measured from that arrival time."""
+    t0 = time.perf_counter()
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        arrival = t0 + i / rate
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        await handler(latency)
+        latencies.append(time.perf_counter() - arrival)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+def _report(name: str, latencies: list[float], elapsed: float) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:>7}: p50 {q[49] * 1000:8.1f} ms   p99 {q[98] * 1000:8.1f} ms"
+        f"   {len(latencies) / elapsed:8.1f} req/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=100.0, help="arrivals per second")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    _install_fake_s3(get_boto_client("s3"), latency)
+
+    for name, handler in (("before", _handler_before), ("after", _handler_after)):
+        start = time.perf_counter()
+        latencies = await _run(handler, args.requests, args.rate, latency)
+        _report(name, latencies, time.perf_counter() - start)
+
+    shutdown_aws_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Concurrent-request throughput: inline Supabase execute() vs the DB thread pool.
+
+Simulates a PostgREST round-trip with a blocking sleep and runs many
+handlers concurrently, the way uvicorn does on a single worker. Also
+measures event-loop lag, which is what stalls SSE streams and webhooks.
+
+    uv run python -m benchmarks.bench_db_concurrency [--requests 200] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import time
+
+from gamma.db import execute, shutdown_db_executor
+
+
+class FakeQuery:
+    """Stands in for a PostgREST builder whose execute() blocks on I/O."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def execute(self):
+        time.sleep(self.latency)
+        return {"data": []}
+
+
+async def _handler_inline(latency: float) -> None:
+    FakeQuery(latency).execute()
+
+
+async def _handler_pooled(latency: float) -> None:
+    await execute(FakeQuery(latency))
+
+
+async def _measure_lag(stop: asyncio.Event, samples: list[float]) -> None:
+    interval = 0.005
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+async def _run(handler, requests: int, latency: float) -> tuple[float, float]:
+    stop = asyncio.Event()
+    lag: list[float] = []
+    probe = asyncio.create_task(_measure_lag(stop, lag))
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(latency) for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    return requests / elapsed, max(lag, default=0.0)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    for name, handler in (("inline", _handler_inline), ("pooled", _handler_pooled)):
+        rps, max_lag = await _run(handler, args.requests, latency)
+        print(f"{name:>7}: {rps:8.1f} req/s   max loop lag {max_lag * 1000:8.1f} ms")
+
+    shutdown_db_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""Downsampling a synthetic one-million-point metric history.
+
+    uv run python -m benchmarks.bench_downsample [--points 1000000] [--max-points 2000]
+"""
+import argparse
+import json
+import math
+import random
+import time
+
+from gamma.services.downsample import downsample_history
+
+
+def _history(n: int) -> list[dict]:
+    rng = random.Random(0)
+    return [
+        {
+            "key": "loss",
+            "value": math.exp(-step / (n / 5)) + 0.05 * rng.random(),
+            "timestamp": 1_700_000_000_000 + step,
+            "step": step,
+        }
+        for step in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--max-points", type=int, default=2000)
+    args = parser.parse_args()
+
+    history = _history(args.points)
+    raw_bytes = len(json.dumps(history))
+    print(f"{'raw':>7}: {args.points:>9} points {raw_bytes / 1e6:8.1f} MB")
+    for method in ("lttb", "minmax"):
+        start = time.perf_counter()
+        reduced = downsample_history(history, args.max_points, method)
+        elapsed = time.perf_counter() - start
+        size = len(json.dumps(reduced))
+        print(
+            f"{method:>7}: {len(reduced):>9} points {size / 1e6:8.3f} MB"
+            f"   {elapsed * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
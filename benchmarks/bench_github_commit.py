@@ -0,0 +1,115 @@
+"""Multi-file commit latency: sequential Git Data API calls vs GitHubService.create_commit.
+
+GitHub is faked with an ``httpx.MockTransport`` that sleeps for the given
+round-trip latency per request, so the numbers reflect round trips and
+their overlap rather than GitHub's own processing time.
+
+    uv run python -m benchmarks.bench_github_commit [--files 10] [--latency-ms 80]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from gamma.services.github_service import INLINE_BLOB_MAX_BYTES, GitHubService
+
+REPO = "rsamf/gamma"
+BRANCH = "models/bench"
+
+
+class FakeGitHub:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.requests = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        path = request.url.path
+        if "/branches/" in path:
+            return httpx.Response(
+                200, json={"commit": {"sha": "head", "commit": {"tree": {"sha": "tree"}}}}
+            )
+        if "/git/ref/" in path:
+            return httpx.Response(200, json={"object": {"sha": "head"}})
+        if path.endswith("/git/commits/head"):
+            return httpx.Response(200, json={"tree": {"sha": "tree"}})
+        if request.method == "PATCH":
+            return httpx.Response(200, json={"object": {"sha": "new"}})
+        return httpx.Response(201, json={"sha": "new"})
+
+
+async def _sequential(github: GitHubService, files: dict[str, str]) -> None:
+    # What create_commit used to do: 4 + N requests, one after another
+    repo_path = f"/repos/{REPO}/git"
+    ref = await github._request("GET", f"{repo_path}/ref/heads/{BRANCH}", installation_id=1)
+    head = ref.json()["object"]["sha"]
+    commit = await github._request("GET", f"{repo_path}/commits/{head}", installation_id=1)
+    items = []
+    for path, content in files.items():
+        blob = await github._request(
+            "POST",
+            f"{repo_path}/blobs",
+            installation_id=1,
+            json={"content": content, "encoding": "utf-8"},
+        )
+        items.append({"path": path, "mode": "100644", "type": "blob", "sha": blob.json()["sha"]})
+    tree = await github._request(
+        "POST",
+        f"{repo_path}/trees",
+        installation_id=1,
+        json={"base_tree": commit.json()["tree"]["sha"], "tree": items},
+    )
+    new = await github._request(
+        "POST",
+        f"{repo_path}/commits",
+        installation_id=1,
+        json={"message": "bench", "tree": tree.json()["sha"], "parents": [head]},
+    )
+    await github._request(
+        "PATCH",
+        f"{repo_path}/refs/heads/{BRANCH}",
+        installation_id=1,
+        json={"sha": new.json()["sha"]},
+    )
+
+
+async def _optimized(github: GitHubService, files: dict[str, str]) -> None:
+    await github.create_commit(1, REPO, BRANCH, "bench", files)
+
+
+async def _bench(name: str, fn, files: dict[str, str], latency: float, rounds: int) -> None:
+    fake = FakeGitHub(latency)
+    github = GitHubService(http=httpx.AsyncClient(transport=httpx.MockTransport(fake)))
+
+    async def token(installation_id: int) -> str:
+        return "tok"
+
+    github._get_installation_token = token
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await fn(github, files)
+    per_commit = (time.perf_counter() - start) / rounds
+    print(f"{name:>10}: {per_commit * 1000:8.1f} ms/commit   {fake.requests / rounds:5.1f} requests")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=10, help="small text files per commit")
+    parser.add_argument("--large", type=int, default=2, help="files too big to inline")
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    files = {f"src/module_{i}.py": f"LR = {i}e-4\n" * 20 for i in range(args.files)}
+    files.update(
+        {f"data/large_{i}.txt": "x" * (INLINE_BLOB_MAX_BYTES + 1) for i in range(args.large)}
+    )
+    latency = args.latency_ms / 1000
+    await _bench("sequential", _sequential, files, latency, args.rounds)
+    await _bench("optimized", _optimized, files, latency, args.rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
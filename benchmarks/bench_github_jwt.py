@@ -0,0 +1,59 @@
+"""GitHub App JWT cost: parse + sign per call vs cached key vs reused JWT.
+
+    uv run python -m benchmarks.bench_github_jwt [--iterations 500]
+"""
+import argparse
+import time
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from gamma.services.github_auth import AppJWTSigner, load_signing_key
+
+
+def _pem() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def _uncached(pem: str) -> str:
+    # What GitHubService._generate_jwt used to do on every call
+    now = int(time.time())
+    payload = {"iat": now - 60, "exp": now + 600, "iss": "123"}
+    return jwt.encode(payload, pem.replace("\\n", "\n"), algorithm="RS256")
+
+
+def _cached_key(pem: str) -> str:
+    now = int(time.time())
+    payload = {"iat": now - 60, "exp": now + 600, "iss": "123"}
+    return jwt.encode(payload, load_signing_key(pem), algorithm="RS256")
+
+
+def _bench(name: str, fn, iterations: int) -> None:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call = (time.perf_counter() - start) / iterations
+    print(f"{name:>14}: {per_call * 1e6:10.1f} us/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    pem = _pem()
+    signer = AppJWTSigner("123", pem)
+    _bench("parse+sign", lambda: _uncached(pem), args.iterations)
+    _bench("cached key", lambda: _cached_key(pem), args.iterations)
+    _bench("reused jwt", signer.token, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
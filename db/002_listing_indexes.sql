@@ -0,0 +1,32 @@
+-- Keyset pagination for GET /api/jobs and GET /api/projects
+-- Listings are ordered by (created_at DESC, id DESC); every supported filter
+-- gets a composite index with that order as its suffix so each page is a
+-- single index range scan.
+
+-- Keyset columns must be non-null for cursors to be total
+UPDATE projects SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE projects ALTER COLUMN created_at SET NOT NULL;
+UPDATE training_jobs SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE training_jobs ALTER COLUMN created_at SET NOT NULL;
+
+-- Projects: unfiltered and by owner
+CREATE INDEX IF NOT EXISTS idx_projects_created
+    ON projects(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_owner_created
+    ON projects(owner_id, created_at DESC, id DESC);
+
+-- Training jobs: unfiltered, by project, and by project + status / branch
+CREATE INDEX IF NOT EXISTS idx_jobs_created
+    ON training_jobs(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_project_created
+    ON training_jobs(project_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_project_status_created
+    ON training_jobs(project_id, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_project_branch_created
+    ON training_jobs(project_id, branch, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created
+    ON training_jobs(status, created_at DESC, id DESC);
+
+-- Superseded by the composite indexes above (same leading column)
+DROP INDEX IF EXISTS idx_projects_owner;
+DROP INDEX IF EXISTS idx_jobs_project;
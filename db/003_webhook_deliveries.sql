@@ -0,0 +1,32 @@
+-- Durable queue for GitHub webhook deliveries
+-- POST /api/webhooks/github verifies the signature, inserts the raw delivery
+-- here and returns 202; in-process workers drain the table with retries.
+
+CREATE TABLE IF NOT EXISTS webhook_deliveries (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    delivery_id TEXT,  -- X-GitHub-Delivery header
+    event TEXT NOT NULL,  -- X-GitHub-Event header
+    payload JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'done', 'dead')),
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_until TIMESTAMPTZ,  -- worker lease; expired leases are reclaimed
+    last_error TEXT,
+    result JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Workers only ever scan deliveries that still need work
+CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_ready
+    ON webhook_deliveries(status, next_attempt_at)
+    WHERE status IN ('pending', 'processing');
+
+-- Only the service role (which bypasses RLS) touches the queue
+ALTER TABLE webhook_deliveries ENABLE ROW LEVEL SECURITY;
+
+CREATE TRIGGER webhook_deliveries_updated_at
+    BEFORE UPDATE ON webhook_deliveries
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at();
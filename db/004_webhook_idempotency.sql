@@ -0,0 +1,61 @@
+-- Idempotent webhook handling
+-- GitHub redelivers webhooks on timeout; a redelivery must neither queue the
+-- same delivery twice nor create a second training job for the same push.
+
+-- One queue row per X-GitHub-Delivery (NULLs stay distinct)
+ALTER TABLE webhook_deliveries
+    ADD CONSTRAINT webhook_deliveries_delivery_id_key UNIQUE (delivery_id);
+
+-- Collapse existing duplicate jobs onto the most progressed row per push
+-- (finished over running over pending, then the one with pipeline ids),
+-- after merging the ids and timings the other duplicates picked up
+CREATE TEMP TABLE job_dedup AS
+SELECT id,
+       FIRST_VALUE(id) OVER w AS keep_id,
+       ROW_NUMBER() OVER w AS rn
+FROM training_jobs
+WINDOW w AS (
+    PARTITION BY project_id, commit_sha, branch
+    ORDER BY status IN ('completed', 'failed') DESC,
+             status = 'running' DESC,
+             sagemaker_job_name IS NOT NULL DESC,
+             mlflow_run_id IS NOT NULL DESC,
+             github_workflow_run_id IS NOT NULL DESC,
+             created_at,
+             id
+);
+
+UPDATE training_jobs keep
+SET github_workflow_run_id = COALESCE(keep.github_workflow_run_id, merged.github_workflow_run_id),
+    sagemaker_job_name = COALESCE(keep.sagemaker_job_name, merged.sagemaker_job_name),
+    mlflow_run_id = COALESCE(keep.mlflow_run_id, merged.mlflow_run_id),
+    started_at = COALESCE(keep.started_at, merged.started_at),
+    completed_at = COALESCE(keep.completed_at, merged.completed_at)
+FROM (
+    SELECT d.keep_id,
+           MAX(t.github_workflow_run_id) AS github_workflow_run_id,
+           MAX(t.sagemaker_job_name) AS sagemaker_job_name,
+           MAX(t.mlflow_run_id) AS mlflow_run_id,
+           MIN(t.started_at) AS started_at,
+           MAX(t.completed_at) AS completed_at
+    FROM job_dedup d
+    JOIN training_jobs t ON t.id = d.id
+    WHERE d.rn > 1
+    GROUP BY d.keep_id
+) merged
+WHERE keep.id = merged.keep_id;
+
+UPDATE agent_conversations c
+SET training_job_id = d.keep_id
+FROM job_dedup d
+WHERE c.training_job_id = d.id AND d.rn > 1;
+
+DELETE FROM training_jobs t
+USING job_dedup d
+WHERE t.id = d.id AND d.rn > 1;
+
+DROP TABLE job_dedup;
+
+-- Job creation upserts on this key; it also serves the webhook's lookup
+ALTER TABLE training_jobs
+    ADD CONSTRAINT training_jobs_push_key UNIQUE (project_id, commit_sha, branch);
@@ -0,0 +1,11 @@
+-- Rolling conversation summaries for the agent
+-- Messages up to summary_through are folded into summary; only newer
+-- messages are sent verbatim, so prompts stay bounded for old conversations.
+
+ALTER TABLE agent_conversations ADD COLUMN IF NOT EXISTS summary TEXT;
+ALTER TABLE agent_conversations ADD COLUMN IF NOT EXISTS summary_through TIMESTAMPTZ;
+
+-- History is read as "messages of a conversation after a point in time"
+CREATE INDEX IF NOT EXISTS idx_messages_conversation_created
+    ON agent_messages(conversation_id, created_at);
+DROP INDEX IF EXISTS idx_messages_conversation;
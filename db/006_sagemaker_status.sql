@@ -0,0 +1,15 @@
+-- SageMaker status synced into training_jobs by the background reconciler
+-- GET /api/jobs/{id}/sagemaker-status reads these columns instead of calling
+-- DescribeTrainingJob on every poll.
+
+ALTER TABLE training_jobs ADD COLUMN IF NOT EXISTS sagemaker_status TEXT;
+ALTER TABLE training_jobs ADD COLUMN IF NOT EXISTS sagemaker_secondary_status TEXT;
+ALTER TABLE training_jobs ADD COLUMN IF NOT EXISTS sagemaker_failure_reason TEXT;
+ALTER TABLE training_jobs ADD COLUMN IF NOT EXISTS sagemaker_details JSONB;  -- last describe
+ALTER TABLE training_jobs ADD COLUMN IF NOT EXISTS sagemaker_synced_at TIMESTAMPTZ;
+
+-- The reconciler only ever scans jobs SageMaker may still change
+CREATE INDEX IF NOT EXISTS idx_jobs_sagemaker_active
+    ON training_jobs(created_at)
+    WHERE sagemaker_job_name IS NOT NULL
+      AND (sagemaker_status IS NULL OR sagemaker_status IN ('InProgress', 'Stopping'));
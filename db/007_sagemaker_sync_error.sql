@@ -0,0 +1,12 @@
+-- Last DescribeTrainingJob failure for a job (e.g. a mistyped or deleted name)
+-- The reconciler also stamps sagemaker_synced_at on failure, so the job waits
+-- until it is stale again instead of being retried on every pass.
+
+ALTER TABLE training_jobs ADD COLUMN IF NOT EXISTS sagemaker_sync_error TEXT;
+
+-- Jobs are picked never-synced first, then least recently synced
+DROP INDEX IF EXISTS idx_jobs_sagemaker_active;
+CREATE INDEX IF NOT EXISTS idx_jobs_sagemaker_active
+    ON training_jobs(sagemaker_synced_at NULLS FIRST)
+    WHERE sagemaker_job_name IS NOT NULL
+      AND (sagemaker_status IS NULL OR sagemaker_status IN ('InProgress', 'Stopping'));
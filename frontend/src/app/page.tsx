@@ -90,7 +90,7 @@ function RepoCombobox({
 
 function DashboardContent() {
   const { user } = useAuth();
-  const { projects, loading, refetch } = useProjects(user?.id);
+  const { projects, loading, hasMore, loadMore, refetch } = useProjects(user?.id);
   const [showForm, setShowForm] = useState(false);
   const [repos, setRepos] = useState<GithubRepo[]>([]);
   const [reposLoading, setReposLoading] = useState(false);
@@ -198,6 +198,11 @@ function DashboardContent() {
           ))}
         </div>
       )}
+      {!loading && hasMore && (
+        <Button variant="outline" className="mt-3" onClick={() => loadMore()}>
+          Load more
+        </Button>
+      )}
     </div>
   );
 }
@@ -6,6 +6,7 @@ import { useParams } from "next/navigation";
 import { listArtifacts, getDownloadUrl } from "@/lib/api";
 import { ArtifactList } from "@/components/artifact-list";
 import type { S3Artifact } from "@/lib/types";
+import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { AuthProvider } from "@/components/providers";
 
@@ -15,16 +16,38 @@ function ArtifactsContent() {
   const [artifacts, setArtifacts] = useState<S3Artifact[]>([]);
   const [loading, setLoading] = useState(true);
   const [prefix, setPrefix] = useState("");
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
-    if (projectId) {
-      setLoading(true);
-      listArtifacts(projectId, prefix)
-        .then(setArtifacts)
-        .finally(() => setLoading(false));
-    }
+    if (!projectId) return;
+    // Ignore a page that arrives after the prefix has changed again
+    let current = true;
+    setLoading(true);
+    listArtifacts(projectId, prefix)
+      .then((page) => {
+        if (!current) return;
+        setArtifacts(page.objects);
+        setNextCursor(page.next_cursor);
+      })
+      .finally(() => current && setLoading(false));
+    return () => {
+      current = false;
+    };
   }, [projectId, prefix]);
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await listArtifacts(projectId, prefix, nextCursor);
+      setArtifacts((current) => [...current, ...page.objects]);
+      setNextCursor(page.next_cursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDownload = async (key: string) => {
     if (!projectId) return;
     const { url } = await getDownloadUrl(projectId, key);
@@ -50,7 +73,14 @@ function ArtifactsContent() {
       {loading ? (
         <p className="text-muted-foreground">Loading artifacts...</p>
       ) : (
-        <ArtifactList artifacts={artifacts} onDownload={handleDownload} />
+        <>
+          <ArtifactList artifacts={artifacts} onDownload={handleDownload} />
+          {nextCursor && (
+            <Button variant="outline" className="mt-3" disabled={loadingMore} onClick={loadMore}>
+              {loadingMore ? "Loading..." : "Load more"}
+            </Button>
+          )}
+        </>
       )}
     </div>
   );
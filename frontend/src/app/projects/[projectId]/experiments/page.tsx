@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react";
 import Link from "next/link";
 import { useParams } from "next/navigation";
-import { getProject, listRuns, getMetricHistory } from "@/lib/api";
+import { getProject, listRuns, getMetricHistoryBatch } from "@/lib/api";
 import { MetricChart } from "@/components/metric-chart";
 import type { Project, MLflowRun, MetricHistory } from "@/lib/types";
 import { Button } from "@/components/ui/button";
@@ -11,6 +11,8 @@ import { Input } from "@/components/ui/input";
 import { Card, CardContent } from "@/components/ui/card";
 import { AuthProvider } from "@/components/providers";
 
+const MAX_CHART_POINTS = 2000;
+
 function ExperimentsContent() {
   const params = useParams();
   const projectId = params.projectId as string;
@@ -33,12 +35,21 @@ function ExperimentsContent() {
 
   const handleCompare = async () => {
     const data: Record<string, MetricHistory[]> = {};
+    if (selectedRuns.length === 0) {
+      setChartData(data);
+      return;
+    }
+    const batch = await getMetricHistoryBatch(selectedRuns, [metricKey], MAX_CHART_POINTS);
     for (const runId of selectedRuns) {
-      try {
-        data[runId] = await getMetricHistory(runId, metricKey);
-      } catch {
-        data[runId] = [];
-      }
+      const series = batch.runs[runId]?.[metricKey];
+      data[runId] = series
+        ? series.steps.map((step, i) => ({
+            key: metricKey,
+            value: series.values[i] ?? NaN,
+            timestamp: 0,
+            step,
+          }))
+        : [];
     }
     setChartData(data);
   };
@@ -14,7 +14,7 @@ function ProjectContent() {
   const params = useParams();
   const projectId = params.projectId as string;
   const [project, setProject] = useState<ProjectType | null>(null);
-  const { jobs, loading: jobsLoading } = useJobs(projectId);
+  const { jobs, loading: jobsLoading, hasMore, loadMore } = useJobs(projectId);
 
   useEffect(() => {
     if (projectId) {
@@ -52,7 +52,14 @@ function ProjectContent() {
         {jobsLoading ? (
           <p className="text-muted-foreground">Loading jobs...</p>
         ) : (
-          <JobTable jobs={jobs} projectId={projectId} />
+          <>
+            <JobTable jobs={jobs} projectId={projectId} />
+            {hasMore && (
+              <Button variant="outline" className="mt-3" onClick={() => loadMore()}>
+                Load more
+              </Button>
+            )}
+          </>
         )}
       </section>
     </div>
@@ -1,21 +1,96 @@
 "use client";
 
-import { useEffect, useState } from "react";
-import type { TrainingJob } from "@/lib/types";
-import { listJobs } from "@/lib/api";
+import { useEffect, useRef, useState } from "react";
+import type { JobEvent, TrainingJob } from "@/lib/types";
+import { jobEventsUrl, listJobs } from "@/lib/api";
+
+function applyJobEvent(jobs: TrainingJob[], { type, job }: JobEvent): TrainingJob[] {
+  const index = jobs.findIndex((existing) => existing.id === job.id);
+  if (index === -1) {
+    // Only the newest jobs are loaded; an update to an older one isn't shown
+    return type === "created" ? [job, ...jobs] : jobs;
+  }
+  const next = [...jobs];
+  next[index] = { ...next[index], ...job };
+  return next;
+}
 
 export function useJobs(projectId: string) {
   const [jobs, setJobs] = useState<TrainingJob[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
+  const reload = useRef<() => Promise<void>>(() => Promise.resolve());
+
   useEffect(() => {
+    // Subscribe before loading so no change slips in between. Events that
+    // arrive while a page is loading are held back and replayed onto it,
+    // since the page replaces the list when it lands.
+    const events = new EventSource(jobEventsUrl(projectId));
+    let buffered: JobEvent[] | null = null;
+    // Only the newest load may replace the list (a resync can overlap one)
+    let generation = 0;
+    const load = () => {
+      const current = ++generation;
+      buffered ??= [];
+      const settle = (apply: (replay: JobEvent[]) => void) => {
+        if (current !== generation) return;
+        apply(buffered ?? []);
+        buffered = null;
+      };
+      return listJobs(projectId)
+        .then((page) =>
+          settle((replay) => {
+            setJobs(replay.reduce(applyJobEvent, page.jobs));
+            setNextCursor(page.next_cursor);
+          })
+        )
+        .catch((e) =>
+          settle((replay) => {
+            setJobs((jobs) => replay.reduce(applyJobEvent, jobs));
+            setError(e.message);
+          })
+        );
+    };
+    reload.current = load;
+
+    events.addEventListener("job", (e) => {
+      const event: JobEvent = JSON.parse((e as MessageEvent).data);
+      if (buffered) buffered.push(event);
+      else setJobs((current) => applyJobEvent(current, event));
+    });
+    // Missed events could not be replayed; reload the list instead
+    events.addEventListener("resync", () => load());
+
     setLoading(true);
-    listJobs(projectId)
-      .then(setJobs)
-      .catch((e) => setError(e.message))
-      .finally(() => setLoading(false));
+    load().finally(() => setLoading(false));
+    return () => {
+      generation++;
+      events.close();
+    };
   }, [projectId]);
 
-  return { jobs, loading, error, refetch: () => listJobs(projectId).then(setJobs) };
+  const loadMore = () => {
+    if (!nextCursor) return Promise.resolve();
+    return listJobs(projectId, nextCursor)
+      .then((page) => {
+        // Skip jobs a created event already added while paging
+        setJobs((current) => {
+          const loaded = new Set(current.map((job) => job.id));
+          return [...current, ...page.jobs.filter((job) => !loaded.has(job.id))];
+        });
+        setNextCursor(page.next_cursor);
+      })
+      .catch((e) => setError(e.message));
+  };
+
+  return {
+    jobs,
+    loading,
+    error,
+    hasMore: nextCursor !== null,
+    loadMore,
+    refetch: () => reload.current(),
+  };
 }
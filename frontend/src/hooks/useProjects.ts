@@ -1,21 +1,44 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import type { Project } from "@/lib/types";
+import type { Project, ProjectPage } from "@/lib/types";
 import { listProjects } from "@/lib/api";
 
 export function useProjects(ownerId?: string) {
   const [projects, setProjects] = useState<Project[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
+  const showFirstPage = (page: ProjectPage) => {
+    setProjects(page.projects);
+    setNextCursor(page.next_cursor);
+  };
+
   useEffect(() => {
     setLoading(true);
     listProjects(ownerId)
-      .then(setProjects)
+      .then(showFirstPage)
       .catch((e) => setError(e.message))
       .finally(() => setLoading(false));
   }, [ownerId]);
 
-  return { projects, loading, error, refetch: () => listProjects(ownerId).then(setProjects) };
+  const loadMore = () => {
+    if (!nextCursor) return Promise.resolve();
+    return listProjects(ownerId, nextCursor)
+      .then((page) => {
+        setProjects((current) => [...current, ...page.projects]);
+        setNextCursor(page.next_cursor);
+      })
+      .catch((e) => setError(e.message));
+  };
+
+  return {
+    projects,
+    loading,
+    error,
+    hasMore: nextCursor !== null,
+    loadMore,
+    refetch: () => listProjects(ownerId).then(showFirstPage),
+  };
 }
@@ -1,19 +1,22 @@
 import type {
   Project,
+  ProjectPage,
   ProjectCreate,
   GithubRepo,
   TrainingJob,
+  JobPage,
   CommitSummary,
   AgentConversation,
   AgentMessage,
-  S3Artifact,
+  S3ArtifactPage,
   MLflowRun,
   MetricHistory,
+  MetricHistoryBatch,
 } from "./types";
 
 const API_BASE = "/api";
 
-async function request<T>(path: string, options?: RequestInit): Promise<T> {
+async function send(path: string, options?: RequestInit): Promise<Response> {
   const res = await fetch(`${API_BASE}${path}`, {
     headers: { "Content-Type": "application/json" },
     ...options,
@@ -22,7 +25,11 @@ async function request<T>(path: string, options?: RequestInit): Promise<T> {
     const error = await res.json().catch(() => ({ detail: res.statusText }));
     throw new Error(error.detail || "Request failed");
   }
-  return res.json();
+  return res;
+}
+
+async function request<T>(path: string, options?: RequestInit): Promise<T> {
+  return (await send(path, options)).json();
 }
 
 // GitHub
@@ -30,8 +37,15 @@ export const listGithubRepos = (ownerId: string) =>
   request<GithubRepo[]>(`/github/repos?owner_id=${ownerId}`);
 
 // Projects
-export const listProjects = (ownerId?: string) =>
-  request<Project[]>(`/projects${ownerId ? `?owner_id=${ownerId}` : ""}`);
+// One page of projects; pass next_cursor back for the next page
+export const listProjects = async (ownerId?: string, cursor?: string): Promise<ProjectPage> => {
+  const params = new URLSearchParams();
+  if (ownerId) params.set("owner_id", ownerId);
+  if (cursor) params.set("cursor", cursor);
+  const query = params.toString();
+  const res = await send(`/projects${query ? `?${query}` : ""}`);
+  return { projects: await res.json(), next_cursor: res.headers.get("X-Next-Cursor") };
+};
 
 export const getProject = (id: string) => request<Project>(`/projects/${id}`);
 
@@ -51,11 +65,22 @@ export const deleteProject = (id: string) =>
   request<void>(`/projects/${id}`, { method: "DELETE" });
 
 // Training Jobs
-export const listJobs = (projectId?: string) =>
-  request<TrainingJob[]>(`/jobs${projectId ? `?project_id=${projectId}` : ""}`);
+// One page of jobs, newest first; pass next_cursor back for the next page
+export const listJobs = async (projectId?: string, cursor?: string): Promise<JobPage> => {
+  const params = new URLSearchParams();
+  if (projectId) params.set("project_id", projectId);
+  if (cursor) params.set("cursor", cursor);
+  const query = params.toString();
+  const res = await send(`/jobs${query ? `?${query}` : ""}`);
+  return { jobs: await res.json(), next_cursor: res.headers.get("X-Next-Cursor") };
+};
 
 export const getJob = (id: string) => request<TrainingJob>(`/jobs/${id}`);
 
+// Server-sent JobEvents for a project (EventSource resumes with Last-Event-ID)
+export const jobEventsUrl = (projectId: string) =>
+  `${API_BASE}/jobs/stream?project_id=${projectId}`;
+
 // Experiments (MLflow proxy)
 export const listExperiments = () => request<unknown[]>("/experiments");
 
@@ -72,11 +97,28 @@ export const getMetricHistory = (runId: string, metricKey: string) =>
     `/experiments/runs/${runId}/metrics/${encodeURIComponent(metricKey)}`
   );
 
+export const getMetricHistoryBatch = (
+  runIds: string[],
+  metricKeys: string[],
+  maxPoints?: number
+) =>
+  request<MetricHistoryBatch>("/experiments/metrics/batch", {
+    method: "POST",
+    body: JSON.stringify({
+      run_ids: runIds,
+      metric_keys: metricKeys,
+      max_points: maxPoints ?? null,
+    }),
+  });
+
 // Artifacts
-export const listArtifacts = (projectId: string, prefix = "") =>
-  request<S3Artifact[]>(
-    `/artifacts/${projectId}${prefix ? `?prefix=${encodeURIComponent(prefix)}` : ""}`
-  );
+export const listArtifacts = (projectId: string, prefix = "", cursor?: string) => {
+  const params = new URLSearchParams();
+  if (prefix) params.set("prefix", prefix);
+  if (cursor) params.set("cursor", cursor);
+  const query = params.toString();
+  return request<S3ArtifactPage>(`/artifacts/${projectId}${query ? `?${query}` : ""}`);
+};
 
 export const getDownloadUrl = (projectId: string, key: string) =>
   request<{ url: string }>(
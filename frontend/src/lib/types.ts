@@ -18,6 +18,11 @@ export interface Project {
   updated_at: string;
 }
 
+export interface ProjectPage {
+  projects: Project[];
+  next_cursor: string | null;
+}
+
 export interface ProjectCreate {
   github_repo_full_name: string;
 }
@@ -43,6 +48,20 @@ export interface TrainingJob {
   started_at: string | null;
   completed_at: string | null;
   created_at: string;
+  sagemaker_status: string | null;
+  sagemaker_secondary_status: string | null;
+  sagemaker_failure_reason: string | null;
+  sagemaker_synced_at: string | null;
+}
+
+export interface JobPage {
+  jobs: TrainingJob[];
+  next_cursor: string | null;
+}
+
+export interface JobEvent {
+  type: "created" | "updated";
+  job: TrainingJob;
 }
 
 export interface AgentConversation {
@@ -76,6 +95,12 @@ export interface S3Artifact {
   etag: string;
 }
 
+export interface S3ArtifactPage {
+  objects: S3Artifact[];
+  prefixes: string[];
+  next_cursor: string | null;
+}
+
 export interface MLflowExperiment {
   experiment_id: string;
   name: string;
@@ -103,3 +128,13 @@ export interface MetricHistory {
   timestamp: number;
   step: number;
 }
+
+export interface MetricSeries {
+  steps: number[];
+  values: (number | null)[];
+}
+
+export interface MetricHistoryBatch {
+  runs: Record<string, Record<string, MetricSeries>>;
+  errors: Array<{ run_id: string; metric_key: string; status_code: number | null; detail: string }>;
+}
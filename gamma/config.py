@@ -11,22 +11,77 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_key: str = ""  # anon/public key
     supabase_secret_key: str = ""  # secret key for admin ops (sb_secret_...)
+    supabase_max_workers: int = 16  # threads for blocking PostgREST calls
 
     # GitHub App
     github_app_id: str = ""
     github_app_private_key: str = ""  # PEM-encoded private key
     github_webhook_secret: str = ""
+    github_token_refresh_margin: int = 300  # refresh installation tokens this early (s)
+    github_blob_concurrency: int = 8  # parallel blob uploads per commit
+    github_commit_retries: int = 2  # ref updates retried after a non-fast-forward
+    github_discovery_concurrency: int = 8  # parallel listing requests for /api/github/repos
+    github_repos_ttl: float = 60.0  # seconds a user's repo list is served as fresh
+    github_repos_max_stale: float = 600.0  # served while refreshing in the background
+    github_response_cache_bytes: int = 16 * 1024 * 1024  # ETag-revalidated GET bodies
+    github_rate_limit_reserve: float = 0.1  # pace requests once this share of quota is left
+    github_rate_limit_max_wait: float = 30.0  # longest a request queues for quota (s)
+    github_rate_limit_retries: int = 2  # retries after a 403/429 rate-limit response
+
+    # Immutable GitHub content (diffs/files at a full SHA), shared by workers on a host
+    content_cache_dir: str = ""  # default: <tmpdir>/gamma-content-cache
+    content_cache_memory_bytes: int = 32 * 1024 * 1024
+    content_cache_disk_bytes: int = 1024 * 1024 * 1024
+
+    # Webhook delivery queue
+    webhook_workers: int = 4
+    webhook_max_attempts: int = 8  # then the delivery is marked dead
+    webhook_backoff_base: float = 2.0  # seconds before the first retry, doubling after
+    webhook_backoff_max: float = 300.0
+    webhook_poll_interval: float = 5.0  # seconds between polls when idle
+    webhook_lease_seconds: int = 120  # a claimed delivery is retried after this
+    webhook_recent_deliveries: int = 10_000  # delivery ids remembered for dedup
+    job_events_buffer: int = 256  # recent job events kept per project for resume
+    job_events_queue_size: int = 100  # per subscriber; overflow forces a resync
+    job_events_heartbeat: float = 15.0  # seconds between SSE keep-alive comments
+
+    # Outbound HTTP connection pools (GitHub, MLflow)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0  # seconds an idle connection is kept
+    http2_enabled: bool = True  # used when the h2 package is installed
 
     # MLflow
     mlflow_tracking_uri: str = "http://localhost:5000"
+    mlflow_batch_concurrency: int = 8  # parallel MLflow calls per batch request
+    mlflow_cache_max_bytes: int = 64 * 1024 * 1024
+    mlflow_cache_active_ttl: float = 10.0  # seconds, for runs still in progress
+    mlflow_cache_experiment_ttl: float = 300.0
 
     # AWS
     aws_region: str = "us-east-1"
     s3_default_bucket: str = ""
+    aws_max_workers: int = 32  # threads for blocking boto3 calls
+    aws_max_pool_connections: int = 32  # botocore connections per client
+    aws_max_attempts: int = 5
+    aws_connect_timeout: float = 5.0
+    aws_read_timeout: float = 30.0
+    sagemaker_reconcile_interval: float = 30.0  # seconds between passes; 0 disables
+    sagemaker_reconcile_batch: int = 200  # active jobs looked at per pass
+    sagemaker_reconcile_max_describes: int = 20  # DescribeTrainingJob calls per pass
+    sagemaker_reconcile_max_age: float = 300.0  # re-describe active jobs at least this often
+    sagemaker_reconcile_lookback: float = 86_400.0  # first pass lists jobs modified since
 
     # Anthropic
     anthropic_api_key: str = ""
     anthropic_model: str = "claude-sonnet-4-20250514"
+    agent_diff_token_budget: int = 12_000  # approx. tokens of diff per prompt
+    agent_history_turns: int = 10  # turns kept verbatim after a summary fold
+    agent_history_max_turns: int = 20  # fold older turns once this many are unsummarized
+    agent_summary_max_tokens: int = 512
+    agent_context_ttl: float = 300.0  # seconds an assembled commit diff section is reused
+    agent_context_cache_size: int = 256
+    agent_checkpoint_interval: float = 2.0  # seconds between partial-reply writes
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
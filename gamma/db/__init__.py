@@ -1,3 +1,10 @@
 from .client import get_supabase_client, get_supabase_admin_client
+from .executor import execute, run_db, shutdown_db_executor
 
-__all__ = ["get_supabase_client", "get_supabase_admin_client"]
+__all__ = [
+    "get_supabase_client",
+    "get_supabase_admin_client",
+    "execute",
+    "run_db",
+    "shutdown_db_executor",
+]
@@ -0,0 +1,40 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+from gamma.config import get_settings
+
+T = TypeVar("T")
+
+
+@lru_cache()
+def get_db_executor() -> ThreadPoolExecutor:
+    """Bounded thread pool that runs blocking Supabase calls off the event loop."""
+    settings = get_settings()
+    return ThreadPoolExecutor(
+        max_workers=settings.supabase_max_workers,
+        thread_name_prefix="supabase",
+    )
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Supabase call (e.g. ``auth.admin``) in the DB thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), partial(fn, *args, **kwargs))
+
+
+async def execute(query: Any) -> Any:
+    """Execute a PostgREST query builder without blocking the event loop.
+
+    Build the query inline as usual and pass it here instead of calling
+    ``.execute()`` directly.
+    """
+    return await run_db(query.execute)
+
+
+def shutdown_db_executor() -> None:
+    """Drain and release the DB thread pool (called on app shutdown)."""
+    if get_db_executor.cache_info().currsize:
+        get_db_executor().shutdown(wait=True)
+        get_db_executor.cache_clear()
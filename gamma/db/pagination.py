@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterable
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Columns every keyset page must carry so the next cursor can be built
+KEYSET_COLUMNS = ("created_at", "id")
+
+
+def encode_cursor(row: dict) -> str:
+    """Encode the (created_at, id) keyset position of a row as an opaque cursor."""
+    raw = json.dumps([row["created_at"], str(row["id"])]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises ``ValueError`` if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        # Both values are interpolated into a PostgREST filter, so only
+        # accept well-formed timestamps and UUIDs.
+        return datetime.fromisoformat(created_at).isoformat(), str(UUID(row_id))
+    except (binascii.Error, json.JSONDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def select_columns(fields: str | None, allowed: Iterable[str]) -> str:
+    """Build a PostgREST select clause from a comma-separated ``fields`` param.
+
+    The keyset columns are always included. Raises ``ValueError`` on
+    unknown field names.
+    """
+    if not fields:
+        return "*"
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    columns = list(KEYSET_COLUMNS) + [f for f in requested if f not in KEYSET_COLUMNS]
+    return ",".join(columns)
+
+
+def keyset_page(query: Any, cursor: str | None, limit: int) -> Any:
+    """Apply newest-first keyset ordering, the cursor position and a limit.
+
+    One extra row is requested so :func:`split_page` can tell whether
+    another page exists.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt.{row_id})'
+        )
+    return (
+        query.order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+    )
+
+
+def split_page(rows: list[dict], limit: int) -> tuple[list[dict], str | None]:
+    """Trim the look-ahead row and return ``(rows, next_cursor)``."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1])
@@ -1,16 +1,55 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from gamma.config import get_settings
-from gamma.routers import agent, artifacts, experiments, github, jobs, projects, webhooks
+from gamma.db import shutdown_db_executor
+from gamma.db.pagination import NEXT_CURSOR_HEADER
+from gamma.routers import (
+    agent,
+    artifacts,
+    experiments,
+    github,
+    jobs,
+    metrics,
+    projects,
+    webhooks,
+)
+from gamma.services.aws import get_boto_client, shutdown_aws_executor
+from gamma.services.github_ratelimit import GitHubRateLimited
+from gamma.services.http_pool import close_http_pool, get_http_pool
+from gamma.services.sagemaker_reconciler import get_sagemaker_reconciler
+from gamma.services.webhook_queue import WebhookQueue
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    http_pool = get_http_pool()
+    http_pool.client("github")
+    http_pool.client("mlflow")
+    get_boto_client("s3")
+    get_boto_client("sagemaker")
+    app.state.webhook_queue = WebhookQueue(webhooks.process_event)
+    await app.state.webhook_queue.start()
+    await get_sagemaker_reconciler().start()
+    yield
+    await get_sagemaker_reconciler().stop()
+    await app.state.webhook_queue.stop()
+    await close_http_pool()
+    shutdown_aws_executor()
+    shutdown_db_executor()
+
+
 app = FastAPI(
     title="Gamma API",
     description="ML Development Platform API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS — permissive for development, restrict in production
@@ -20,8 +59,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+
+@app.exception_handler(GitHubRateLimited)
+async def github_rate_limited(request: Request, exc: GitHubRateLimited):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "GitHub rate limit reached, try again later"},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
 # API routers
 app.include_router(projects.router, prefix="/api")
 app.include_router(jobs.router, prefix="/api")
@@ -30,6 +80,7 @@ app.include_router(artifacts.router, prefix="/api")
 app.include_router(agent.router, prefix="/api")
 app.include_router(github.router, prefix="/api")
 app.include_router(webhooks.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 
 @app.get("/api/health")
@@ -8,6 +8,12 @@ from .agent import (
     AgentChatRequest,
 )
 from .users import Profile
+from .experiments import (
+    MetricHistoryBatch,
+    MetricHistoryBatchRequest,
+    MetricHistoryError,
+    MetricSeries,
+)
 
 __all__ = [
     "Project",
@@ -24,4 +30,8 @@ __all__ = [
     "CommitSummary",
     "AgentChatRequest",
     "Profile",
+    "MetricHistoryBatch",
+    "MetricHistoryBatchRequest",
+    "MetricHistoryError",
+    "MetricSeries",
 ]
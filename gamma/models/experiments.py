@@ -0,0 +1,28 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class MetricHistoryBatchRequest(BaseModel):
+    run_ids: list[str] = Field(min_length=1, max_length=100)
+    metric_keys: list[str] = Field(min_length=1, max_length=50)
+    max_points: int | None = Field(None, ge=4)
+    method: Literal["lttb", "minmax"] = "lttb"
+
+
+class MetricSeries(BaseModel):
+    steps: list[int]
+    values: list[float | None]
+
+
+class MetricHistoryError(BaseModel):
+    run_id: str
+    metric_key: str
+    status_code: int | None = None
+    detail: str
+
+
+class MetricHistoryBatch(BaseModel):
+    # run_id -> metric_key -> step-aligned columns
+    runs: dict[str, dict[str, MetricSeries]]
+    errors: list[MetricHistoryError] = []
@@ -39,3 +39,7 @@ class TrainingJob(BaseModel):
     started_at: datetime | None = None
     completed_at: datetime | None = None
     created_at: datetime
+    sagemaker_status: str | None = None
+    sagemaker_secondary_status: str | None = None
+    sagemaker_failure_reason: str | None = None
+    sagemaker_synced_at: datetime | None = None
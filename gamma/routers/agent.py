@@ -1,10 +1,15 @@
+import asyncio
 import json
-from uuid import UUID
+import logging
+import time
+from contextlib import aclosing
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
-from gamma.db import get_supabase_admin_client
+from gamma.config import get_settings
+from gamma.db import execute, get_supabase_admin_client
 from gamma.models import (
     AgentChatRequest,
     AgentConversation,
@@ -12,33 +17,50 @@ from gamma.models import (
     CommitSummary,
 )
 from gamma.services.agent_service import AgentService
+from gamma.services.background import spawn
+from gamma.services.conversation_history import ConversationHistory
+from gamma.services.singleflight import SingleFlight
+from gamma.services.timing import PhaseTimer, get_agent_timings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
 
+# Concurrent requests for the same commit share one diff fetch + LLM call
+_summary_flight: SingleFlight[tuple[str, str], dict] = SingleFlight()
+
+
 @router.post("/summary/{project_id}/{commit_sha}", response_model=CommitSummary)
 async def generate_commit_summary(project_id: UUID, commit_sha: str):
     """Generate (or return cached) commit diff summary."""
     client = get_supabase_admin_client()
 
     # Check cache
-    existing = (
+    existing = await execute(
         client.table("commit_summaries")
         .select("*")
         .eq("project_id", str(project_id))
         .eq("commit_sha", commit_sha)
-        .execute()
     )
     if existing.data:
         return existing.data[0]
 
+    return await _summary_flight.do(
+        (str(project_id), commit_sha),
+        lambda: _create_commit_summary(project_id, commit_sha),
+    )
+
+
+async def _create_commit_summary(project_id: UUID, commit_sha: str) -> dict:
+    client = get_supabase_admin_client()
+
     # Get project info for GitHub API
-    project = (
+    project = await execute(
         client.table("projects")
         .select("github_repo_full_name, github_installation_id")
         .eq("id", str(project_id))
         .single()
-        .execute()
     )
     if not project.data:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -50,125 +72,254 @@ async def generate_commit_summary(project_id: UUID, commit_sha: str):
         commit_sha=commit_sha,
     )
 
-    # Cache the summary
-    result = (
-        client.table("commit_summaries")
-        .insert(
+    # Cache the summary; upsert so a concurrent writer on another worker
+    # can't trip the UNIQUE(project_id, commit_sha) constraint
+    result = await execute(
+        client.table("commit_summaries").upsert(
             {
                 "project_id": str(project_id),
                 "commit_sha": commit_sha,
                 "summary": summary,
-            }
+            },
+            on_conflict="project_id,commit_sha",
         )
-        .execute()
     )
     return result.data[0]
 
 
+class _StreamedReply:
+    """Buffers a streamed assistant reply and checkpoints it to the database.
+
+    Chunks are collected in a list (joined only when written) and the
+    partial message is upserted at most every ``agent_checkpoint_interval``
+    seconds, so a disconnect or restart loses at most that much of it.
+    """
+
+    def __init__(self, client, conversation_id: str, after: asyncio.Task) -> None:
+        self.client = client
+        self.conversation_id = str(conversation_id)
+        self.message_id = str(uuid4())
+        self.after = after  # the user message must be stored first
+        self.interval = get_settings().agent_checkpoint_interval
+        self.chunks: list[str] = []
+        self.complete = False
+        self.error: str | None = None
+        self._last_checkpoint = time.monotonic()
+        self._checkpoint: asyncio.Task | None = None
+        self._after_failed = False
+
+    def append(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        now = time.monotonic()
+        if now - self._last_checkpoint < self.interval:
+            return
+        if self._checkpoint is not None and not self._checkpoint.done():
+            return  # previous checkpoint still in flight
+        self._last_checkpoint = now
+        self._checkpoint = spawn(self.save(), name=f"checkpoint-{self.message_id}")
+
+    async def _after_user_message(self) -> None:
+        """Wait for the user-message insert; the reply is stored even if it failed."""
+        [result] = await asyncio.gather(self.after, return_exceptions=True)
+        if isinstance(result, Exception) and not self._after_failed:
+            self._after_failed = True
+            logger.warning(
+                "User message for conversation %s was not stored: %s",
+                self.conversation_id,
+                result,
+            )
+
+    async def save(self, metadata: dict | None = None) -> None:
+        await self._after_user_message()
+        await execute(
+            self.client.table("agent_messages").upsert(
+                {
+                    "id": self.message_id,
+                    "conversation_id": self.conversation_id,
+                    "role": "assistant",
+                    "content": "".join(self.chunks),
+                    "metadata": metadata or {"complete": False},
+                }
+            )
+        )
+
+    async def finish(self, usage: dict | None) -> None:
+        """Write the final message once any in-flight checkpoint has landed."""
+        if self._checkpoint is not None:
+            await asyncio.gather(self._checkpoint, return_exceptions=True)
+        if not self.chunks:
+            await self._after_user_message()  # nothing streamed; only the user turn is kept
+            return
+        metadata: dict = {"complete": self.complete}
+        if usage:
+            metadata["usage"] = usage
+        if self.error:
+            metadata["error"] = self.error
+        await self.save(metadata)
+
+
+async def _finish_reply(
+    reply: _StreamedReply,
+    agent: AgentService,
+    history: ConversationHistory,
+    timer: PhaseTimer,
+) -> None:
+    await reply.finish(agent.last_usage)
+    if reply.complete:
+        timer.since_start("total")
+    history.schedule_fold(reply.conversation_id)
+
+
+async def _no_result() -> None:
+    return None
+
+
+async def _no_history() -> tuple[list[dict], str]:
+    return [], ""
+
+
 @router.post("/chat/{project_id}")
 async def agent_chat(project_id: UUID, request: AgentChatRequest):
-    """Stream an agent chat response via SSE."""
+    """Stream an agent chat response via SSE.
+
+    Independent lookups run concurrently, as do history loading and context
+    assembly. Setup phase timings are returned in a ``Server-Timing`` header
+    and aggregated, with time to first token, under ``/api/metrics``.
+    """
     client = get_supabase_admin_client()
+    timer = PhaseTimer(get_agent_timings())
 
-    # Get project info
-    project = (
-        client.table("projects")
-        .select("*")
-        .eq("id", str(project_id))
-        .single()
-        .execute()
+    # Project, existing conversation and training job do not depend on each other
+    project, conv_result, job = await timer.measure(
+        "lookup",
+        asyncio.gather(
+            execute(
+                client.table("projects")
+                .select("*")
+                .eq("id", str(project_id))
+                .single()
+            ),
+            execute(
+                client.table("agent_conversations")
+                .select("*")
+                .eq("id", str(request.conversation_id))
+                .single()
+            )
+            if request.conversation_id
+            else _no_result(),
+            execute(
+                client.table("training_jobs")
+                .select("commit_sha, mlflow_run_id")
+                .eq("id", str(request.training_job_id))
+                .single()
+            )
+            if request.training_job_id
+            else _no_result(),
+        ),
     )
     if not project.data:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Get or create conversation
     if request.conversation_id:
-        conv_result = (
-            client.table("agent_conversations")
-            .select("*")
-            .eq("id", str(request.conversation_id))
-            .single()
-            .execute()
-        )
         if not conv_result.data:
             raise HTTPException(status_code=404, detail="Conversation not found")
-        conversation_id = request.conversation_id
+        conversation = conv_result.data
     else:
-        conv_result = (
-            client.table("agent_conversations")
-            .insert(
-                {
-                    "project_id": str(project_id),
-                    "training_job_id": (
-                        str(request.training_job_id)
-                        if request.training_job_id
-                        else None
-                    ),
-                }
-            )
-            .execute()
+        conv_result = await timer.measure(
+            "conversation",
+            execute(
+                client.table("agent_conversations").insert(
+                    {
+                        "project_id": str(project_id),
+                        "training_job_id": (
+                            str(request.training_job_id)
+                            if request.training_job_id
+                            else None
+                        ),
+                    }
+                )
+            ),
         )
-        conversation_id = conv_result.data[0]["id"]
-
-    # Save user message
-    client.table("agent_messages").insert(
-        {
-            "conversation_id": str(conversation_id),
-            "role": "user",
-            "content": request.message,
-        }
-    ).execute()
-
-    # Load conversation history
-    history = (
-        client.table("agent_messages")
-        .select("role, content")
-        .eq("conversation_id", str(conversation_id))
-        .order("created_at")
-        .execute()
-    )
-    messages = [{"role": m["role"], "content": m["content"]} for m in history.data]
+        conversation = conv_result.data[0]
+    conversation_id = conversation["id"]
 
-    # Build context
-    agent = AgentService()
     commit_sha = None
     mlflow_run_id = None
-    if request.training_job_id:
-        job = (
-            client.table("training_jobs")
-            .select("commit_sha, mlflow_run_id")
-            .eq("id", str(request.training_job_id))
-            .single()
-            .execute()
-        )
-        if job.data:
-            commit_sha = job.data.get("commit_sha")
-            mlflow_run_id = job.data.get("mlflow_run_id")
+    if job is not None and job.data:
+        commit_sha = job.data.get("commit_sha")
+        mlflow_run_id = job.data.get("mlflow_run_id")
 
-    context = await agent.build_context(
-        installation_id=project.data["github_installation_id"],
-        repo_full_name=project.data["github_repo_full_name"],
-        commit_sha=commit_sha,
-        mlflow_run_id=mlflow_run_id,
+    # Recent history (plus the rolling summary of older turns) and the
+    # diff/run context are independent; a new conversation has no history
+    agent = AgentService()
+    history = ConversationHistory(agent)
+    (messages, summary), context = await asyncio.gather(
+        timer.measure("history", history.load(conversation))
+        if request.conversation_id
+        else _no_history(),
+        timer.measure(
+            "context",
+            agent.build_context(
+                installation_id=project.data["github_installation_id"],
+                repo_full_name=project.data["github_repo_full_name"],
+                commit_sha=commit_sha,
+                mlflow_run_id=mlflow_run_id,
+            ),
+        ),
+    )
+    messages.append({"role": "user", "content": request.message})
+
+    # Saved concurrently with the model call; history was read before it
+    # existed, so it is appended above rather than re-read
+    save_user_message = spawn(
+        execute(
+            client.table("agent_messages").insert(
+                {
+                    "conversation_id": str(conversation_id),
+                    "role": "user",
+                    "content": request.message,
+                }
+            )
+        )
     )
+    timer.since_start("setup")
+    server_timing = timer.server_timing()
+
+    reply = _StreamedReply(client, conversation_id, after=save_user_message)
 
     async def event_stream():
-        full_response = ""
-        async for chunk in agent.chat(messages, context):
-            full_response += chunk
-            yield f"data: {json.dumps({'text': chunk})}\n\n"
+        try:
+            async with aclosing(agent.chat(messages, context, summary)) as stream:
+                async for chunk in stream:
+                    if not reply.chunks:
+                        timer.since_start("ttfb")
+                    reply.append(chunk)
+                    yield f"data: {json.dumps({'text': chunk})}\n\n"
+            reply.complete = True
+        except Exception as e:
+            reply.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            # Model errors and client disconnects: store what streamed in the background
+            if not reply.complete:
+                spawn(
+                    _finish_reply(reply, agent, history, timer),
+                    name=f"reply-{reply.message_id}",
+                )
 
-        # Save assistant response
-        client.table("agent_messages").insert(
-            {
-                "conversation_id": str(conversation_id),
-                "role": "assistant",
-                "content": full_response,
-            }
-        ).execute()
+        # The reply is stored before "done", so a follow-up turn sent right
+        # away loads it as history; shielded so a disconnect can't cut it short
+        await asyncio.shield(
+            spawn(_finish_reply(reply, agent, history, timer), name=f"reply-{reply.message_id}")
+        )
         yield f"data: {json.dumps({'done': True, 'conversation_id': str(conversation_id)})}\n\n"
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Server-Timing": server_timing},
+    )
 
 
 @router.get(
@@ -177,12 +328,11 @@ async def agent_chat(project_id: UUID, request: AgentChatRequest):
 async def list_conversations(project_id: UUID):
     """List conversations for a project."""
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("agent_conversations")
         .select("*")
         .eq("project_id", str(project_id))
         .order("created_at", desc=True)
-        .execute()
     )
     return result.data
 
@@ -194,11 +344,10 @@ async def list_conversations(project_id: UUID):
 async def get_conversation_messages(conversation_id: UUID):
     """Get all messages in a conversation."""
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("agent_messages")
         .select("*")
         .eq("conversation_id", str(conversation_id))
         .order("created_at")
-        .execute()
     )
     return result.data
@@ -1,52 +1,101 @@
+import json
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from gamma.db import get_supabase_admin_client
-from gamma.services.s3_service import S3Service
+from gamma.db import execute, get_supabase_admin_client
+from gamma.services.aws import run_aws
+from gamma.services.s3_service import MAX_KEYS_PER_PAGE, S3Service
 
 router = APIRouter(prefix="/artifacts", tags=["artifacts"])
 
 
-@router.get("/{project_id}")
-async def list_artifacts(project_id: UUID, prefix: str = ""):
-    """List artifacts in S3 for a project."""
+async def _project_root(project_id: UUID) -> tuple[str, str]:
+    """Return ``(bucket, root)``, where ``root`` is the project's key prefix with a trailing "/"."""
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("projects")
         .select("s3_bucket, s3_prefix")
         .eq("id", str(project_id))
         .single()
-        .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    bucket = result.data["s3_bucket"]
-    full_prefix = result.data.get("s3_prefix", "")
-    if prefix:
-        full_prefix = f"{full_prefix}/{prefix}" if full_prefix else prefix
+    root = (result.data.get("s3_prefix") or "").strip("/")
+    return result.data["s3_bucket"], f"{root}/" if root else ""
+
+
+async def _resolve_prefix(project_id: UUID, prefix: str) -> tuple[str, str]:
+    """Return ``(bucket, full_prefix)`` for a project-relative prefix."""
+    bucket, root = await _project_root(project_id)
+    return bucket, root + prefix.lstrip("/")
+
+
+@router.get("/{project_id}")
+async def list_artifacts(
+    project_id: UUID,
+    prefix: str = "",
+    cursor: str | None = None,
+    limit: int = Query(MAX_KEYS_PER_PAGE, ge=1, le=MAX_KEYS_PER_PAGE),
+    delimiter: str | None = None,
+):
+    """List one page of artifacts in S3 for a project.
+
+    Returns ``{"objects", "prefixes", "next_cursor"}``; pass ``next_cursor``
+    back as ``cursor`` for the next page. With ``delimiter=/`` only the
+    immediate "folder" level is listed and sub-folders come back in
+    ``prefixes``, relative to the project like ``prefix`` itself, so a
+    returned prefix can be passed straight back to browse into it. Object
+    keys stay absolute, as the download and metadata endpoints expect.
+    """
+    if delimiter and prefix and not prefix.endswith(delimiter):
+        prefix += delimiter
+    bucket, root = await _project_root(project_id)
+    s3 = S3Service()
+    page = await run_aws(
+        s3.list_objects_page,
+        bucket,
+        root + prefix.lstrip("/"),
+        max_keys=limit,
+        cursor=cursor,
+        delimiter=delimiter,
+    )
+    page["prefixes"] = [p.removeprefix(root) for p in page["prefixes"]]
+    return page
+
 
+@router.get("/{project_id}/stream")
+async def stream_artifacts(project_id: UUID, prefix: str = ""):
+    """Stream every artifact under a prefix as NDJSON (one object per line)."""
+    bucket, full_prefix = await _resolve_prefix(project_id, prefix)
     s3 = S3Service()
-    return s3.list_objects(bucket, full_prefix)
+
+    async def ndjson():
+        pages = s3.iter_object_pages(bucket, full_prefix)
+        while (page := await run_aws(next, pages, None)) is not None:
+            if page:
+                yield "".join(json.dumps(obj) + "\n" for obj in page)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.get("/{project_id}/download-url")
 async def get_download_url(project_id: UUID, key: str):
     """Generate a presigned download URL for an artifact."""
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("projects")
         .select("s3_bucket")
         .eq("id", str(project_id))
         .single()
-        .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Project not found")
 
     s3 = S3Service()
-    url = s3.generate_presigned_url(result.data["s3_bucket"], key)
+    url = await run_aws(s3.generate_presigned_url, result.data["s3_bucket"], key)
     return {"url": url}
 
 
@@ -54,15 +103,14 @@ async def get_download_url(project_id: UUID, key: str):
 async def get_artifact_metadata(project_id: UUID, key: str):
     """Get metadata for a specific artifact."""
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("projects")
         .select("s3_bucket")
         .eq("id", str(project_id))
         .single()
-        .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Project not found")
 
     s3 = S3Service()
-    return s3.get_object_metadata(result.data["s3_bucket"], key)
+    return await run_aws(s3.get_object_metadata, result.data["s3_bucket"], key)
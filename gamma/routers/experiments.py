@@ -1,5 +1,20 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
 
+import httpx
+from fastapi import APIRouter, HTTPException, Query
+
+from gamma.config import get_settings
+from gamma.models import (
+    MetricHistoryBatch,
+    MetricHistoryBatchRequest,
+    MetricHistoryError,
+    MetricSeries,
+)
+from gamma.services.downsample import (
+    DownsampleMethod,
+    align_steps,
+    downsample_history,
+)
 from gamma.services.mlflow_service import MLflowService
 
 router = APIRouter(prefix="/experiments", tags=["experiments"])
@@ -41,10 +56,81 @@ async def get_run(run_id: str):
 
 
 @router.get("/runs/{run_id}/metrics/{metric_key}")
-async def get_metric_history(run_id: str, metric_key: str):
-    """Get the full history of a metric for a run."""
+async def get_metric_history(
+    run_id: str,
+    metric_key: str,
+    max_points: int | None = Query(None, ge=4),
+    method: DownsampleMethod = "lttb",
+):
+    """Get the history of a metric for a run.
+
+    With ``max_points`` the history is step-aligned and downsampled
+    server-side (``method`` = ``lttb`` or ``minmax``) so long runs stay
+    chartable.
+    """
     mlflow = MLflowService()
-    return await mlflow.get_metric_history(run_id, metric_key)
+    history = await mlflow.get_metric_history(run_id, metric_key)
+    if max_points is None:
+        return history
+    # CPU-bound on long histories; keep it off the event loop
+    return await asyncio.to_thread(downsample_history, history, max_points, method)
+
+
+@router.post("/metrics/batch", response_model=MetricHistoryBatch)
+async def get_metric_history_batch(request: MetricHistoryBatchRequest):
+    """Fetch histories for every (run, metric) pair in one call.
+
+    Histories are fetched concurrently (capped by ``MLFLOW_BATCH_CONCURRENCY``)
+    and returned as step-aligned ``steps``/``values`` columns, optionally
+    downsampled. Pairs that fail are reported in ``errors`` instead of
+    failing the whole batch.
+    """
+    mlflow = MLflowService()
+    semaphore = asyncio.Semaphore(get_settings().mlflow_batch_concurrency)
+    run_ids = list(dict.fromkeys(request.run_ids))
+    metric_keys = list(dict.fromkeys(request.metric_keys))
+    runs: dict[str, dict[str, MetricSeries]] = {run_id: {} for run_id in run_ids}
+    errors: list[MetricHistoryError] = []
+
+    async def fetch(run_id: str, metric_key: str) -> None:
+        try:
+            async with semaphore:
+                history = await mlflow.get_metric_history(run_id, metric_key)
+        except httpx.HTTPStatusError as e:
+            errors.append(
+                MetricHistoryError(
+                    run_id=run_id,
+                    metric_key=metric_key,
+                    status_code=e.response.status_code,
+                    detail=e.response.text[:200] or str(e),
+                )
+            )
+            return
+        except httpx.HTTPError as e:
+            errors.append(
+                MetricHistoryError(
+                    run_id=run_id,
+                    metric_key=metric_key,
+                    detail=str(e) or type(e).__name__,
+                )
+            )
+            return
+
+        if request.max_points is None:
+            points = align_steps(history)
+        else:
+            points = await asyncio.to_thread(
+                downsample_history, history, request.max_points, request.method
+            )
+        runs[run_id][metric_key] = MetricSeries(
+            steps=[p.get("step", 0) for p in points],
+            values=[p.get("value") for p in points],
+        )
+
+    await asyncio.gather(
+        *(fetch(run_id, key) for run_id in run_ids for key in metric_keys)
+    )
+    return MetricHistoryBatch(runs=runs, errors=errors)
 
 
 @router.get("/runs/{run_id}/artifacts")
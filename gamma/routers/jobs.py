@@ -1,35 +1,116 @@
+import asyncio
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from gamma.db import get_supabase_admin_client
-from gamma.models import TrainingJob, TrainingJobCreate, TrainingJobUpdate
-from gamma.services.sagemaker_service import SageMakerService
+from gamma.config import get_settings
+from gamma.db import execute, get_supabase_admin_client
+from gamma.db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    keyset_page,
+    select_columns,
+    split_page,
+)
+from gamma.models import JobStatus, TrainingJob, TrainingJobCreate, TrainingJobUpdate
+from gamma.services.job_events import get_job_event_broker
+from gamma.services.mlflow_cache import get_mlflow_cache
+from gamma.services.sagemaker_reconciler import (
+    ACTIVE_JOB_COLUMNS,
+    get_sagemaker_reconciler,
+)
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
 @router.get("", response_model=list[TrainingJob])
-async def list_jobs(project_id: UUID | None = None):
-    """List training jobs, optionally filtered by project."""
+async def list_jobs(
+    response: Response,
+    project_id: UUID | None = None,
+    status: JobStatus | None = None,
+    branch: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+):
+    """List training jobs, newest first, one keyset page at a time.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch
+    the next page. ``fields`` (comma-separated) limits the returned columns.
+    """
     client = get_supabase_admin_client()
-    query = client.table("training_jobs").select("*")
-    if project_id:
-        query = query.eq("project_id", str(project_id))
-    result = query.order("created_at", desc=True).execute()
-    return result.data
+    try:
+        # Never "*": rows also carry the SageMaker describe payload
+        columns = select_columns(
+            fields or ",".join(TrainingJob.model_fields), TrainingJob.model_fields
+        )
+        query = client.table("training_jobs").select(columns)
+        if project_id:
+            query = query.eq("project_id", str(project_id))
+        if status:
+            query = query.eq("status", status.value)
+        if branch:
+            query = query.eq("branch", branch)
+        query = keyset_page(query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = await execute(query)
+    rows, next_cursor = split_page(result.data, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if fields:
+        # Projected rows don't satisfy the full response model
+        return JSONResponse(rows, headers=headers)
+    response.headers.update(headers)
+    return rows
+
+
+@router.get("/stream")
+async def stream_jobs(
+    project_id: UUID,
+    last_event_id: str | None = Header(None),
+):
+    """Server-sent events for a project's job inserts and status changes.
+
+    Each ``job`` event carries the changed job row. On reconnect the browser
+    sends ``Last-Event-ID`` and missed events are replayed; a ``resync``
+    event means they could not be, and the job list should be reloaded.
+    Comment lines are sent as heartbeats while nothing happens.
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = -1  # unknown id: forces a resync
+    subscription = get_job_event_broker().subscribe(str(project_id), resume_from)
+    heartbeat = get_settings().job_events_heartbeat
+
+    async def event_stream():
+        with subscription:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{job_id}", response_model=TrainingJob)
 async def get_job(job_id: UUID):
     """Get a single training job by ID."""
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("training_jobs")
         .select("*")
         .eq("id", str(job_id))
         .single()
-        .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -38,12 +119,22 @@ async def get_job(job_id: UUID):
 
 @router.post("", response_model=TrainingJob, status_code=201)
 async def create_job(job: TrainingJobCreate):
-    """Create a new training job record."""
+    """Create a new training job record (one per project, commit and branch)."""
     client = get_supabase_admin_client()
-    result = (
-        client.table("training_jobs").insert(job.model_dump(mode="json")).execute()
+    result = await execute(
+        client.table("training_jobs").upsert(
+            job.model_dump(mode="json"),
+            on_conflict="project_id,commit_sha,branch",
+            ignore_duplicates=True,
+        )
     )
-    return result.data[0]
+    if not result.data:
+        raise HTTPException(
+            status_code=409, detail="A job already exists for this commit and branch"
+        )
+    created = result.data[0]
+    get_job_event_broker().publish(created["project_id"], "created", created)
+    return created
 
 
 @router.patch("/{job_id}", response_model=TrainingJob)
@@ -53,32 +144,39 @@ async def update_job(job_id: UUID, updates: TrainingJobUpdate):
     data = updates.model_dump(exclude_none=True, mode="json")
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = (
-        client.table("training_jobs")
-        .update(data)
-        .eq("id", str(job_id))
-        .execute()
+    result = await execute(
+        client.table("training_jobs").update(data).eq("id", str(job_id))
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Job not found")
-    return result.data[0]
+
+    job = result.data[0]
+    if job.get("mlflow_run_id"):
+        get_mlflow_cache().invalidate_run(job["mlflow_run_id"])
+    get_job_event_broker().publish(job["project_id"], "updated", job)
+    return job
 
 
 @router.get("/{job_id}/sagemaker-status")
 async def get_sagemaker_status(job_id: UUID):
-    """Fetch live SageMaker status for a job."""
+    """SageMaker status for a job, as last synced by the background reconciler.
+
+    ``synced_at`` says how fresh it is. A job the reconciler has not seen yet
+    is described once here and stored.
+    """
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("training_jobs")
-        .select("sagemaker_job_name")
+        .select(f"{ACTIVE_JOB_COLUMNS}, sagemaker_details")
         .eq("id", str(job_id))
         .single()
-        .execute()
     )
     if not result.data or not result.data.get("sagemaker_job_name"):
         raise HTTPException(
             status_code=404, detail="Job not found or no SageMaker job name"
         )
 
-    sagemaker = SageMakerService()
-    return sagemaker.get_training_job(result.data["sagemaker_job_name"])
+    job = result.data
+    if not job.get("sagemaker_details"):
+        job = await get_sagemaker_reconciler().sync(job)
+    return {**job["sagemaker_details"], "synced_at": job["sagemaker_synced_at"]}
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Request
+
+from gamma.services.agent_service import get_context_cache
+from gamma.services.content_cache import get_content_cache
+from gamma.services.github_auth import (
+    get_app_jwt_signer,
+    get_installation_token_cache,
+)
+from gamma.services.github_cache import get_github_response_cache
+from gamma.services.github_ratelimit import get_github_rate_limiter
+from gamma.services.github_repos import get_repo_list_cache
+from gamma.services.http_pool import get_http_pool
+from gamma.services.job_events import get_job_event_broker
+from gamma.services.mlflow_cache import get_mlflow_cache
+from gamma.services.sagemaker_reconciler import get_sagemaker_reconciler
+from gamma.services.timing import get_agent_timings
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics(request: Request):
+    """Process-local performance counters for this worker."""
+    webhook_queue = getattr(request.app.state, "webhook_queue", None)
+    return {
+        "http": get_http_pool().stats(),
+        "github": {
+            "app_jwt": get_app_jwt_signer().stats(),
+            "installation_tokens": get_installation_token_cache().stats(),
+            "content_cache": get_content_cache().stats(),
+            "repo_lists": get_repo_list_cache().stats(),
+            "responses": get_github_response_cache().stats(),
+            "rate_limits": get_github_rate_limiter().stats(),
+        },
+        "mlflow": {
+            "cache": get_mlflow_cache().stats(),
+        },
+        "agent": {
+            "phases": get_agent_timings().stats(),
+            "context_cache": get_context_cache().stats(),
+        },
+        "webhooks": webhook_queue.stats() if webhook_queue is not None else None,
+        "sagemaker": get_sagemaker_reconciler().stats(),
+        "job_events": get_job_event_broker().stats(),
+    }
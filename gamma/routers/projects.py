@@ -1,9 +1,18 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 
 from gamma.config import get_settings
-from gamma.db import get_supabase_admin_client
+from gamma.db import execute, get_supabase_admin_client, run_db
+from gamma.db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    keyset_page,
+    select_columns,
+    split_page,
+)
 from gamma.models import Project, ProjectCreate, ProjectCreateRequest, ProjectUpdate
 from gamma.services.github_service import GitHubService
 
@@ -11,26 +20,46 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.get("", response_model=list[Project])
-async def list_projects(owner_id: UUID | None = None):
-    """List all projects, optionally filtered by owner."""
+async def list_projects(
+    response: Response,
+    owner_id: UUID | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+):
+    """List projects, newest first, optionally filtered by owner.
+
+    Paginated like ``GET /jobs``: follow the ``X-Next-Cursor`` header.
+    """
     client = get_supabase_admin_client()
-    query = client.table("projects").select("*")
-    if owner_id:
-        query = query.eq("owner_id", str(owner_id))
-    result = query.order("created_at", desc=True).execute()
-    return result.data
+    try:
+        query = client.table("projects").select(
+            select_columns(fields, Project.model_fields)
+        )
+        if owner_id:
+            query = query.eq("owner_id", str(owner_id))
+        query = keyset_page(query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = await execute(query)
+    rows, next_cursor = split_page(result.data, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if fields:
+        return JSONResponse(rows, headers=headers)
+    response.headers.update(headers)
+    return rows
 
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project(project_id: UUID):
     """Get a single project by ID."""
     client = get_supabase_admin_client()
-    result = (
+    result = await execute(
         client.table("projects")
         .select("*")
         .eq("id", str(project_id))
         .single()
-        .execute()
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -57,22 +86,24 @@ async def create_project(project: ProjectCreateRequest, owner_id: UUID):
 
     # Ensure a profile row exists for this user (safety net if the DB trigger
     # hadn't been applied yet when the user first signed up).
-    user_resp = client.auth.admin.get_user_by_id(str(owner_id))
+    user_resp = await run_db(client.auth.admin.get_user_by_id, str(owner_id))
     if user_resp and user_resp.user:
         meta = user_resp.user.user_metadata or {}
-        client.table("profiles").upsert(
-            {
-                "id": str(owner_id),
-                "github_username": meta.get("user_name") or "",
-                "avatar_url": meta.get("avatar_url"),
-            },
-            on_conflict="id",
-        ).execute()
-
-    result = (
-        client.table("projects")
-        .insert({"owner_id": str(owner_id), **full_project.model_dump()})
-        .execute()
+        await execute(
+            client.table("profiles").upsert(
+                {
+                    "id": str(owner_id),
+                    "github_username": meta.get("user_name") or "",
+                    "avatar_url": meta.get("avatar_url"),
+                },
+                on_conflict="id",
+            )
+        )
+
+    result = await execute(
+        client.table("projects").insert(
+            {"owner_id": str(owner_id), **full_project.model_dump()}
+        )
     )
     return result.data[0]
 
@@ -84,11 +115,8 @@ async def update_project(project_id: UUID, updates: ProjectUpdate):
     data = updates.model_dump(exclude_none=True)
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = (
-        client.table("projects")
-        .update(data)
-        .eq("id", str(project_id))
-        .execute()
+    result = await execute(
+        client.table("projects").update(data).eq("id", str(project_id))
     )
     if not result.data:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -99,4 +127,4 @@ async def update_project(project_id: UUID, updates: ProjectUpdate):
 async def delete_project(project_id: UUID):
     """Delete a project."""
     client = get_supabase_admin_client()
-    client.table("projects").delete().eq("id", str(project_id)).execute()
+    await execute(client.table("projects").delete().eq("id", str(project_id)))
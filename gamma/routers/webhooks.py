@@ -1,23 +1,36 @@
+import json
 import re
 
 from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import JSONResponse
 
-from gamma.db import get_supabase_admin_client
+from gamma.db import execute, get_supabase_admin_client
+from gamma.services.background import spawn
 from gamma.services.github_service import GitHubService
+from gamma.services.job_events import get_job_event_broker
+from gamma.services.mlflow_cache import get_mlflow_cache
+from gamma.services.webhook_queue import enqueue_delivery, get_recent_deliveries
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 # Matches 'models' or 'models/<anything>'
 MODELS_BRANCH_PATTERN = re.compile(r"^refs/heads/models(/.*)?$")
 
+TERMINAL_JOB_STATUSES = frozenset({"completed", "failed"})
+
 
 @router.post("/github")
 async def github_webhook(
     request: Request,
     x_hub_signature_256: str = Header(None),
     x_github_event: str = Header(None),
+    x_github_delivery: str = Header(None),
 ):
-    """Handle GitHub webhook events."""
+    """Verify a GitHub webhook and queue it for background processing.
+
+    Returns 202 as soon as the delivery is persisted; the actual work is done
+    by the webhook queue workers (see ``process_event``).
+    """
     body = await request.body()
 
     # Verify webhook signature
@@ -27,14 +40,37 @@ async def github_webhook(
     ):
         raise HTTPException(status_code=401, detail="Invalid webhook signature")
 
-    payload = await request.json()
+    if x_github_event not in EVENT_HANDLERS:
+        return {"status": "ignored", "event": x_github_event}
+
+    # GitHub redelivers on timeout; each delivery id is processed once
+    recent = get_recent_deliveries()
+    if x_github_delivery and x_github_delivery in recent:
+        return {"status": "duplicate", "delivery_id": x_github_delivery}
+
+    payload = json.loads(body)
+    delivery = await enqueue_delivery(x_github_event, payload, x_github_delivery)
+    if x_github_delivery:
+        recent.add(x_github_delivery)
+    if delivery is None:
+        return {"status": "duplicate", "delivery_id": x_github_delivery}
+
+    queue = getattr(request.app.state, "webhook_queue", None)
+    if queue is not None:
+        queue.notify()
+
+    return JSONResponse(
+        status_code=202,
+        content={"status": "queued", "event": x_github_event, "delivery": delivery},
+    )
 
-    if x_github_event == "push":
-        return await _handle_push(payload)
-    elif x_github_event == "workflow_run":
-        return await _handle_workflow_run(payload)
 
-    return {"status": "ignored", "event": x_github_event}
+async def process_event(event: str, payload: dict) -> dict:
+    """Process a queued webhook delivery. Raising makes the queue retry it."""
+    handler = EVENT_HANDLERS.get(event)
+    if handler is None:
+        return {"status": "ignored", "event": event}
+    return await handler(payload)
 
 
 async def _handle_push(payload: dict) -> dict:
@@ -51,34 +87,60 @@ async def _handle_push(payload: dict) -> dict:
     client = get_supabase_admin_client()
 
     # Find the project associated with this repo
-    project = (
+    project = await execute(
         client.table("projects")
         .select("id")
         .eq("github_repo_full_name", repo_full_name)
-        .execute()
     )
     if not project.data:
         return {"status": "ignored", "reason": "repo not connected to a project"}
 
     project_id = project.data[0]["id"]
+    existing = await _find_push_job(client, project_id, commit_sha, branch)
+    if existing:
+        return {"status": "exists", "job_id": existing[0]["id"]}
 
-    # Create a training job record
-    result = (
-        client.table("training_jobs")
-        .insert(
+    # Create a training job record; a concurrent redelivery may win the race
+    result = await execute(
+        client.table("training_jobs").upsert(
             {
                 "project_id": project_id,
                 "commit_sha": commit_sha,
                 "branch": branch,
                 "status": "pending",
-            }
+            },
+            on_conflict="project_id,commit_sha,branch",
+            ignore_duplicates=True,
         )
-        .execute()
     )
+    if not result.data:
+        existing = await _find_push_job(client, project_id, commit_sha, branch)
+        return {"status": "exists", "job_id": existing[0]["id"]}
+
+    get_job_event_broker().publish(project_id, "created", result.data[0])
+
+    # The diff is about to be requested for summaries and chat; fetch it now
+    if installation_id:
+        spawn(
+            GitHubService().warm_commit(installation_id, repo_full_name, commit_sha),
+            name=f"warm-{commit_sha}",
+        )
 
     return {"status": "created", "job_id": result.data[0]["id"]}
 
 
+async def _find_push_job(client, project_id: str, commit_sha: str, branch: str) -> list:
+    """Look up the job for a push via the (project_id, commit_sha, branch) key."""
+    result = await execute(
+        client.table("training_jobs")
+        .select("id")
+        .eq("project_id", project_id)
+        .eq("commit_sha", commit_sha)
+        .eq("branch", branch)
+    )
+    return result.data
+
+
 async def _handle_workflow_run(payload: dict) -> dict:
     """Handle workflow_run events — update training job status."""
     action = payload.get("action", "")
@@ -90,24 +152,39 @@ async def _handle_workflow_run(payload: dict) -> dict:
     client = get_supabase_admin_client()
 
     # Find the matching training job by commit SHA
-    job = (
+    job = await execute(
         client.table("training_jobs")
-        .select("id, project_id")
+        .select("id, project_id, mlflow_run_id, status, github_workflow_run_id")
         .eq("commit_sha", head_sha)
-        .execute()
     )
     if not job.data:
         return {"status": "ignored", "reason": "no matching job for commit"}
 
-    job_id = job.data[0]["id"]
+    current = job.data[0]
+    job_id = current["id"]
     updates: dict = {"github_workflow_run_id": run_id}
 
     if action == "in_progress":
-        updates["status"] = "running"
+        # A late or redelivered in_progress must not reopen a finished job
+        if current.get("status") not in TERMINAL_JOB_STATUSES:
+            updates["status"] = "running"
     elif action == "completed":
         conclusion = workflow_run.get("conclusion", "")
         updates["status"] = "completed" if conclusion == "success" else "failed"
 
-    client.table("training_jobs").update(updates).eq("id", job_id).execute()
+    if all(current.get(key) == value for key, value in updates.items()):
+        return {"status": "unchanged", "job_id": job_id, "action": action}
+
+    updated = await execute(client.table("training_jobs").update(updates).eq("id", job_id))
+    if updated.data:
+        get_job_event_broker().publish(current["project_id"], "updated", updated.data[0])
+    if job.data[0].get("mlflow_run_id"):
+        get_mlflow_cache().invalidate_run(job.data[0]["mlflow_run_id"])
 
     return {"status": "updated", "job_id": job_id, "action": action}
+
+
+EVENT_HANDLERS = {
+    "push": _handle_push,
+    "workflow_run": _handle_workflow_run,
+}
@@ -1,10 +1,71 @@
+import asyncio
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable
+
 import anthropic
 
 from gamma.config import get_settings
+from gamma.services.diff_context import build_diff_context
 from gamma.services.github_service import GitHubService
 from gamma.services.mlflow_service import MLflowService
 
 
+SYSTEM_PROMPT = (
+    "You are Gamma Agent, an AI assistant embedded in an ML development "
+    "platform. You help ML engineers understand their code changes, experiment "
+    "results, and training metrics. Be concise and technical."
+)
+
+# Prompt-cache breakpoint; the prefix up to a marked block is cached for ~5 min
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _system_blocks(context: str, summary: str = "") -> list[dict]:
+    """System prompt with a cache breakpoint after the (stable) run context.
+
+    The conversation summary changes on every fold, so it goes after the
+    breakpoint.
+    """
+    blocks = [{"type": "text", "text": SYSTEM_PROMPT}]
+    if context:
+        blocks.append({"type": "text", "text": f"Context:\n{context}"})
+    blocks[-1]["cache_control"] = CACHE_CONTROL
+    if summary:
+        blocks.append(
+            {"type": "text", "text": f"Summary of the earlier conversation:\n{summary}"}
+        )
+    return blocks
+
+
+def _with_history_breakpoint(messages: list[dict]) -> list[dict]:
+    """Mark the newest message so the whole conversation so far is cached.
+
+    On the next turn everything up to this point is an unchanged prefix and
+    is read from the cache; only the new turns are processed in full.
+    """
+    if not messages:
+        return messages
+    *older, last = messages
+    content = last["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    else:
+        content = [dict(block) for block in content]
+    content[-1]["cache_control"] = CACHE_CONTROL
+    return [*older, {**last, "content": content}]
+
+
+def _usage_dict(usage) -> dict:
+    return {
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+    }
+
+
 class AgentService:
     """LLM-powered agent for code analysis and experiment assistance."""
 
@@ -15,6 +76,7 @@ class AgentService:
         )
         self.github = GitHubService()
         self.mlflow = MLflowService()
+        self.last_usage: dict | None = None
 
     async def generate_commit_summary(
         self,
@@ -26,6 +88,7 @@ class AgentService:
         diff = await self.github.get_commit_diff(
             installation_id, repo_full_name, commit_sha
         )
+        diff_context = await self._diff_context(diff)
 
         message = await self.client.messages.create(
             model=self.settings.anthropic_model,
@@ -39,38 +102,67 @@ class AgentService:
                         "training code, model architecture, hyperparameters, or data "
                         "processing. Keep it to 2-4 sentences.\n\n"
                         f"Commit: {commit_sha}\n\n"
-                        f"```diff\n{diff}\n```"
+                        f"{diff_context}"
                     ),
                 }
             ],
         )
         return message.content[0].text
 
+    async def _diff_context(self, diff: str) -> str:
+        """Fenced, token-budgeted diff followed by a note on what was left out."""
+        context = await asyncio.to_thread(
+            build_diff_context, diff, self.settings.agent_diff_token_budget
+        )
+        text = f"```diff\n{context.diff}\n```"
+        if context.summary:
+            text += f"\n\n{context.summary}"
+        return text
+
     async def chat(
         self,
         messages: list[dict],
         context: str = "",
+        summary: str = "",
     ):
         """Stream a chat response from the agent.
 
-        Yields text chunks as they arrive from the LLM.
+        Yields text chunks as they arrive from the LLM. Token usage for the
+        reply, including prompt-cache reads and writes, is left in
+        ``self.last_usage`` once the stream is exhausted.
         """
-        system_prompt = (
-            "You are Gamma Agent, an AI assistant embedded in an ML development "
-            "platform. You help ML engineers understand their code changes, experiment "
-            "results, and training metrics. Be concise and technical."
-        )
-        if context:
-            system_prompt += f"\n\nContext:\n{context}"
-
         async with self.client.messages.stream(
             model=self.settings.anthropic_model,
             max_tokens=2048,
-            system=system_prompt,
-            messages=messages,
+            system=_system_blocks(context, summary),
+            messages=_with_history_breakpoint(messages),
         ) as stream:
             async for text in stream.text_stream:
                 yield text
+            final = await stream.get_final_message()
+        self.last_usage = _usage_dict(final.usage)
+
+    async def summarize_conversation(self, summary: str, messages: list[dict]) -> str:
+        """Fold ``messages`` into an existing rolling conversation summary."""
+        transcript = "\n\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        message = await self.client.messages.create(
+            model=self.settings.anthropic_model,
+            max_tokens=self.settings.agent_summary_max_tokens,
+            messages=[
+                {
+                    "role": "user",
+                    "content": (
+                        "You maintain a running summary of a conversation between an "
+                        "ML engineer and an assistant. Update the summary with the new "
+                        "turns below. Keep facts, decisions, numbers and open questions; "
+                        "drop pleasantries. Reply with the updated summary only.\n\n"
+                        f"Current summary:\n{summary or '(none)'}\n\n"
+                        f"New turns:\n{transcript}"
+                    ),
+                }
+            ],
+        )
+        return message.content[0].text
 
     async def build_context(
         self,
@@ -79,30 +171,91 @@ class AgentService:
         commit_sha: str | None = None,
         mlflow_run_id: str | None = None,
     ) -> str:
-        """Assemble context from diff and experiment data for the agent."""
-        parts: list[str] = []
-
-        if commit_sha:
-            try:
-                diff = await self.github.get_commit_diff(
-                    installation_id, repo_full_name, commit_sha
-                )
-                parts.append(f"## Commit Diff ({commit_sha[:8]})\n```diff\n{diff}\n```")
-            except Exception:
-                parts.append(f"(Could not fetch diff for {commit_sha})")
-
-        if mlflow_run_id:
-            try:
-                run = await self.mlflow.get_run(mlflow_run_id)
-                metrics = run.get("data", {}).get("metrics", [])
-                params = run.get("data", {}).get("params", [])
-                parts.append("## Experiment Metrics")
-                for m in metrics:
-                    parts.append(f"- {m['key']}: {m['value']}")
-                parts.append("## Hyperparameters")
-                for p in params:
-                    parts.append(f"- {p['key']}: {p['value']}")
-            except Exception:
-                parts.append(f"(Could not fetch MLflow run {mlflow_run_id})")
-
-        return "\n\n".join(parts)
+        """Assemble context from diff and experiment data for the agent.
+
+        The diff and the run are fetched concurrently. The diff section is
+        immutable per commit and reused for ``agent_context_ttl`` seconds,
+        which also keeps the prompt prefix byte-identical across turns for
+        caching. The run section is rebuilt every turn; ``MLflowCache``
+        decides how fresh a run's metrics need to be.
+        """
+        sections = await asyncio.gather(
+            self._diff_section(installation_id, repo_full_name, commit_sha),
+            self._run_section(mlflow_run_id),
+        )
+        return "\n\n".join(part for section in sections for part in section)
+
+    async def _diff_section(
+        self, installation_id: int, repo_full_name: str, commit_sha: str | None
+    ) -> list[str]:
+        if not commit_sha:
+            return []
+        key = (repo_full_name, commit_sha)
+        cache = get_context_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return [cached]
+        try:
+            diff = await self.github.get_commit_diff(
+                installation_id, repo_full_name, commit_sha
+            )
+            diff_context = await self._diff_context(diff)
+        except Exception:
+            return [f"(Could not fetch diff for {commit_sha})"]
+        section = f"## Commit Diff ({commit_sha[:8]})\n{diff_context}"
+        cache.set(key, section)
+        return [section]
+
+    async def _run_section(self, mlflow_run_id: str | None) -> list[str]:
+        if not mlflow_run_id:
+            return []
+        try:
+            run = await self.mlflow.get_run(mlflow_run_id)
+            metrics = run.get("data", {}).get("metrics", [])
+            params = run.get("data", {}).get("params", [])
+            parts = ["## Experiment Metrics"]
+            parts.extend(f"- {m['key']}: {m['value']}" for m in metrics)
+            parts.append("## Hyperparameters")
+            parts.extend(f"- {p['key']}: {p['value']}" for p in params)
+            return parts
+        except Exception:
+            return [f"(Could not fetch MLflow run {mlflow_run_id})"]
+
+
+class ContextCache:
+    """Small TTL + LRU cache of assembled commit diff sections."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, context: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, context)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache()
+def get_context_cache() -> ContextCache:
+    settings = get_settings()
+    return ContextCache(
+        ttl=settings.agent_context_ttl,
+        max_entries=settings.agent_context_cache_size,
+    )
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+import boto3
+from botocore.client import BaseClient
+from botocore.config import Config
+
+from gamma.config import get_settings
+
+T = TypeVar("T")
+
+_client_lock = threading.Lock()
+
+
+@lru_cache()
+def get_boto_client(service_name: str) -> BaseClient:
+    """Process-wide boto3 client per AWS service (clients are thread-safe).
+
+    Building a client costs tens of milliseconds, so it happens once per
+    process rather than once per request.
+    """
+    settings = get_settings()
+    config = Config(
+        region_name=settings.aws_region,
+        max_pool_connections=settings.aws_max_pool_connections,
+        retries={"max_attempts": settings.aws_max_attempts, "mode": "adaptive"},
+        connect_timeout=settings.aws_connect_timeout,
+        read_timeout=settings.aws_read_timeout,
+        tcp_keepalive=True,
+    )
+    if service_name == "s3":
+        config = config.merge(Config(signature_version="s3v4"))
+    # lru_cache doesn't stop pool threads that miss together from each building
+    # a client, and concurrent Session()/client construction (loaders,
+    # credential resolution) can race inside botocore; serialise it
+    with _client_lock:
+        return boto3.session.Session().client(service_name, config=config)
+
+
+@lru_cache()
+def get_aws_executor() -> ThreadPoolExecutor:
+    """Bounded thread pool for blocking boto3 calls, sized to the client pools."""
+    settings = get_settings()
+    return ThreadPoolExecutor(
+        max_workers=settings.aws_max_workers,
+        thread_name_prefix="aws",
+    )
+
+
+async def run_aws(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking boto3-backed call in the AWS thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_aws_executor(), partial(fn, *args, **kwargs))
+
+
+def shutdown_aws_executor() -> None:
+    """Drain and release the AWS thread pool (called on app shutdown)."""
+    if get_aws_executor.cache_info().currsize:
+        get_aws_executor().shutdown(wait=True)
+        get_aws_executor.cache_clear()
@@ -0,0 +1,170 @@
+"""Content-addressed cache for immutable GitHub content.
+
+A diff or file read at a full commit SHA never changes, so it can be kept
+indefinitely. Entries live in a byte-bounded in-memory LRU in front of an
+on-disk store that every worker on the host shares. Disk writes are atomic
+(temp file + rename) and the store is trimmed back under its size limit by
+evicting the least recently used files, judged by mtime, which reads bump.
+The disk tier is best effort: an unreadable entry is a miss and a failed
+write is skipped, so a full or broken disk never fails the caller.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from gamma.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Full SHA-1 or SHA-256 object ids; branch names and short SHAs can move
+FULL_SHA = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$")
+
+# Sweep the disk store after this many writes even if under the estimate
+SWEEP_EVERY = 100
+
+
+def is_immutable_ref(ref: str) -> bool:
+    return bool(FULL_SHA.match(ref))
+
+
+def content_key(repo_full_name: str, sha: str, path: str | None = None) -> str:
+    """Cache key for a commit diff (no ``path``) or a file at a commit."""
+    raw = "\0".join([repo_full_name.lower(), sha, path or ""])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ContentCache:
+    """Two-tier (memory LRU + shared disk) cache of immutable text content."""
+
+    def __init__(self, directory: Path, memory_max_bytes: int, disk_max_bytes: int) -> None:
+        self.directory = directory
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self.memory_bytes = 0
+        self._writes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        self.disk_errors = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    async def get(self, key: str) -> str | None:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return value
+        try:
+            value = await asyncio.to_thread(self._read, key)
+        except (OSError, UnicodeDecodeError) as e:
+            self.disk_errors += 1
+            logger.warning("Content cache read failed for %s: %s", key, e)
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._remember(key, value)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._remember(key, value)
+        try:
+            await asyncio.to_thread(self._write, key, value)
+        except OSError as e:
+            self.disk_errors += 1
+            logger.warning("Content cache write failed for %s: %s", key, e)
+
+    def _remember(self, key: str, value: str) -> None:
+        size = len(value)
+        if size > self.memory_max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self.memory_bytes -= len(old)
+        self._memory[key] = value
+        self.memory_bytes += size
+        while self.memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def _read(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            value = path.read_text(encoding="utf-8")
+            os.utime(path)  # mark as recently used for eviction
+        except FileNotFoundError:
+            return None
+        return value
+
+    def _write(self, key: str, value: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._writes += 1
+        if self._writes % SWEEP_EVERY == 1:
+            self._sweep()
+
+    def _sweep(self) -> None:
+        """Evict least recently used files until the store is under 90% of its limit."""
+        files = []
+        total = 0
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another worker
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.disk_max_bytes:
+            return
+        target = self.disk_max_bytes * 0.9
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.disk_evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self.memory_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "disk_evictions": self.disk_evictions,
+            "disk_errors": self.disk_errors,
+        }
+
+
+@lru_cache()
+def get_content_cache() -> ContentCache:
+    settings = get_settings()
+    directory = settings.content_cache_dir or os.path.join(
+        tempfile.gettempdir(), "gamma-content-cache"
+    )
+    return ContentCache(
+        Path(directory).expanduser(),
+        memory_max_bytes=settings.content_cache_memory_bytes,
+        disk_max_bytes=settings.content_cache_disk_bytes,
+    )
@@ -0,0 +1,98 @@
+"""Bounded agent conversation history with a rolling summary.
+
+Only messages after ``agent_conversations.summary_through`` are sent to the
+model verbatim, together with the stored summary of everything before. Once
+more than ``agent_history_max_turns`` turns are unsummarized, the oldest of
+them are folded into the summary in the background, leaving the newest
+``agent_history_turns``. Folding in batches rather than every turn keeps the
+verbatim prefix stable between folds, so it stays a prompt-cache hit.
+"""
+from gamma.config import get_settings
+from gamma.db import execute, get_supabase_admin_client
+from gamma.services.agent_service import AgentService
+from gamma.services.background import spawn
+from gamma.services.singleflight import SingleFlight
+
+# One fold per conversation at a time in this process
+_folds: SingleFlight[str, None] = SingleFlight()
+
+
+class ConversationHistory:
+    """Loads the prompt history for a conversation and keeps it bounded."""
+
+    def __init__(self, agent: AgentService) -> None:
+        settings = get_settings()
+        self.agent = agent
+        self.keep_messages = settings.agent_history_turns * 2
+        self.max_messages = settings.agent_history_max_turns * 2
+
+    async def load(self, conversation: dict) -> tuple[list[dict], str]:
+        """Return ``(messages, summary)`` for the next model call.
+
+        ``conversation`` is the ``agent_conversations`` row. Reads at most
+        ``max_messages`` rows even if folding has fallen behind.
+        """
+        query = (
+            get_supabase_admin_client()
+            .table("agent_messages")
+            .select("role, content, created_at")
+            .eq("conversation_id", str(conversation["id"]))
+        )
+        if conversation.get("summary_through"):
+            query = query.gt("created_at", conversation["summary_through"])
+        result = await execute(
+            query.order("created_at", desc=True).limit(self.max_messages)
+        )
+        rows = list(reversed(result.data))
+        # The model expects the conversation to open with a user turn
+        while rows and rows[0]["role"] != "user":
+            rows.pop(0)
+        messages = [{"role": r["role"], "content": r["content"]} for r in rows]
+        return messages, conversation.get("summary") or ""
+
+    def schedule_fold(self, conversation_id: str) -> None:
+        """Fold old turns into the summary in the background, if needed."""
+        spawn(
+            _folds.do(str(conversation_id), lambda: self._fold(str(conversation_id))),
+            name=f"fold-{conversation_id}",
+        )
+
+    async def _fold(self, conversation_id: str) -> None:
+        client = get_supabase_admin_client()
+        conversation = await execute(
+            client.table("agent_conversations")
+            .select("summary, summary_through")
+            .eq("id", conversation_id)
+            .single()
+        )
+        summary = conversation.data.get("summary") or ""
+        summary_through = conversation.data.get("summary_through")
+
+        query = (
+            client.table("agent_messages")
+            .select("role, content, created_at")
+            .eq("conversation_id", conversation_id)
+        )
+        if summary_through:
+            query = query.gt("created_at", summary_through)
+        rows = (await execute(query.order("created_at"))).data
+        if len(rows) <= self.max_messages:
+            return
+
+        cut = len(rows) - self.keep_messages
+        while cut < len(rows) and rows[cut]["role"] != "user":
+            cut += 1  # keep the verbatim window starting on a user turn
+        folded = rows[:cut]
+        new_summary = await self.agent.summarize_conversation(summary, folded)
+
+        # Conditional on the summary we started from, in case another worker
+        # folded the same turns meanwhile
+        update = client.table("agent_conversations").update(
+            {"summary": new_summary, "summary_through": folded[-1]["created_at"]}
+        ).eq("id", conversation_id)
+        if summary_through:
+            update = update.eq("summary_through", summary_through)
+        else:
+            update = update.is_("summary_through", "null")
+        await execute(update)
+
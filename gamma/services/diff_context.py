@@ -0,0 +1,276 @@
+"""Token-budgeted commit diffs for agent prompts.
+
+The unified diff is split into per-file hunks. Lockfiles, notebooks,
+binaries, vendored, generated and data files are dropped outright. The
+remaining hunks are ranked by how likely they are to matter for ML work
+(configs, model code, the training loop) and packed greedily into a token
+budget. Whatever did not make it is listed in a short elision summary so the
+model knows the diff is partial.
+
+Tokens are estimated at four characters each, which is close enough for
+budgeting and needs no tokenizer.
+"""
+import posixpath
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+CHARS_PER_TOKEN = 4
+
+# Hunks larger than the remaining budget are cut down rather than dropped
+# only if at least this many tokens are left.
+MIN_TRUNCATED_TOKENS = 100
+TRUNCATION_MARKER = "... (hunk truncated)"
+
+LOCKFILES = frozenset(
+    {
+        "uv.lock",
+        "poetry.lock",
+        "Pipfile.lock",
+        "pdm.lock",
+        "package-lock.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+        "bun.lockb",
+        "Cargo.lock",
+        "go.sum",
+        "composer.lock",
+        "Gemfile.lock",
+    }
+)
+NOTEBOOK_EXTENSIONS = frozenset({".ipynb"})
+DATA_EXTENSIONS = frozenset(
+    {
+        ".csv", ".tsv", ".jsonl", ".parquet", ".arrow", ".feather",
+        ".npy", ".npz", ".pkl", ".pickle", ".h5", ".hdf5",
+        ".pt", ".pth", ".ckpt", ".safetensors", ".onnx", ".bin",
+    }
+)
+VENDORED_DIRS = frozenset(
+    {"vendor", "vendored", "third_party", "node_modules", "site-packages", ".venv"}
+)
+GENERATED_DIRS = frozenset({"dist", "build", "__pycache__", ".next"})
+GENERATED_PATTERN = re.compile(r"(\.min\.(js|css)|_pb2(_grpc)?\.pyi?|\.pb\.go|\.map)$")
+
+CONFIG_EXTENSIONS = frozenset({".yaml", ".yml", ".toml", ".json", ".cfg", ".ini"})
+DOC_EXTENSIONS = frozenset({".md", ".rst", ".txt"})
+
+# Path fragments and their relevance weight; the best match wins
+PATH_WEIGHTS = (
+    (re.compile(r"config|hparam|hyper|params|sweep"), 10),
+    (re.compile(r"model|arch|network|layers?|attention|encoder|decoder"), 9),
+    (re.compile(r"train|trainer|loss|optim|schedul|finetune"), 9),
+    (re.compile(r"data|dataset|loader|preprocess|transform|augment|tokeniz"), 7),
+    (re.compile(r"eval|metric|valid|infer|predict"), 6),
+)
+
+# Identifiers that make a hunk more interesting wherever it lives
+CONTENT_PATTERN = re.compile(
+    r"\b(lr|learning_rate|batch_size|epochs?|optimizer|scheduler|weight_decay|"
+    r"dropout|momentum|warmup|loss|backward|forward|nn\.\w+|torch\.\w+|"
+    r"hidden_size|num_layers|seed|mlflow\.\w+)\b"
+)
+
+DIFF_HEADER = re.compile(r"^diff --git a/(.+?) b/(.+)$")
+
+
+@dataclass
+class Hunk:
+    lines: list[str]
+    score: float = 0.0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+@dataclass
+class FileDiff:
+    path: str
+    header: list[str]
+    hunks: list[Hunk] = field(default_factory=list)
+    binary: bool = False
+
+
+@dataclass
+class DiffContext:
+    """A diff trimmed to a token budget, plus what was left out."""
+
+    diff: str
+    tokens: int
+    skipped_files: dict[str, list[str]] = field(default_factory=dict)  # reason -> paths
+    elided_hunks: dict[str, int] = field(default_factory=dict)  # path -> hunk count
+    truncated: list[str] = field(default_factory=list)
+
+    @property
+    def summary(self) -> str:
+        """Plain-text note on elided content, or ``""`` if nothing was elided."""
+        lines: list[str] = []
+        for reason, paths in self.skipped_files.items():
+            lines.append(f"- {reason} ({len(paths)}): {_join_paths(paths)}")
+        if self.elided_hunks:
+            count = sum(self.elided_hunks.values())
+            lines.append(
+                f"- {count} lower-priority hunks over the token budget from: "
+                f"{_join_paths(list(self.elided_hunks))}"
+            )
+        if self.truncated:
+            lines.append(f"- truncated hunks in: {_join_paths(self.truncated)}")
+        if not lines:
+            return ""
+        return "Omitted from the diff above:\n" + "\n".join(lines)
+
+
+def _join_paths(paths: list[str], limit: int = 10) -> str:
+    shown = ", ".join(paths[:limit])
+    if len(paths) > limit:
+        shown += f", and {len(paths) - limit} more"
+    return shown
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def parse_unified_diff(diff: str) -> list[FileDiff]:
+    """Split a ``git diff`` into files, each with its header lines and hunks."""
+    files: list[FileDiff] = []
+    current: FileDiff | None = None
+    for line in diff.splitlines():
+        match = DIFF_HEADER.match(line)
+        if match:
+            current = FileDiff(path=match.group(2), header=[line])
+            files.append(current)
+        elif current is None:
+            continue  # preamble before the first file
+        elif line.startswith("@@"):
+            current.hunks.append(Hunk([line]))
+        elif current.hunks:
+            current.hunks[-1].lines.append(line)
+        else:
+            current.header.append(line)
+            if line.startswith(("Binary files ", "GIT binary patch")):
+                current.binary = True
+    return files
+
+
+def skip_reason(file: FileDiff) -> str | None:
+    """Why a file's changes are noise for the agent, or ``None`` to keep it."""
+    path = file.path
+    name = posixpath.basename(path)
+    ext = posixpath.splitext(name)[1].lower()
+    parts = set(posixpath.dirname(path).split("/"))
+    if file.binary:
+        return "binary files"
+    if name in LOCKFILES:
+        return "lockfiles"
+    if ext in NOTEBOOK_EXTENSIONS:
+        return "notebooks"
+    if parts & VENDORED_DIRS:
+        return "vendored files"
+    if parts & GENERATED_DIRS or GENERATED_PATTERN.search(name):
+        return "generated files"
+    if ext in DATA_EXTENSIONS:
+        return "data files"
+    return None
+
+
+def path_score(path: str) -> float:
+    """Relevance of a file to ML work, from its path alone."""
+    lowered = path.lower()
+    ext = posixpath.splitext(lowered)[1]
+    score = max((w for pattern, w in PATH_WEIGHTS if pattern.search(lowered)), default=3)
+    if ext in CONFIG_EXTENSIONS:
+        score = max(score, 8)
+    if "test" in lowered:
+        score -= 3
+    if ext in DOC_EXTENSIONS:
+        score -= 2
+    return score
+
+
+def hunk_score(hunk: Hunk, base: float) -> float:
+    changed = [line for line in hunk.lines[1:] if line[:1] in ("+", "-")]
+    hits = sum(1 for line in changed if CONTENT_PATTERN.search(line))
+    return base + min(hits, 10) * 0.5
+
+
+def build_diff_context(diff: str, token_budget: int) -> DiffContext:
+    """Trim ``diff`` to about ``token_budget`` tokens, most relevant hunks first.
+
+    Kept hunks are emitted in their original file and line order.
+    """
+    files = parse_unified_diff(diff)
+    skipped: dict[str, list[str]] = defaultdict(list)
+    kept: list[FileDiff] = []
+    for file in files:
+        reason = skip_reason(file)
+        if reason:
+            skipped[reason].append(file.path)
+        else:
+            kept.append(file)
+
+    ranked: list[tuple[float, int, int, FileDiff, Hunk]] = []
+    for file_index, file in enumerate(kept):
+        base = path_score(file.path)
+        for hunk_index, hunk in enumerate(file.hunks):
+            hunk.score = hunk_score(hunk, base)
+            ranked.append((-hunk.score, file_index, hunk_index, file, hunk))
+    ranked.sort(key=lambda item: item[:3])
+
+    remaining = token_budget
+    chosen: dict[int, dict[int, Hunk]] = {}
+    elided: dict[str, int] = defaultdict(int)
+    truncated: list[str] = []
+
+    # Header-only changes (renames, mode changes) are cheap; keep them if they fit
+    for file_index, file in enumerate(kept):
+        if not file.hunks:
+            cost = estimate_tokens("\n".join(file.header))
+            if cost <= remaining:
+                chosen[file_index] = {}
+                remaining -= cost
+
+    for _, file_index, hunk_index, file, hunk in ranked:
+        header_cost = 0
+        if file_index not in chosen:
+            header_cost = estimate_tokens("\n".join(file.header))
+        cost = header_cost + estimate_tokens(hunk.text)
+        if cost <= remaining:
+            chosen.setdefault(file_index, {})[hunk_index] = hunk
+            remaining -= cost
+        elif remaining - header_cost >= MIN_TRUNCATED_TOKENS:
+            # Keep the start of a large, high-ranked hunk rather than nothing
+            chars = (remaining - header_cost) * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+            lines = _truncate_lines(hunk.lines, chars) + [TRUNCATION_MARKER]
+            chosen.setdefault(file_index, {})[hunk_index] = Hunk(lines)
+            remaining = 0
+            truncated.append(file.path)
+        else:
+            elided[file.path] += 1
+
+    out: list[str] = []
+    for file_index in sorted(chosen):
+        file = kept[file_index]
+        out.extend(file.header)
+        for hunk_index in sorted(chosen[file_index]):
+            out.extend(chosen[file_index][hunk_index].lines)
+    text = "\n".join(out)
+    return DiffContext(
+        diff=text,
+        tokens=estimate_tokens(text),
+        skipped_files=dict(skipped),
+        elided_hunks=dict(elided),
+        truncated=truncated,
+    )
+
+
+def _truncate_lines(lines: list[str], chars: int) -> list[str]:
+    out: list[str] = []
+    used = 0
+    for line in lines:
+        used += len(line) + 1
+        if used > chars:
+            break
+        out.append(line)
+    return out
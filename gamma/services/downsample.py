@@ -0,0 +1,103 @@
+"""Shape-preserving downsampling for MLflow metric histories.
+
+Histories are first aligned on ``step`` (sorted, one point per step), then
+reduced to at most ``max_points`` points with either LTTB
+(Largest-Triangle-Three-Buckets) or min/max bucketing. Both work on plain
+column lists in a single linear pass, so a million-point history reduces
+in well under a second without numpy.
+"""
+from itertools import islice
+from typing import Literal
+
+DownsampleMethod = Literal["lttb", "minmax"]
+
+
+def align_steps(history: list[dict]) -> list[dict]:
+    """Sort points by step, keeping the most recently logged value per step."""
+    steps = [point.get("step", 0) for point in history]
+    if all(a < b for a, b in zip(steps, islice(steps, 1, None))):
+        return list(history)  # common case: already one point per step, in order
+
+    ordered = sorted(
+        history, key=lambda point: (point.get("step", 0), point.get("timestamp", 0))
+    )
+    aligned: list[dict] = []
+    for point in ordered:
+        if aligned and aligned[-1].get("step", 0) == point.get("step", 0):
+            aligned[-1] = point
+        else:
+            aligned.append(point)
+    return aligned
+
+
+def lttb_indices(xs: list[float], ys: list[float], threshold: int) -> list[int]:
+    """Indices of the points LTTB keeps; always includes the first and last."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    bucket_size = (n - 2) / (threshold - 2)
+    keep = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third triangle vertex
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        cx = sum(xs[next_start:next_end]) / count
+        cy = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - cx, cy - ay
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+
+    keep.append(n - 1)
+    return keep
+
+
+def minmax_indices(ys: list[float], threshold: int) -> list[int]:
+    """Indices of each bucket's min and max, plus the first and last points."""
+    n = len(ys)
+    if threshold >= n or threshold < 4:
+        return list(range(n))
+
+    buckets = (threshold - 2) // 2
+    bucket_size = (n - 2) / buckets
+    keep = {0, n - 1}
+    for i in range(buckets):
+        start = int(i * bucket_size) + 1
+        end = min(int((i + 1) * bucket_size) + 1, n - 1)
+        if start >= end:
+            continue
+        window = ys[start:end]
+        keep.add(start + window.index(min(window)))
+        keep.add(start + window.index(max(window)))
+    return sorted(keep)
+
+
+def downsample_history(
+    history: list[dict],
+    max_points: int,
+    method: DownsampleMethod = "lttb",
+) -> list[dict]:
+    """Step-align a metric history and reduce it to at most ``max_points``."""
+    points = align_steps(history)
+    if len(points) <= max_points:
+        return points
+
+    ys = [float(p["value"]) for p in points]
+    if method == "minmax":
+        indices = minmax_indices(ys, max_points)
+    else:
+        xs = [float(p["step"]) for p in points]
+        indices = lttb_indices(xs, ys, max_points)
+    return [points[i] for i in indices]
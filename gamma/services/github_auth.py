@@ -0,0 +1,133 @@
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+
+from gamma.config import get_settings
+from gamma.services.singleflight import SingleFlight
+
+
+APP_JWT_LIFETIME = 10 * 60  # GitHub's maximum
+
+
+@lru_cache()
+def load_signing_key(raw: str) -> RSAPrivateKey:
+    """Load and parse the GitHub App private key once per process.
+
+    ``raw`` is either a path to a PEM file or the PEM itself (env vars may
+    store literal ``\\n``).
+    """
+    # An inline PEM is never probed as a path: its base64 lines can be longer
+    # than the OS allows for a file name
+    p = None if raw.lstrip().startswith("-----BEGIN") else Path(raw).expanduser()
+    if p is not None and p.is_file():
+        pem = p.read_text()
+    else:
+        pem = raw.replace("\\n", "\n")
+    try:
+        return serialization.load_pem_private_key(pem.encode(), password=None)
+    except (ValueError, TypeError) as e:
+        raise jwt.exceptions.InvalidKeyError(str(e)) from e
+
+
+class AppJWTSigner:
+    """Signs GitHub App JWTs and reuses each one until close to its expiry."""
+
+    def __init__(self, app_id: str, private_key: str, refresh_margin: int = 60) -> None:
+        self.app_id = app_id
+        self.private_key = private_key
+        self.refresh_margin = refresh_margin
+        self._token: str | None = None
+        self._expires_at = 0
+        self.signed = 0
+        self.reused = 0
+
+    def token(self) -> str:
+        now = int(time.time())
+        if self._token and self._expires_at - self.refresh_margin > now:
+            self.reused += 1
+            return self._token
+
+        expires_at = now + APP_JWT_LIFETIME
+        payload = {
+            "iat": now - 60,
+            "exp": expires_at,
+            "iss": self.app_id,
+        }
+        key = load_signing_key(self.private_key)
+        self._token = jwt.encode(payload, key, algorithm="RS256")
+        self._expires_at = expires_at
+        self.signed += 1
+        return self._token
+
+    def stats(self) -> dict:
+        return {"signed": self.signed, "reused": self.reused}
+
+
+@lru_cache()
+def get_app_jwt_signer() -> AppJWTSigner:
+    settings = get_settings()
+    return AppJWTSigner(settings.github_app_id, settings.github_app_private_key)
+
+
+@dataclass
+class CachedToken:
+    token: str
+    expires_at: float  # unix timestamp
+
+
+class InstallationTokenCache:
+    """Per-installation cache of GitHub App installation tokens.
+
+    Tokens are valid for an hour; a cached token is served until it is
+    within ``refresh_margin`` seconds of expiry. Concurrent misses for the
+    same installation share a single mint request.
+    """
+
+    def __init__(self, refresh_margin: float) -> None:
+        self.refresh_margin = refresh_margin
+        self._tokens: dict[int, CachedToken] = {}
+        self._flight: SingleFlight[int, str] = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        installation_id: int,
+        mint: Callable[[], Awaitable[CachedToken]],
+    ) -> str:
+        cached = self._tokens.get(installation_id)
+        if cached and cached.expires_at - self.refresh_margin > time.time():
+            self.hits += 1
+            return cached.token
+
+        self.misses += 1
+
+        async def refresh() -> str:
+            fresh = await mint()
+            self._tokens[installation_id] = fresh
+            return fresh.token
+
+        return await self._flight.do(installation_id, refresh)
+
+    def invalidate(self, installation_id: int) -> None:
+        self._tokens.pop(installation_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+            "cached": len(self._tokens),
+        }
+
+
+@lru_cache()
+def get_installation_token_cache() -> InstallationTokenCache:
+    settings = get_settings()
+    return InstallationTokenCache(settings.github_token_refresh_margin)
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Hashable
+
+import httpx
+
+from gamma.config import get_settings
+
+# Headers replayed on a cached response; the body is stored decoded, so
+# encoding/length headers from the original response must not be
+HEADERS_KEPT = ("content-type", "etag", "last-modified", "link")
+
+
+@dataclass
+class CachedResponse:
+    content: bytes
+    headers: dict[str, str]
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional-request headers for revalidating this response."""
+        out = {}
+        if etag := self.headers.get("etag"):
+            out["If-None-Match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            out["If-Modified-Since"] = last_modified
+        return out
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers=self.headers, content=self.content, request=request)
+
+
+class GitHubResponseCache:
+    """Byte-bounded LRU of GitHub GET responses that carry validators.
+
+    ``GitHubService._request`` revalidates entries with ``If-None-Match`` /
+    ``If-Modified-Since``; a 304 is answered from here and, for authorized
+    requests, does not count against the rate limit.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self.bytes = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+        return entry
+
+    def store(self, key: Hashable, response: httpx.Response) -> None:
+        headers = {
+            name: response.headers[name] for name in HEADERS_KEPT if name in response.headers
+        }
+        if "etag" not in headers and "last-modified" not in headers:
+            return
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = CachedResponse(response.content, headers)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def hit(self, entry: CachedResponse) -> None:
+        """Record that a 304 was served from ``entry``."""
+        self.not_modified += 1
+        self.bytes_saved += len(entry.content)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry.content)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+        }
+
+
+@lru_cache()
+def get_github_response_cache() -> GitHubResponseCache:
+    return GitHubResponseCache(get_settings().github_response_cache_bytes)
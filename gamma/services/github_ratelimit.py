@@ -0,0 +1,148 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
+
+from gamma.config import get_settings
+
+# GitHub's advice for secondary rate limits that come without a Retry-After
+SECONDARY_LIMIT_BACKOFF = 60.0
+
+
+class GitHubRateLimited(Exception):
+    """GitHub's quota for a scope is exhausted for longer than we are willing to wait."""
+
+    def __init__(self, scope: int | None, retry_after: float) -> None:
+        self.scope = scope
+        self.retry_after = retry_after
+        label = "app" if scope is None else f"installation {scope}"
+        super().__init__(f"GitHub rate limit for {label}; retry in {retry_after:.0f}s")
+
+
+@dataclass
+class _Budget:
+    limit: int | None = None
+    remaining: int | None = None
+    reset_epoch: int = 0  # X-RateLimit-Reset, identifies the quota window
+    reset_at: float = 0.0  # monotonic
+    blocked_until: float = 0.0  # monotonic, after a 403/429 rate-limit response
+    next_slot: float = 0.0  # monotonic, next paced request while the quota is low
+
+
+class GitHubRateLimiter:
+    """Per-scope (installation, or the app itself) view of GitHub's rate limits.
+
+    Budgets come from the ``X-RateLimit-*`` headers of every response. Each
+    request reserves one unit up front so a burst cannot overrun the quota.
+    Once fewer than ``reserve`` of the limit remain, requests are queued and
+    spaced evenly over what is left of the window; an exhausted quota, or a
+    403/429 rate-limit response, holds the scope until the reset or
+    ``Retry-After``. A wait longer than ``max_wait`` raises
+    ``GitHubRateLimited`` instead of stalling the caller.
+    """
+
+    def __init__(self, reserve: float, max_wait: float) -> None:
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._budgets: dict[int | None, _Budget] = {}
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self.rate_limited = 0
+        self.rejected = 0
+
+    async def acquire(self, scope: int | None) -> None:
+        """Wait for this scope's turn to send a request."""
+        budget = self._budgets.setdefault(scope, _Budget())
+        now = time.monotonic()
+        start, next_slot = now, budget.next_slot
+        reserving = False
+        if budget.blocked_until > now:
+            start = budget.blocked_until
+        elif budget.remaining is not None and budget.reset_at > now:
+            reserving = True
+            if budget.remaining <= 0:
+                start = budget.reset_at
+            elif budget.limit and budget.remaining < budget.limit * self.reserve:
+                start = max(now, budget.next_slot)
+                next_slot = start + (budget.reset_at - start) / budget.remaining
+
+        wait = start - now
+        if wait > self.max_wait:
+            self.rejected += 1
+            raise GitHubRateLimited(scope, wait)
+        if reserving:
+            budget.remaining -= 1
+            budget.next_slot = next_slot
+        if wait > 0:
+            self.throttled += 1
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+
+    def record(self, scope: int | None, response: httpx.Response) -> float | None:
+        """Update the scope's budget from ``response``.
+
+        Returns the seconds to back off if the response was a rate-limit
+        rejection, else None.
+        """
+        budget = self._budgets.setdefault(scope, _Budget())
+        headers = response.headers
+        remaining = _int_header(headers, "x-ratelimit-remaining")
+        reset = _int_header(headers, "x-ratelimit-reset")
+        if remaining is not None and reset is not None:
+            if reset == budget.reset_epoch and budget.remaining is not None:
+                # Same window: in-flight reservations already count against it
+                remaining = min(remaining, budget.remaining)
+            budget.limit = _int_header(headers, "x-ratelimit-limit") or budget.limit
+            budget.remaining = remaining
+            budget.reset_epoch = reset
+            budget.reset_at = time.monotonic() + max(0.0, reset - time.time())
+
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = _int_header(headers, "retry-after")
+        if retry_after is None:
+            if remaining == 0 and reset is not None:
+                retry_after = max(0.0, reset - time.time())
+            elif response.status_code == 429 or "rate limit" in response.text.lower():
+                retry_after = SECONDARY_LIMIT_BACKOFF
+            else:
+                return None  # an ordinary permission error
+        self.rate_limited += 1
+        budget.blocked_until = max(budget.blocked_until, time.monotonic() + retry_after)
+        return float(retry_after)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "scopes": {
+                "app" if scope is None else str(scope): {
+                    "limit": budget.limit,
+                    "remaining": budget.remaining,
+                    "reset_in": round(max(0.0, budget.reset_at - now), 1),
+                    "blocked_for": round(max(0.0, budget.blocked_until - now), 1),
+                }
+                for scope, budget in self._budgets.items()
+            },
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited_seconds, 3),
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+        }
+
+
+def _int_header(headers: httpx.Headers, name: str) -> int | None:
+    try:
+        return int(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+@lru_cache()
+def get_github_rate_limiter() -> GitHubRateLimiter:
+    settings = get_settings()
+    return GitHubRateLimiter(
+        reserve=settings.github_rate_limit_reserve,
+        max_wait=settings.github_rate_limit_max_wait,
+    )
@@ -0,0 +1,79 @@
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable
+
+from gamma.config import get_settings
+from gamma.services.background import spawn
+from gamma.services.singleflight import SingleFlight
+
+
+@dataclass
+class _Listing:
+    repos: list[dict]
+    fetched_at: float
+
+
+class RepoListCache:
+    """Per-GitHub-login cache of the repos the app can reach (stale-while-revalidate).
+
+    Within ``ttl`` a cached list is served as is. Up to ``max_stale`` it is
+    still served, but a background refresh is started so the next load is
+    fresh. Older lists, and logins never seen, are fetched inline.
+    Concurrent fetches for the same login share one discovery run.
+    """
+
+    def __init__(self, ttl: float, max_stale: float) -> None:
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._listings: dict[str, _Listing] = {}
+        self._flight: SingleFlight[str, list[dict]] = SingleFlight()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        login: str,
+        fetch: Callable[[], Awaitable[list[dict]]],
+        refresh: bool = False,
+    ) -> list[dict]:
+        key = login.lower()
+        listing = self._listings.get(key)
+        age = time.monotonic() - listing.fetched_at if listing else None
+
+        if listing and not refresh:
+            if age < self.ttl:
+                self.hits += 1
+                return listing.repos
+            if age < self.max_stale:
+                self.stale_hits += 1
+                if key not in self._flight:
+                    spawn(self._flight.do(key, lambda: self._fetch(key, fetch)))
+                return listing.repos
+
+        self.misses += 1
+        return await self._flight.do(key, lambda: self._fetch(key, fetch))
+
+    async def _fetch(self, key: str, fetch: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+        repos = await fetch()
+        self._listings[key] = _Listing(repos, time.monotonic())
+        return repos
+
+    def stats(self) -> dict:
+        return {
+            "logins": len(self._listings),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+        }
+
+
+@lru_cache()
+def get_repo_list_cache() -> RepoListCache:
+    settings = get_settings()
+    return RepoListCache(
+        ttl=settings.github_repos_ttl,
+        max_stale=settings.github_repos_max_stale,
+    )
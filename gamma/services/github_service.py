@@ -1,12 +1,37 @@
+import asyncio
 import hashlib
 import hmac
-import time
-from pathlib import Path
+from datetime import datetime
+from typing import Awaitable, Callable
 
 import httpx
-import jwt
 
 from gamma.config import get_settings
+from gamma.services.content_cache import (
+    content_key,
+    get_content_cache,
+    is_immutable_ref,
+)
+from gamma.services.github_auth import (
+    CachedToken,
+    get_app_jwt_signer,
+    get_installation_token_cache,
+)
+from gamma.services.github_cache import get_github_response_cache
+from gamma.services.github_ratelimit import GitHubRateLimited, get_github_rate_limiter
+from gamma.services.http_pool import get_http_pool
+from gamma.services.singleflight import SingleFlight
+
+# Concurrent cache misses for the same immutable content share one fetch
+_content_flight: SingleFlight[str, str] = SingleFlight()
+
+# Page size for installation and repository listings
+LISTING_PAGE_SIZE = 100
+
+# create_commit sends files up to this size inline in the tree request
+# instead of as separate blobs, up to a total per request.
+INLINE_BLOB_MAX_BYTES = 64 * 1024
+INLINE_TREE_MAX_BYTES = 1024 * 1024
 
 
 class GitHubService:
@@ -14,70 +39,211 @@ class GitHubService:
 
     BASE_URL = "https://api.github.com"
 
-    def __init__(self) -> None:
+    def __init__(self, http: httpx.AsyncClient | None = None) -> None:
         self.settings = get_settings()
+        self.http = http or get_http_pool().client("github")
 
     def _generate_jwt(self) -> str:
-        """Generate a JWT for GitHub App authentication."""
-        now = int(time.time())
-        payload = {
-            "iat": now - 60,
-            "exp": now + (10 * 60),
-            "iss": self.settings.github_app_id,
-        }
-        raw = self.settings.github_app_private_key
-        p = Path(raw).expanduser()
-        if p.is_file():
-            key = p.read_text()
-        else:
-            # Env vars may store literal \n; convert to real newlines for PEM parsing
-            key = raw.replace("\\n", "\n")
-        return jwt.encode(payload, key, algorithm="RS256")
+        """Get a JWT for GitHub App authentication (reused until near expiry)."""
+        return get_app_jwt_signer().token()
 
-    async def _get_installation_token(self, installation_id: int) -> str:
-        """Get an installation access token for a specific GitHub App installation."""
-        app_jwt = self._generate_jwt()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.BASE_URL}/app/installations/{installation_id}/access_tokens",
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        installation_id: int | None = None,
+        accept: str = "application/vnd.github+json",
+        headers: dict | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request on the shared client, authenticated as the app or an installation.
+
+        Without an ``installation_id`` the request is signed with the App JWT.
+        A 401 on an installation token drops it from the cache and retries once.
+        Requests are paced by the per-scope rate limiter, and a rate-limit
+        rejection is retried after its ``Retry-After`` (``GitHubRateLimited``
+        once retries run out or the wait is too long).
+        GETs are revalidated against the response cache, and a 304 is answered
+        from it as if GitHub had returned the full body.
+        """
+        cache = get_github_response_cache() if method == "GET" else None
+        # Keyed by auth scope so installations never see each other's responses
+        key = (installation_id, path, accept, tuple(sorted((kwargs.get("params") or {}).items())))
+        cached = cache.get(key) if cache else None
+        validators = cached.validators if cached else {}
+
+        limiter = get_github_rate_limiter()
+        token_retried = False
+        rate_limit_retries = 0
+        while True:
+            await limiter.acquire(installation_id)
+            if installation_id is None:
+                auth = f"Bearer {self._generate_jwt()}"
+            else:
+                auth = f"token {await self._get_installation_token(installation_id)}"
+            resp = await self.http.request(
+                method,
+                f"{self.BASE_URL}{path}",
                 headers={
-                    "Authorization": f"Bearer {app_jwt}",
-                    "Accept": "application/vnd.github+json",
+                    "Authorization": auth,
+                    "Accept": accept,
+                    **validators,
+                    **(headers or {}),
                 },
+                **kwargs,
             )
-            resp.raise_for_status()
-            return resp.json()["token"]
+            retry_after = limiter.record(installation_id, resp)
+            if resp.status_code == 401 and installation_id is not None and not token_retried:
+                get_installation_token_cache().invalidate(installation_id)
+                token_retried = True
+                continue
+            if retry_after is not None:
+                if rate_limit_retries < self.settings.github_rate_limit_retries:
+                    rate_limit_retries += 1
+                    continue  # acquire() waits out the back-off
+                raise GitHubRateLimited(installation_id, retry_after)
+            break
+
+        if resp.status_code == 304 and cached is not None:
+            cache.hit(cached)
+            return cached.to_response(resp.request)
+        resp.raise_for_status()
+        if cache is not None:
+            cache.store(key, resp)
+        return resp
+
+    async def _get_installation_token(self, installation_id: int) -> str:
+        """Get an installation access token, reusing a cached one until near expiry."""
+
+        async def mint() -> CachedToken:
+            resp = await self._request(
+                "POST", f"/app/installations/{installation_id}/access_tokens"
+            )
+            body = resp.json()
+            expires_at = datetime.fromisoformat(body["expires_at"]).timestamp()
+            return CachedToken(token=body["token"], expires_at=expires_at)
+
+        return await get_installation_token_cache().get(installation_id, mint)
 
     async def get_repo_installation_id(self, owner: str, repo: str) -> int:
         """Get the GitHub App installation ID for a specific repo."""
-        app_jwt = self._generate_jwt()
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/installation",
-                headers={
-                    "Authorization": f"Bearer {app_jwt}",
-                    "Accept": "application/vnd.github+json",
-                },
+        resp = await self._request("GET", f"/repos/{owner}/{repo}/installation")
+        return resp.json()["id"]
+
+    async def _get_listing(
+        self, path: str, *, installation_id: int | None = None, params: dict | None = None
+    ) -> dict | list:
+        resp = await self._request("GET", path, installation_id=installation_id, params=params)
+        return resp.json()
+
+    async def list_installations(self) -> list[dict]:
+        """All installations of this GitHub App."""
+        installations: list[dict] = []
+        page = 1
+        while True:
+            body = await self._get_listing(
+                "/app/installations", params={"per_page": LISTING_PAGE_SIZE, "page": page}
             )
-            resp.raise_for_status()
-            return resp.json()["id"]
+            installations.extend(body)
+            if len(body) < LISTING_PAGE_SIZE:
+                return installations
+            page += 1
+
+    async def list_installation_repos(
+        self, installation_id: int, semaphore: asyncio.Semaphore | None = None
+    ) -> list[dict]:
+        """Repositories an installation can access.
+
+        The first page reports ``total_count``, so the remaining pages are
+        fetched concurrently (bounded by ``semaphore``).
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.settings.github_discovery_concurrency)
+
+        async def page(number: int) -> dict:
+            async with semaphore:
+                return await self._get_listing(
+                    "/installation/repositories",
+                    installation_id=installation_id,
+                    params={"per_page": LISTING_PAGE_SIZE, "page": number},
+                )
+
+        first = await page(1)
+        pages = -(-first.get("total_count", 0) // LISTING_PAGE_SIZE)
+        rest = await asyncio.gather(*(page(n) for n in range(2, pages + 1)))
+        return [repo for body in (first, *rest) for repo in body.get("repositories", [])]
+
+    async def list_repos_for_login(self, github_login: str) -> list[dict]:
+        """Repos reachable through every installation on ``github_login``'s account."""
+        installations = [
+            inst
+            for inst in await self.list_installations()
+            if inst["account"]["login"].lower() == github_login.lower()
+        ]
+        semaphore = asyncio.Semaphore(self.settings.github_discovery_concurrency)
+        listings = await asyncio.gather(
+            *(self.list_installation_repos(inst["id"], semaphore) for inst in installations)
+        )
+        return [
+            {
+                "full_name": repo["full_name"],
+                "name": repo["name"],
+                "private": repo["private"],
+                "installation_id": inst["id"],
+            }
+            for inst, repos in zip(installations, listings)
+            for repo in repos
+        ]
+
+    async def _immutable(
+        self,
+        repo_full_name: str,
+        ref: str,
+        path: str | None,
+        fetch: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Serve content at a full commit SHA from the content cache.
+
+        Moving refs (branches, short SHAs) always go to GitHub. Concurrent
+        misses for the same content share one request.
+        """
+        if not is_immutable_ref(ref):
+            return await fetch()
+        cache = get_content_cache()
+        key = content_key(repo_full_name, ref, path)
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def fetch_and_store() -> str:
+            value = await fetch()
+            await cache.set(key, value)
+            return value
+
+        return await _content_flight.do(key, fetch_and_store)
 
     async def get_commit_diff(
         self, installation_id: int, repo_full_name: str, commit_sha: str
     ) -> str:
         """Fetch the diff for a specific commit."""
-        token = await self._get_installation_token(installation_id)
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/repos/{repo_full_name}/commits/{commit_sha}",
-                headers={
-                    "Authorization": f"token {token}",
-                    "Accept": "application/vnd.github.diff",
-                },
+
+        async def fetch() -> str:
+            resp = await self._request(
+                "GET",
+                f"/repos/{repo_full_name}/commits/{commit_sha}",
+                installation_id=installation_id,
+                accept="application/vnd.github.diff",
             )
-            resp.raise_for_status()
             return resp.text
 
+        return await self._immutable(repo_full_name, commit_sha, None, fetch)
+
+    async def warm_commit(
+        self, installation_id: int, repo_full_name: str, commit_sha: str
+    ) -> None:
+        """Prefetch a commit's diff into the content cache (e.g. on push)."""
+        await self.get_commit_diff(installation_id, repo_full_name, commit_sha)
+
     async def get_file_content(
         self,
         installation_id: int,
@@ -86,19 +252,19 @@ class GitHubService:
         ref: str = "main",
     ) -> str:
         """Fetch file content from a repo."""
-        token = await self._get_installation_token(installation_id)
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/repos/{repo_full_name}/contents/{path}",
+
+        async def fetch() -> str:
+            resp = await self._request(
+                "GET",
+                f"/repos/{repo_full_name}/contents/{path}",
+                installation_id=installation_id,
+                accept="application/vnd.github.raw+json",
                 params={"ref": ref},
-                headers={
-                    "Authorization": f"token {token}",
-                    "Accept": "application/vnd.github.raw+json",
-                },
             )
-            resp.raise_for_status()
             return resp.text
 
+        return await self._immutable(repo_full_name, ref, path, fetch)
+
     async def create_commit(
         self,
         installation_id: int,
@@ -107,78 +273,89 @@ class GitHubService:
         message: str,
         files: dict[str, str],
     ) -> dict:
-        """Create a commit with the given file changes via the Git Data API."""
-        token = await self._get_installation_token(installation_id)
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json",
-        }
-
-        async with httpx.AsyncClient() as client:
-            # Get the current branch ref
-            ref_resp = await client.get(
-                f"{self.BASE_URL}/repos/{repo_full_name}/git/ref/heads/{branch}",
-                headers=headers,
-            )
-            ref_resp.raise_for_status()
-            current_sha = ref_resp.json()["object"]["sha"]
+        """Create a commit with the given file changes via the Git Data API.
 
-            # Get the current commit's tree
-            commit_resp = await client.get(
-                f"{self.BASE_URL}/repos/{repo_full_name}/git/commits/{current_sha}",
-                headers=headers,
-            )
-            commit_resp.raise_for_status()
-            base_tree_sha = commit_resp.json()["tree"]["sha"]
-
-            # Create blobs for each file
-            tree_items = []
-            for path, content in files.items():
-                blob_resp = await client.post(
-                    f"{self.BASE_URL}/repos/{repo_full_name}/git/blobs",
-                    headers=headers,
-                    json={"content": content, "encoding": "utf-8"},
-                )
-                blob_resp.raise_for_status()
+        Small files are inlined in the tree request; larger ones are uploaded
+        as blobs concurrently, overlapping the branch lookup. If the branch
+        moves before the ref update (non-fast-forward), the tree and commit
+        are rebuilt on the new head and the update is retried.
+        """
+        repo_path = f"/repos/{repo_full_name}/git"
+        tree_items, blob_files = [], []
+        inline_budget = INLINE_TREE_MAX_BYTES
+        for path, content in files.items():
+            size = len(content.encode())
+            if size <= INLINE_BLOB_MAX_BYTES and size <= inline_budget:
+                inline_budget -= size
                 tree_items.append(
-                    {
-                        "path": path,
-                        "mode": "100644",
-                        "type": "blob",
-                        "sha": blob_resp.json()["sha"],
-                    }
+                    {"path": path, "mode": "100644", "type": "blob", "content": content}
+                )
+            else:
+                blob_files.append((path, content))
+
+        semaphore = asyncio.Semaphore(self.settings.github_blob_concurrency)
+
+        async def upload(path: str, content: str) -> dict:
+            async with semaphore:
+                resp = await self._request(
+                    "POST",
+                    f"{repo_path}/blobs",
+                    installation_id=installation_id,
+                    json={"content": content, "encoding": "utf-8"},
                 )
+            return {"path": path, "mode": "100644", "type": "blob", "sha": resp.json()["sha"]}
 
-            # Create a new tree
-            tree_resp = await client.post(
-                f"{self.BASE_URL}/repos/{repo_full_name}/git/trees",
-                headers=headers,
+        head, *blob_items = await asyncio.gather(
+            self._branch_head(installation_id, repo_full_name, branch),
+            *(upload(path, content) for path, content in blob_files),
+        )
+        tree_items.extend(blob_items)
+
+        for attempt in range(self.settings.github_commit_retries + 1):
+            parent_sha, base_tree_sha = head
+            tree_resp = await self._request(
+                "POST",
+                f"{repo_path}/trees",
+                installation_id=installation_id,
                 json={"base_tree": base_tree_sha, "tree": tree_items},
             )
-            tree_resp.raise_for_status()
-
-            # Create the commit
-            new_commit_resp = await client.post(
-                f"{self.BASE_URL}/repos/{repo_full_name}/git/commits",
-                headers=headers,
+            new_commit_resp = await self._request(
+                "POST",
+                f"{repo_path}/commits",
+                installation_id=installation_id,
                 json={
                     "message": message,
                     "tree": tree_resp.json()["sha"],
-                    "parents": [current_sha],
+                    "parents": [parent_sha],
                 },
             )
-            new_commit_resp.raise_for_status()
-
-            # Update the branch ref
-            update_resp = await client.patch(
-                f"{self.BASE_URL}/repos/{repo_full_name}/git/refs/heads/{branch}",
-                headers=headers,
-                json={"sha": new_commit_resp.json()["sha"]},
-            )
-            update_resp.raise_for_status()
-
+            try:
+                await self._request(
+                    "PATCH",
+                    f"{repo_path}/refs/heads/{branch}",
+                    installation_id=installation_id,
+                    json={"sha": new_commit_resp.json()["sha"]},
+                )
+            except httpx.HTTPStatusError as e:
+                # 422 = not a fast-forward: someone pushed in between
+                if e.response.status_code != 422 or attempt == self.settings.github_commit_retries:
+                    raise
+                head = await self._branch_head(installation_id, repo_full_name, branch)
+                continue
             return new_commit_resp.json()
 
+    async def _branch_head(
+        self, installation_id: int, repo_full_name: str, branch: str
+    ) -> tuple[str, str]:
+        """``(commit_sha, tree_sha)`` of a branch head in a single request."""
+        resp = await self._request(
+            "GET",
+            f"/repos/{repo_full_name}/branches/{branch}",
+            installation_id=installation_id,
+        )
+        commit = resp.json()["commit"]
+        return commit["sha"], commit["commit"]["tree"]["sha"]
+
     def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
         """Verify the GitHub webhook signature."""
         expected = hmac.new(
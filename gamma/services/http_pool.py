@@ -0,0 +1,106 @@
+import importlib.util
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
+
+from gamma.config import get_settings
+
+
+@dataclass
+class ConnectionStats:
+    """Per-upstream counters for how often requests reuse a live connection."""
+
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": (
+                self.reused_connections / self.requests if self.requests else 0.0
+            ),
+        }
+
+
+class HTTPClientPool:
+    """Process-wide keep-alive ``httpx.AsyncClient`` per upstream (github, mlflow).
+
+    Created in the FastAPI lifespan hook and closed on shutdown, so every
+    service call shares warm TCP/TLS connections instead of handshaking anew.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, ConnectionStats] = {}
+        self._seen_streams: dict[str, weakref.WeakSet] = {}
+
+    @property
+    def http2(self) -> bool:
+        # HTTP/2 needs the optional h2 package; plain-http upstreams fall back
+        # to HTTP/1.1 automatically.
+        return self.settings.http2_enabled and importlib.util.find_spec("h2") is not None
+
+    def client(self, upstream: str) -> httpx.AsyncClient:
+        """Get (or lazily create) the shared client for an upstream."""
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._build(upstream)
+            self._clients[upstream] = client
+        return client
+
+    def _build(self, upstream: str) -> httpx.AsyncClient:
+        self._stats.setdefault(upstream, ConnectionStats())
+        self._seen_streams.setdefault(upstream, weakref.WeakSet())
+
+        async def on_response(response: httpx.Response) -> None:
+            self._record(upstream, response)
+
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.settings.http_max_connections,
+                max_keepalive_connections=self.settings.http_max_keepalive_connections,
+                keepalive_expiry=self.settings.http_keepalive_expiry,
+            ),
+            event_hooks={"response": [on_response]},
+        )
+
+    def _record(self, upstream: str, response: httpx.Response) -> None:
+        stats = self._stats[upstream]
+        stats.requests += 1
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        seen = self._seen_streams[upstream]
+        if stream in seen:
+            stats.reused_connections += 1
+        else:
+            stats.new_connections += 1
+            seen.add(stream)
+
+    def stats(self) -> dict[str, dict]:
+        """Connection-reuse counters keyed by upstream name."""
+        return {name: s.as_dict() for name, s in self._stats.items()}
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+@lru_cache()
+def get_http_pool() -> HTTPClientPool:
+    return HTTPClientPool()
+
+
+async def close_http_pool() -> None:
+    """Close all pooled clients (called on app shutdown)."""
+    if get_http_pool.cache_info().currsize:
+        await get_http_pool().aclose()
+        get_http_pool.cache_clear()
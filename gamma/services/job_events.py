@@ -0,0 +1,134 @@
+"""In-process fan-out of training job changes to SSE subscribers.
+
+Webhook handlers, the jobs API and the SageMaker reconciler publish here;
+``GET /api/jobs/stream`` subscribes per project. Every project keeps a
+ring buffer of recent events so a reconnecting client can resume from its
+``Last-Event-ID``. Events only reach subscribers of the same worker process;
+a client that cannot be caught up from the buffer (a gap, a restart, or a
+subscriber too slow for its queue) gets a ``resync`` event and reloads the
+job list instead.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+from gamma.config import get_settings
+from gamma.models import TrainingJob
+
+
+@dataclass(frozen=True)
+class JobEvent:
+    id: int
+    type: str  # "created" or "updated"
+    job: dict
+
+    def encode(self) -> str:
+        data = json.dumps({"type": self.type, "job": self.job}, default=str)
+        return f"id: {self.id}\nevent: job\ndata: {data}\n\n"
+
+
+RESYNC = "event: resync\ndata: {}\n\n"
+
+
+class JobSubscription:
+    """One subscriber's bounded queue of encoded SSE messages."""
+
+    def __init__(self, broker: "JobEventBroker", project_id: str, max_size: int) -> None:
+        self.broker = broker
+        self.project_id = project_id
+        self._queue: asyncio.Queue[str] = asyncio.Queue(max_size)
+
+    def push(self, message: str) -> bool:
+        """Queue ``message``; on overflow drop the backlog for a resync. Returns False then."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC)
+            return False
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+    def close(self) -> None:
+        self.broker._unsubscribe(self)
+
+    def __enter__(self) -> "JobSubscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JobEventBroker:
+    """Per-project publish/subscribe for job events, with a resumable history."""
+
+    def __init__(self, buffer_size: int, queue_size: int) -> None:
+        self.buffer_size = buffer_size
+        self.queue_size = queue_size
+        # Start above any id a previous process handed out, so a client
+        # resuming across a restart is detected as a gap rather than replayed
+        self._base_id = self._last_id = time.time_ns() // 1000
+        self._history: dict[str, deque[JobEvent]] = {}
+        # Per project, the newest event id that fell out of the ring buffer
+        self._evicted: dict[str, int] = {}
+        self._subscribers: dict[str, set[JobSubscription]] = {}
+        self.published = 0
+        self.overflows = 0
+
+    def publish(self, project_id: str, event_type: str, job: dict) -> JobEvent:
+        self._last_id += 1
+        fields = {key: value for key, value in job.items() if key in TrainingJob.model_fields}
+        event = JobEvent(self._last_id, event_type, fields)
+        history = self._history.setdefault(project_id, deque(maxlen=self.buffer_size))
+        if len(history) == history.maxlen:
+            self._evicted[project_id] = history[0].id
+        history.append(event)
+        self.published += 1
+        message = event.encode()
+        for subscription in self._subscribers.get(project_id, ()):
+            if not subscription.push(message):
+                self.overflows += 1
+        return event
+
+    def subscribe(self, project_id: str, last_event_id: int | None = None) -> JobSubscription:
+        """Subscribe to a project, first replaying what came after ``last_event_id``."""
+        subscription = JobSubscription(self, project_id, self.queue_size)
+        if last_event_id is not None:
+            if last_event_id < self._evicted.get(project_id, self._base_id):
+                subscription.push(RESYNC)
+            else:
+                for event in self._history.get(project_id, ()):
+                    if event.id > last_event_id:
+                        subscription.push(event.encode())
+        self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: JobSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.project_id]
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            "projects": len(self._history),
+            "published": self.published,
+            "overflows": self.overflows,
+        }
+
+
+@lru_cache()
+def get_job_event_broker() -> JobEventBroker:
+    settings = get_settings()
+    return JobEventBroker(
+        buffer_size=settings.job_events_buffer,
+        queue_size=settings.job_events_queue_size,
+    )
@@ -0,0 +1,133 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Hashable
+
+from gamma.config import get_settings
+
+# Runs in these states never change again, so their reads can be kept
+# until evicted.
+TERMINAL_RUN_STATUSES = frozenset({"FINISHED", "FAILED", "KILLED"})
+
+# How many run ids to remember as terminal
+MAX_TERMINAL_RUNS = 10_000
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float | None  # None = immutable, kept until evicted
+    run_id: str | None
+
+
+class MLflowCache:
+    """Byte-bounded LRU cache for MLflow tracking-server reads.
+
+    Entries carry their own TTL: reads of terminal runs never expire, reads
+    of active runs expire after a short TTL. When the total size exceeds
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, max_bytes: int, active_ttl: float, experiment_ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.active_ttl = active_ttl
+        self.experiment_ttl = experiment_ttl
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._run_keys: dict[str, set[Hashable]] = {}
+        self._terminal_runs: OrderedDict[str, None] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        size: int,
+        ttl: float | None,
+        run_id: str | None = None,
+    ) -> None:
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = _Entry(value, size, expires_at, run_id)
+        self.bytes += size
+        if run_id:
+            self._run_keys.setdefault(run_id, set()).add(key)
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def run_ttl(self, run_id: str) -> float | None:
+        """TTL for data belonging to a run: forever once the run is terminal."""
+        return None if run_id in self._terminal_runs else self.active_ttl
+
+    def mark_run_status(self, run_id: str, status: str) -> None:
+        if status in TERMINAL_RUN_STATUSES:
+            self._terminal_runs[run_id] = None
+            self._terminal_runs.move_to_end(run_id)
+            if len(self._terminal_runs) > MAX_TERMINAL_RUNS:
+                self._terminal_runs.popitem(last=False)
+        else:
+            self._terminal_runs.pop(run_id, None)
+
+    def invalidate_run(self, run_id: str) -> None:
+        """Drop everything cached for a run (e.g. when its job changes state)."""
+        self._terminal_runs.pop(run_id, None)
+        for key in list(self._run_keys.get(run_id, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._run_keys.clear()
+        self._terminal_runs.clear()
+        self.bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        if entry.run_id:
+            keys = self._run_keys.get(entry.run_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._run_keys[entry.run_id]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+@lru_cache()
+def get_mlflow_cache() -> MLflowCache:
+    settings = get_settings()
+    return MLflowCache(
+        max_bytes=settings.mlflow_cache_max_bytes,
+        active_ttl=settings.mlflow_cache_active_ttl,
+        experiment_ttl=settings.mlflow_cache_experiment_ttl,
+    )
@@ -1,22 +1,68 @@
+from typing import Callable, Hashable
+
 import httpx
 
 from gamma.config import get_settings
+from gamma.services.http_pool import get_http_pool
+from gamma.services.mlflow_cache import get_mlflow_cache
+from gamma.services.singleflight import SingleFlight
+
+# Concurrent identical reads share one request to the tracking server
+_inflight: SingleFlight[Hashable, dict] = SingleFlight()
 
 
 class MLflowService:
     """Client for the MLflow Tracking Server REST API."""
 
-    def __init__(self) -> None:
+    def __init__(self, http: httpx.AsyncClient | None = None) -> None:
         self.settings = get_settings()
         self.base_url = self.settings.mlflow_tracking_uri
+        self.http = http or get_http_pool().client("mlflow")
 
     async def _get(self, path: str, params: dict | None = None) -> dict:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/api/2.0/mlflow{path}", params=params
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._get_response(path, params)
+        return resp.json()
+
+    async def _get_response(
+        self, path: str, params: dict | None = None
+    ) -> httpx.Response:
+        resp = await self.http.get(
+            f"{self.base_url}/api/2.0/mlflow{path}", params=params
+        )
+        resp.raise_for_status()
+        return resp
+
+    async def _cached_get(
+        self,
+        path: str,
+        params: dict,
+        ttl: Callable[[dict], float | None],
+        run_id: str | None = None,
+    ) -> dict:
+        """GET through the process-wide MLflow cache.
+
+        ``ttl`` maps the response body to its cache lifetime (``None`` =
+        immutable). Entries tagged with ``run_id`` are dropped together by
+        ``MLflowCache.invalidate_run``.
+        """
+        cache = get_mlflow_cache()
+        key = (path, tuple(sorted(params.items())))
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+        async def fetch() -> dict:
+            resp = await self._get_response(path, params)
+            body = resp.json()
+            cache.set(key, body, len(resp.content), ttl(body), run_id=run_id)
+            return body
+
+        return await _inflight.do(key, fetch)
+
+    async def _post(self, path: str, body: dict) -> dict:
+        resp = await self.http.post(f"{self.base_url}/api/2.0/mlflow{path}", json=body)
+        resp.raise_for_status()
+        return resp.json()
 
     async def search_experiments(self, filter_string: str = "") -> list[dict]:
         """Search MLflow experiments."""
@@ -28,7 +74,11 @@ class MLflowService:
 
     async def get_experiment_by_name(self, name: str) -> dict | None:
         """Get an experiment by name."""
-        data = await self._get("/experiments/get-by-name", {"experiment_name": name})
+        data = await self._cached_get(
+            "/experiments/get-by-name",
+            {"experiment_name": name},
+            ttl=lambda body: get_mlflow_cache().experiment_ttl,
+        )
         return data.get("experiment")
 
     async def search_runs(
@@ -39,33 +89,40 @@ class MLflowService:
         order_by: list[str] | None = None,
     ) -> list[dict]:
         """Search runs within experiments."""
-        async with httpx.AsyncClient() as client:
-            body: dict = {
-                "experiment_ids": experiment_ids,
-                "max_results": max_results,
-            }
-            if filter_string:
-                body["filter"] = filter_string
-            if order_by:
-                body["order_by"] = order_by
-            resp = await client.post(
-                f"{self.base_url}/api/2.0/mlflow/runs/search", json=body
-            )
-            resp.raise_for_status()
-            return resp.json().get("runs", [])
+        body: dict = {
+            "experiment_ids": experiment_ids,
+            "max_results": max_results,
+        }
+        if filter_string:
+            body["filter"] = filter_string
+        if order_by:
+            body["order_by"] = order_by
+        data = await self._post("/runs/search", body)
+        return data.get("runs", [])
 
     async def get_run(self, run_id: str) -> dict:
         """Get a specific run by ID."""
-        data = await self._get("/runs/get", {"run_id": run_id})
+        cache = get_mlflow_cache()
+
+        def ttl(body: dict) -> float | None:
+            # The run's own status decides how long anything about it is cached
+            cache.mark_run_status(run_id, body["run"]["info"].get("status", ""))
+            return cache.run_ttl(run_id)
+
+        data = await self._cached_get(
+            "/runs/get", {"run_id": run_id}, ttl=ttl, run_id=run_id
+        )
         return data["run"]
 
     async def get_metric_history(
         self, run_id: str, metric_key: str
     ) -> list[dict]:
         """Get the full history of a metric for a run."""
-        data = await self._get(
+        data = await self._cached_get(
             "/metrics/get-history",
             {"run_id": run_id, "metric_key": metric_key},
+            ttl=lambda body: get_mlflow_cache().run_ttl(run_id),
+            run_id=run_id,
         )
         return data.get("metrics", [])
 
@@ -76,5 +133,10 @@ class MLflowService:
         params: dict = {"run_id": run_id}
         if path:
             params["path"] = path
-        data = await self._get("/artifacts/list", params)
+        data = await self._cached_get(
+            "/artifacts/list",
+            params,
+            ttl=lambda body: get_mlflow_cache().run_ttl(run_id),
+            run_id=run_id,
+        )
         return data.get("files", [])
@@ -1,7 +1,18 @@
-import boto3
-from botocore.config import Config
+from typing import Iterator
 
 from gamma.config import get_settings
+from gamma.services.aws import get_boto_client
+
+MAX_KEYS_PER_PAGE = 1000  # S3's own ceiling for list_objects_v2
+
+
+def _object_dict(obj: dict) -> dict:
+    return {
+        "key": obj["Key"],
+        "size": obj["Size"],
+        "last_modified": obj["LastModified"].isoformat(),
+        "etag": obj["ETag"],
+    }
 
 
 class S3Service:
@@ -9,32 +20,61 @@ class S3Service:
 
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.client = boto3.client(
-            "s3",
-            region_name=self.settings.aws_region,
-            config=Config(signature_version="s3v4"),
-        )
+        self.client = get_boto_client("s3")
+
+    def list_objects_page(
+        self,
+        bucket: str,
+        prefix: str = "",
+        max_keys: int = MAX_KEYS_PER_PAGE,
+        cursor: str | None = None,
+        delimiter: str | None = None,
+    ) -> dict:
+        """List one page of objects under a prefix.
 
-    def list_objects(
-        self, bucket: str, prefix: str = "", max_keys: int = 1000
-    ) -> list[dict]:
-        """List objects in an S3 bucket under a prefix."""
+        ``cursor`` is the S3 continuation token returned as ``next_cursor``
+        by the previous page. With a ``delimiter`` (usually ``/``) keys below
+        the next delimiter are rolled up into ``prefixes`` so callers can
+        browse folder by folder.
+        """
         params: dict = {"Bucket": bucket, "MaxKeys": max_keys}
         if prefix:
             params["Prefix"] = prefix
+        if cursor:
+            params["ContinuationToken"] = cursor
+        if delimiter:
+            params["Delimiter"] = delimiter
 
         response = self.client.list_objects_v2(**params)
-        objects = []
-        for obj in response.get("Contents", []):
-            objects.append(
-                {
-                    "key": obj["Key"],
-                    "size": obj["Size"],
-                    "last_modified": obj["LastModified"].isoformat(),
-                    "etag": obj["ETag"],
-                }
-            )
-        return objects
+        return {
+            "objects": [_object_dict(obj) for obj in response.get("Contents", [])],
+            "prefixes": [p["Prefix"] for p in response.get("CommonPrefixes", [])],
+            "next_cursor": (
+                response.get("NextContinuationToken")
+                if response.get("IsTruncated")
+                else None
+            ),
+        }
+
+    def iter_object_pages(
+        self, bucket: str, prefix: str = ""
+    ) -> Iterator[list[dict]]:
+        """Walk every object under a prefix, one S3 page at a time."""
+        cursor = None
+        while True:
+            page = self.list_objects_page(bucket, prefix, cursor=cursor)
+            yield page["objects"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
+    def list_objects(self, bucket: str, prefix: str = "") -> list[dict]:
+        """List all objects in an S3 bucket under a prefix (follows pagination)."""
+        return [
+            obj
+            for page in self.iter_object_pages(bucket, prefix)
+            for obj in page
+        ]
 
     def generate_presigned_url(
         self, bucket: str, key: str, expiration: int = 3600
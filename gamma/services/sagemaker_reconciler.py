@@ -0,0 +1,210 @@
+"""Background sync of SageMaker training job status into ``training_jobs``.
+
+Each pass loads the jobs SageMaker may still change (never synced, or
+``InProgress``/``Stopping``), makes one paginated ``ListTrainingJobs`` call
+for everything modified since the previous pass, and only describes the
+tracked jobs that call reported, plus any not synced within ``max_age``.
+Status and timings are written back so the status endpoint never has to
+call SageMaker itself. A failed describe is recorded too (``synced_at`` plus
+``sagemaker_sync_error``), so a bad job name is retried once per ``max_age``
+rather than taking a describe slot on every pass.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from gamma.config import get_settings
+from gamma.db import execute, get_supabase_admin_client
+from gamma.services.aws import run_aws
+from gamma.services.job_events import get_job_event_broker
+from gamma.services.sagemaker_service import SageMakerService
+from gamma.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# SageMaker statuses that can still change
+ACTIVE_SAGEMAKER_STATUSES = ("InProgress", "Stopping")
+
+JOB_STATUS_FOR_SAGEMAKER = {
+    "InProgress": "running",
+    "Stopping": "running",
+    "Completed": "completed",
+    "Failed": "failed",
+    "Stopped": "failed",
+}
+
+# Job statuses the reconciler never overwrites (a finished job stays finished)
+TERMINAL_JOB_STATUSES = {"completed", "failed"}
+
+# Listing window overlap, for clock skew between us and SageMaker
+LIST_SKEW = timedelta(seconds=60)
+
+ACTIVE_JOB_COLUMNS = (
+    "id, project_id, status, sagemaker_job_name, sagemaker_status,"
+    " sagemaker_secondary_status, sagemaker_synced_at"
+)
+
+# Changes to these are published to job event subscribers
+PUBLISHED_FIELDS = ("status", "sagemaker_status", "sagemaker_secondary_status")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SageMakerReconciler:
+    """Periodically writes SageMaker status for active jobs into the database.
+
+    Started from the FastAPI lifespan hook; :meth:`sync` is also used by the
+    status endpoint for a job that has not been reconciled yet.
+    """
+
+    def __init__(self, sagemaker: SageMakerService | None = None) -> None:
+        settings = get_settings()
+        self.interval = settings.sagemaker_reconcile_interval
+        self.batch = settings.sagemaker_reconcile_batch
+        self.max_describes = settings.sagemaker_reconcile_max_describes
+        self.max_age = timedelta(seconds=settings.sagemaker_reconcile_max_age)
+        self.lookback = timedelta(seconds=settings.sagemaker_reconcile_lookback)
+        self._sagemaker = sagemaker
+        self._listed_since: datetime | None = None
+        self._syncs: SingleFlight[str, dict] = SingleFlight()
+        self._task: asyncio.Task | None = None
+        self.passes = 0
+        self.listed = 0
+        self.described = 0
+        self.errors = 0
+
+    @property
+    def sagemaker(self) -> SageMakerService:
+        if self._sagemaker is None:
+            self._sagemaker = SageMakerService()
+        return self._sagemaker
+
+    async def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="sagemaker-reconciler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except Exception:
+                self.errors += 1
+                logger.exception("SageMaker reconciliation pass failed")
+            await asyncio.sleep(self.interval)
+
+    async def reconcile(self) -> list[dict]:
+        """Run one pass and return the job rows it updated."""
+        client = get_supabase_admin_client()
+        active = await execute(
+            client.table("training_jobs")
+            .select(ACTIVE_JOB_COLUMNS)
+            .not_.is_("sagemaker_job_name", "null")
+            .or_(
+                "sagemaker_status.is.null,"
+                f"sagemaker_status.in.({','.join(ACTIVE_SAGEMAKER_STATUSES)})"
+            )
+            .order("sagemaker_synced_at", nullsfirst=True)
+            .limit(self.batch)
+        )
+        if not active.data:
+            return []
+
+        started = _now()
+        since = self._listed_since or started - self.lookback
+        listed = await run_aws(self.sagemaker.list_training_jobs_modified_since, since - LIST_SKEW)
+        self._listed_since = started
+        self.passes += 1
+        self.listed += len(listed)
+
+        stale_before = started - self.max_age
+        changed, stale = [], []
+        for job in active.data:
+            synced_at = job.get("sagemaker_synced_at")
+            if job["sagemaker_job_name"] in listed or not synced_at:
+                changed.append(job)
+            elif datetime.fromisoformat(synced_at) < stale_before:
+                stale.append(job)
+        due = (changed + stale)[: self.max_describes]
+
+        results = await asyncio.gather(*(self.sync(job) for job in due), return_exceptions=True)
+        updated = []
+        for job, result in zip(due, results):
+            if isinstance(result, Exception):
+                self.errors += 1
+                logger.warning(
+                    "Could not sync SageMaker job %s: %s", job["sagemaker_job_name"], result
+                )
+            else:
+                updated.append(result)
+        return updated
+
+    async def sync(self, job: dict) -> dict:
+        """Describe one job and write its SageMaker state back; returns the updated row.
+
+        ``job`` needs the ``ACTIVE_JOB_COLUMNS``. Concurrent syncs of the same
+        job share one describe call.
+        """
+        return await self._syncs.do(job["id"], lambda: self._sync(job))
+
+    async def _sync(self, job: dict) -> dict:
+        client = get_supabase_admin_client()
+        try:
+            details = await run_aws(self.sagemaker.get_training_job, job["sagemaker_job_name"])
+        except Exception as e:
+            # Back the job off until it is stale again instead of retrying every pass
+            await execute(
+                client.table("training_jobs")
+                .update(
+                    {
+                        "sagemaker_synced_at": _now().isoformat(),
+                        "sagemaker_sync_error": f"{type(e).__name__}: {e}",
+                    }
+                )
+                .eq("id", job["id"])
+            )
+            raise
+        self.described += 1
+        updates = {
+            "sagemaker_status": details["status"],
+            "sagemaker_secondary_status": details["secondary_status"] or None,
+            "sagemaker_failure_reason": details["failure_reason"] or None,
+            "sagemaker_details": details,
+            "sagemaker_synced_at": _now().isoformat(),
+            "sagemaker_sync_error": None,
+        }
+        if details["training_start_time"]:
+            updates["started_at"] = details["training_start_time"]
+        if details["training_end_time"]:
+            updates["completed_at"] = details["training_end_time"]
+        status = JOB_STATUS_FOR_SAGEMAKER.get(details["status"])
+        if status and job.get("status") not in TERMINAL_JOB_STATUSES:
+            updates["status"] = status
+
+        result = await execute(client.table("training_jobs").update(updates).eq("id", job["id"]))
+        synced = result.data[0] if result.data else {**job, **updates}
+        if any(synced.get(key) != job.get(key) for key in PUBLISHED_FIELDS):
+            get_job_event_broker().publish(job["project_id"], "updated", synced)
+        return synced
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "passes": self.passes,
+            "listed": self.listed,
+            "described": self.described,
+            "errors": self.errors,
+        }
+
+
+@lru_cache()
+def get_sagemaker_reconciler() -> SageMakerReconciler:
+    return SageMakerReconciler()
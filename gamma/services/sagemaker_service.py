@@ -1,6 +1,7 @@
-import boto3
+from datetime import datetime
 
 from gamma.config import get_settings
+from gamma.services.aws import get_boto_client
 
 
 class SageMakerService:
@@ -8,9 +9,7 @@ class SageMakerService:
 
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.client = boto3.client(
-            "sagemaker", region_name=self.settings.aws_region
-        )
+        self.client = get_boto_client("sagemaker")
 
     def get_training_job(self, job_name: str) -> dict:
         """Get details of a SageMaker training job."""
@@ -60,3 +59,18 @@ class SageMakerService:
             }
             for job in response.get("TrainingJobSummaries", [])
         ]
+
+    def list_training_jobs_modified_since(
+        self, since: datetime, max_pages: int = 10
+    ) -> dict[str, str]:
+        """Status of every training job modified after ``since``, keyed by job name."""
+        params: dict = {"LastModifiedTimeAfter": since, "MaxResults": 100}
+        jobs: dict[str, str] = {}
+        for _ in range(max_pages):
+            response = self.client.list_training_jobs(**params)
+            for job in response.get("TrainingJobSummaries", []):
+                jobs[job["TrainingJobName"]] = job["TrainingJobStatus"]
+            if not response.get("NextToken"):
+                break
+            params["NextToken"] = response["NextToken"]
+        return jobs
@@ -0,0 +1,78 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from statistics import quantiles
+from typing import Awaitable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Samples kept per phase for the percentiles in /api/metrics
+WINDOW = 1000
+
+
+class PhaseStats:
+    """Rolling latency percentiles per named request phase."""
+
+    def __init__(self, window: int = WINDOW) -> None:
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        self._samples.setdefault(phase, deque(maxlen=self.window)).append(seconds)
+        self._counts[phase] = self._counts.get(phase, 0) + 1
+
+    def stats(self) -> dict[str, dict]:
+        out = {}
+        for phase, samples in self._samples.items():
+            ordered = sorted(samples)
+            cuts = quantiles(ordered, n=100) if len(ordered) > 1 else ordered * 99
+            out[phase] = {
+                "count": self._counts[phase],
+                "p50_ms": round(cuts[49] * 1000, 1),
+                "p95_ms": round(cuts[94] * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return out
+
+
+class PhaseTimer:
+    """Times the phases of one request and feeds them into ``PhaseStats``."""
+
+    def __init__(self, stats: PhaseStats) -> None:
+        self.stats = stats
+        self.started = time.perf_counter()
+        self.durations: dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.durations[phase] = seconds
+        self.stats.record(phase, seconds)
+
+    def since_start(self, phase: str) -> None:
+        """Record the time from the start of the request until now."""
+        self.record(phase, time.perf_counter() - self.started)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    async def measure(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable`` as phase ``name``; usable inside ``asyncio.gather``."""
+        with self.phase(name):
+            return await awaitable
+
+    def server_timing(self) -> str:
+        """Phases recorded so far, as a ``Server-Timing`` header value."""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.durations.items()
+        )
+
+
+@lru_cache()
+def get_agent_timings() -> PhaseStats:
+    return PhaseStats()
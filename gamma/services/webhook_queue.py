@@ -0,0 +1,243 @@
+"""Durable queue for GitHub webhook deliveries.
+
+The webhook endpoint only verifies the signature and inserts the raw
+delivery into ``webhook_deliveries``; a pool of in-process workers then
+drains the table. A delivery is claimed with a conditional update (the row
+must still be in the state the worker saw), leased for a while so a crashed
+worker's deliveries are picked up again, retried with exponential backoff
+and finally parked as ``dead`` once it runs out of attempts.
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Awaitable, Callable
+
+from gamma.config import get_settings
+from gamma.db import execute, get_supabase_admin_client
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, dict], Awaitable[dict]]
+
+# Deliveries looked at per claim attempt; losing a race just moves on to the next
+CLAIM_BATCH = 10
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RecentDeliveries:
+    """Bounded set of recently seen X-GitHub-Delivery ids.
+
+    Lets the endpoint drop redeliveries without a database round trip; the
+    unique constraint on ``webhook_deliveries.delivery_id`` catches the rest
+    (other workers, restarts, ids evicted from here).
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._ids: OrderedDict[str, None] = OrderedDict()
+
+    def __contains__(self, delivery_id: str) -> bool:
+        if delivery_id in self._ids:
+            self._ids.move_to_end(delivery_id)
+            return True
+        return False
+
+    def add(self, delivery_id: str) -> None:
+        self._ids[delivery_id] = None
+        self._ids.move_to_end(delivery_id)
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+@lru_cache()
+def get_recent_deliveries() -> RecentDeliveries:
+    return RecentDeliveries(get_settings().webhook_recent_deliveries)
+
+
+async def enqueue_delivery(
+    event: str, payload: dict, delivery_id: str | None
+) -> str | None:
+    """Persist a verified webhook delivery and return its queue row id.
+
+    Returns ``None`` if a delivery with the same id was already queued.
+    """
+    result = await execute(
+        get_supabase_admin_client()
+        .table("webhook_deliveries")
+        .upsert(
+            {"delivery_id": delivery_id, "event": event, "payload": payload},
+            on_conflict="delivery_id",
+            ignore_duplicates=True,
+        )
+    )
+    return result.data[0]["id"] if result.data else None
+
+
+class WebhookQueue:
+    """Worker pool that processes queued webhook deliveries with ``handler``.
+
+    Started from the FastAPI lifespan hook. Workers poll the table every
+    ``poll_interval`` seconds and are woken early by :meth:`notify` when the
+    endpoint enqueues something.
+    """
+
+    def __init__(self, handler: Handler) -> None:
+        settings = get_settings()
+        self.handler = handler
+        self.workers = settings.webhook_workers
+        self.max_attempts = settings.webhook_max_attempts
+        self.backoff_base = settings.webhook_backoff_base
+        self.backoff_max = settings.webhook_backoff_max
+        self.poll_interval = settings.webhook_poll_interval
+        self.lease = settings.webhook_lease_seconds
+        self._tasks: list[asyncio.Task] = []
+        self._wake: asyncio.Event | None = None
+        self.processed = 0
+        self.retried = 0
+        self.dead = 0
+
+    async def start(self) -> None:
+        self._wake = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers. In-flight deliveries are retried once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers because a new delivery was enqueued."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait before retrying after ``attempts`` failed attempts."""
+        return min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                delivery = await self._claim()
+            except Exception:
+                logger.exception("Failed to claim webhook delivery")
+                delivery = None
+            if delivery is not None:
+                await self._process(delivery)
+                continue
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> dict | None:
+        """Lease one ready delivery: pending and due, or processing with an expired lease."""
+        client = get_supabase_admin_client()
+        now = _now()
+        candidates = await execute(
+            client.table("webhook_deliveries")
+            .select("id, status, attempts")
+            .or_(
+                f'and(status.eq.pending,next_attempt_at.lte."{now.isoformat()}"),'
+                f'and(status.eq.processing,locked_until.lt."{now.isoformat()}")'
+            )
+            .order("next_attempt_at")
+            .limit(CLAIM_BATCH)
+        )
+        for candidate in candidates.data:
+            if candidate["attempts"] >= self.max_attempts:
+                # The last attempt's worker died mid-delivery; don't lease it again
+                await self._bury(candidate, "lease expired on the final attempt")
+                continue
+            # Only succeeds if no other worker changed the row since we read it
+            claimed = await execute(
+                client.table("webhook_deliveries")
+                .update(
+                    {
+                        "status": "processing",
+                        "attempts": candidate["attempts"] + 1,
+                        "locked_until": (now + timedelta(seconds=self.lease)).isoformat(),
+                    }
+                )
+                .eq("id", candidate["id"])
+                .eq("status", candidate["status"])
+                .eq("attempts", candidate["attempts"])
+            )
+            if claimed.data:
+                return claimed.data[0]
+        return None
+
+    async def _bury(self, candidate: dict, error: str) -> None:
+        """Mark an exhausted delivery dead, unless another worker got to it first."""
+        client = get_supabase_admin_client()
+        buried = await execute(
+            client.table("webhook_deliveries")
+            .update({"status": "dead", "locked_until": None, "last_error": error})
+            .eq("id", candidate["id"])
+            .eq("status", candidate["status"])
+            .eq("attempts", candidate["attempts"])
+        )
+        if buried.data:
+            logger.error("Webhook delivery %s is dead: %s", candidate["id"], error)
+            self.dead += 1
+
+    async def _process(self, delivery: dict) -> None:
+        client = get_supabase_admin_client()
+        deliveries = client.table("webhook_deliveries")
+        try:
+            result = await self.handler(delivery["event"], delivery["payload"])
+        except Exception as e:
+            attempts = delivery["attempts"]
+            error = f"{type(e).__name__}: {e}"
+            if attempts >= self.max_attempts:
+                logger.error("Webhook delivery %s is dead: %s", delivery["id"], error)
+                updates = {"status": "dead", "locked_until": None, "last_error": error}
+                self.dead += 1
+            else:
+                # Rate-limit errors (GitHubRateLimited) say when to come back
+                delay = max(self.backoff(attempts), getattr(e, "retry_after", 0))
+                retry_at = _now() + timedelta(seconds=delay)
+                updates = {
+                    "status": "pending",
+                    "locked_until": None,
+                    "next_attempt_at": retry_at.isoformat(),
+                    "last_error": error,
+                }
+                self.retried += 1
+        else:
+            updates = {"status": "done", "locked_until": None, "result": result}
+            self.processed += 1
+
+        try:
+            # A no-op if our lease expired and another worker re-claimed the row
+            await execute(
+                deliveries.update(updates)
+                .eq("id", delivery["id"])
+                .eq("status", "processing")
+                .eq("attempts", delivery["attempts"])
+            )
+        except Exception:
+            # The lease expires and the delivery is processed again
+            logger.exception("Failed to record webhook delivery %s", delivery["id"])
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
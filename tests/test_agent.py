@@ -0,0 +1,313 @@
+"""Unit tests for /api/agent endpoints."""
+import asyncio
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from gamma.routers import agent as agent_router
+
+PROJECT_ID = uuid4()
+COMMIT_SHA = "abc123"
+
+
+def _query(data):
+    query = MagicMock()
+    for method in ("select", "eq", "order", "limit", "single"):
+        getattr(query, method).return_value = query
+    query.execute.return_value.data = data
+    return query
+
+
+def _mock_supabase():
+    """Supabase mock with one query mock per table."""
+    summaries = _query([])  # no cached summary yet
+    summaries.upsert.return_value.execute.return_value.data = [
+        {
+            "id": str(uuid4()),
+            "project_id": str(PROJECT_ID),
+            "commit_sha": COMMIT_SHA,
+            "summary": "Tuned the learning rate.",
+            "created_at": "2024-01-01T00:00:00+00:00",
+        }
+    ]
+    tables = {
+        "commit_summaries": summaries,
+        "projects": _query(
+            {"github_repo_full_name": "rsamf/gamma", "github_installation_id": 1}
+        ),
+    }
+    client = MagicMock()
+    client.table.side_effect = lambda name: tables[name]
+    return client, tables
+
+
+@pytest.mark.asyncio
+async def test_concurrent_summary_requests_share_one_generation():
+    calls = 0
+
+    async def generate_commit_summary(**kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "Tuned the learning rate."
+
+    mock_sb, tables = _mock_supabase()
+    with (
+        patch("gamma.routers.agent.get_supabase_admin_client", return_value=mock_sb),
+        patch("gamma.routers.agent.AgentService") as mock_agent_cls,
+    ):
+        mock_agent_cls.return_value.generate_commit_summary = generate_commit_summary
+        results = await asyncio.gather(
+            *(
+                agent_router.generate_commit_summary(PROJECT_ID, COMMIT_SHA)
+                for _ in range(5)
+            )
+        )
+
+    assert calls == 1
+    assert all(r["summary"] == "Tuned the learning rate." for r in results)
+    upsert = tables["commit_summaries"].upsert
+    upsert.assert_called_once()
+    assert upsert.call_args.kwargs["on_conflict"] == "project_id,commit_sha"
+
+
+class _FakeStream:
+    def __init__(self, chunks, usage):
+        self.chunks = chunks
+        self.usage = usage
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def get_final_message(self):
+        return MagicMock(usage=self.usage)
+
+
+@pytest.mark.asyncio
+async def test_chat_marks_cache_breakpoints_and_records_usage():
+    from gamma.services.agent_service import AgentService
+
+    usage = MagicMock(
+        input_tokens=12,
+        output_tokens=40,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=3500,
+    )
+    agent = AgentService()
+    agent.client = MagicMock()
+    agent.client.messages.stream.return_value = _FakeStream(["Loss ", "dropped."], usage)
+    history = [
+        {"role": "user", "content": "Why did loss spike?"},
+        {"role": "assistant", "content": "The LR doubled."},
+        {"role": "user", "content": "And now?"},
+    ]
+
+    chunks = [c async for c in agent.chat(history, context="## Commit Diff")]
+
+    assert "".join(chunks) == "Loss dropped."
+    kwargs = agent.client.messages.stream.call_args.kwargs
+    assert kwargs["system"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert kwargs["system"][-1]["text"].endswith("## Commit Diff")
+    assert kwargs["messages"][:2] == history[:2]
+    assert kwargs["messages"][-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert history[-1]["content"] == "And now?"  # caller's list is untouched
+    assert agent.last_usage["cache_read_input_tokens"] == 3500
+
+
+def _turns(n: int) -> list[dict]:
+    """n user/assistant turns with increasing timestamps."""
+    rows = []
+    for i in range(n * 2):
+        rows.append(
+            {
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"message {i}",
+                "created_at": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+            }
+        )
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_history_load_is_bounded_and_starts_with_user():
+    from gamma.services.conversation_history import ConversationHistory
+
+    rows = _turns(30)
+    messages_query = _query(list(reversed(rows[-41:])))  # newest first, odd count
+    mock_sb = MagicMock()
+    mock_sb.table.return_value = messages_query
+    messages_query.gt.return_value = messages_query
+    with patch("gamma.services.conversation_history.get_supabase_admin_client", return_value=mock_sb):
+        history = ConversationHistory(MagicMock())
+        messages, summary = await history.load(
+            {"id": "c1", "summary": "Earlier: tuned LR.", "summary_through": "2024-01-01"}
+        )
+
+    messages_query.gt.assert_called_once_with("created_at", "2024-01-01")
+    messages_query.limit.assert_called_once_with(history.max_messages)
+    assert summary == "Earlier: tuned LR."
+    assert messages[0]["role"] == "user"
+    assert messages[-1]["content"] == rows[-1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_fold_summarizes_old_turns_and_keeps_recent_window():
+    from gamma.services.conversation_history import ConversationHistory
+
+    rows = _turns(25)
+    tables = {
+        "agent_conversations": _query({"summary": None, "summary_through": None}),
+        "agent_messages": _query(rows),
+    }
+    tables["agent_conversations"].update.return_value = tables["agent_conversations"]
+    tables["agent_conversations"].is_.return_value = tables["agent_conversations"]
+    mock_sb = MagicMock()
+    mock_sb.table.side_effect = lambda name: tables[name]
+    agent = MagicMock()
+
+    async def summarize(summary, messages):
+        return f"summary of {len(messages)}"
+
+    agent.summarize_conversation = summarize
+    with patch("gamma.services.conversation_history.get_supabase_admin_client", return_value=mock_sb):
+        history = ConversationHistory(agent)
+        await history._fold("c1")
+
+    folded = len(rows) - history.keep_messages
+    update = tables["agent_conversations"].update
+    update.assert_called_once_with(
+        {"summary": f"summary of {folded}", "summary_through": rows[folded - 1]["created_at"]}
+    )
+    assert rows[folded]["role"] == "user"
+
+
+@pytest.mark.asyncio
+async def test_build_context_fetches_concurrently_and_reuses_the_diff():
+    import time
+
+    from gamma.services.agent_service import AgentService, get_context_cache
+
+    get_context_cache.cache_clear()
+    calls = {"diff": 0, "run": 0}
+
+    async def get_commit_diff(*args):
+        calls["diff"] += 1
+        await asyncio.sleep(0.05)
+        return "diff --git a/train.py b/train.py\n@@ -1 +1 @@\n-lr = 1\n+lr = 2"
+
+    async def get_run(run_id):
+        calls["run"] += 1
+        await asyncio.sleep(0.05)
+        loss = 0.1 / calls["run"]
+        return {"data": {"metrics": [{"key": "loss", "value": loss}], "params": []}}
+
+    agent = AgentService()
+    agent.github.get_commit_diff = get_commit_diff
+    agent.mlflow.get_run = get_run
+
+    start = time.perf_counter()
+    first = await agent.build_context(1, "rsamf/gamma", "abc123", "run-1")
+    elapsed = time.perf_counter() - start
+    second = await agent.build_context(1, "rsamf/gamma", "abc123", "run-1")
+
+    assert elapsed < 0.09  # not 0.05 + 0.05
+    assert "## Commit Diff (abc123)" in first and "- loss: 0.1" in first
+    # The diff is reused, but the run is asked for fresh metrics every turn
+    assert second.split("## Experiment Metrics")[0] == first.split("## Experiment Metrics")[0]
+    assert "- loss: 0.05" in second
+    assert calls == {"diff": 1, "run": 2}
+    get_context_cache.cache_clear()
+
+
+def test_phase_timer_reports_server_timing_and_percentiles():
+    from gamma.services.timing import PhaseStats, PhaseTimer
+
+    stats = PhaseStats()
+    timer = PhaseTimer(stats)
+    timer.record("lookup", 0.012)
+    timer.record("context", 0.25)
+
+    assert timer.server_timing() == "lookup;dur=12.0, context;dur=250.0"
+    assert stats.stats()["context"] == {
+        "count": 1,
+        "p50_ms": 250.0,
+        "p95_ms": 250.0,
+        "max_ms": 250.0,
+    }
+
+
+async def _stored_reply():
+    """Completed task standing in for the user-message insert."""
+    return asyncio.create_task(asyncio.sleep(0))
+
+
+@pytest.mark.asyncio
+async def test_streamed_reply_checkpoints_partial_content():
+    messages = _query([])
+    messages.upsert.return_value = messages
+    mock_sb = MagicMock()
+    mock_sb.table.return_value = messages
+
+    reply = agent_router._StreamedReply(mock_sb, "c1", after=await _stored_reply())
+    reply.interval = 0
+    reply.append("The loss ")
+    await asyncio.sleep(0.05)  # let the checkpoint land
+    reply.append("plateaued.")
+    # Client disconnects here: the reply never completes
+    await reply.finish(usage=None)
+
+    rows = [c.args[0] for c in messages.upsert.call_args_list]
+    assert rows[0]["content"] == "The loss "
+    assert rows[0]["metadata"] == {"complete": False}
+    assert rows[-1]["content"] == "The loss plateaued."
+    assert rows[-1]["metadata"] == {"complete": False}
+    assert {r["id"] for r in rows} == {reply.message_id}
+
+
+@pytest.mark.asyncio
+async def test_completed_reply_is_marked_complete_with_usage():
+    messages = _query([])
+    messages.upsert.return_value = messages
+    mock_sb = MagicMock()
+    mock_sb.table.return_value = messages
+
+    reply = agent_router._StreamedReply(mock_sb, "c1", after=await _stored_reply())
+    for chunk in ("a", "b", "c"):
+        reply.append(chunk)
+    reply.complete = True
+    await reply.finish(usage={"output_tokens": 3})
+
+    messages.upsert.assert_called_once()
+    row = messages.upsert.call_args.args[0]
+    assert row["content"] == "abc"
+    assert row["metadata"] == {"complete": True, "usage": {"output_tokens": 3}}
+
+
+@pytest.mark.asyncio
+async def test_reply_is_stored_even_if_user_message_insert_failed():
+    messages = _query([])
+    messages.upsert.return_value = messages
+    mock_sb = MagicMock()
+    mock_sb.table.return_value = messages
+
+    async def failed_insert():
+        raise RuntimeError("insert failed")
+
+    after = asyncio.create_task(failed_insert())
+    reply = agent_router._StreamedReply(mock_sb, "c1", after=after)
+    reply.append("Loss dropped.")
+    reply.complete = True
+    await reply.finish(usage=None)
+
+    row = messages.upsert.call_args.args[0]
+    assert row["content"] == "Loss dropped."
+    assert row["metadata"] == {"complete": True}
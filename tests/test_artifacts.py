@@ -0,0 +1,132 @@
+"""Unit tests for S3 artifact listing."""
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from botocore.stub import Stubber
+
+from gamma.services.s3_service import S3Service
+
+PROJECT_ID = str(uuid4())
+MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _s3_object(key: str) -> dict:
+    return {"Key": key, "Size": 10, "LastModified": MODIFIED, "ETag": '"e"'}
+
+
+def _mock_project(bucket="bucket", prefix="proj"):
+    client = MagicMock()
+    query = client.table.return_value
+    query.select.return_value = query
+    query.eq.return_value = query
+    query.single.return_value = query
+    query.execute.return_value.data = {"s3_bucket": bucket, "s3_prefix": prefix}
+    return client
+
+
+def test_list_objects_page_with_delimiter_and_cursor():
+    s3 = S3Service()
+    with Stubber(s3.client) as stub:
+        stub.add_response(
+            "list_objects_v2",
+            {
+                "Contents": [_s3_object("ckpt/a.pt")],
+                "CommonPrefixes": [{"Prefix": "ckpt/epoch1/"}],
+                "IsTruncated": True,
+                "NextContinuationToken": "tok-2",
+            },
+            {
+                "Bucket": "b",
+                "Prefix": "ckpt/",
+                "MaxKeys": 10,
+                "Delimiter": "/",
+                "ContinuationToken": "tok-1",
+            },
+        )
+        page = s3.list_objects_page("b", "ckpt/", max_keys=10, cursor="tok-1", delimiter="/")
+
+    assert [o["key"] for o in page["objects"]] == ["ckpt/a.pt"]
+    assert page["prefixes"] == ["ckpt/epoch1/"]
+    assert page["next_cursor"] == "tok-2"
+
+
+def test_list_objects_follows_continuation_tokens():
+    s3 = S3Service()
+    with Stubber(s3.client) as stub:
+        stub.add_response(
+            "list_objects_v2",
+            {"Contents": [_s3_object("a")], "IsTruncated": True, "NextContinuationToken": "t"},
+        )
+        stub.add_response(
+            "list_objects_v2",
+            {"Contents": [_s3_object("b")], "IsTruncated": False},
+        )
+        objects = s3.list_objects("b")
+
+    assert [o["key"] for o in objects] == ["a", "b"]
+
+
+def test_list_artifacts_endpoint_returns_page(client):
+    page = {"objects": [], "prefixes": ["proj/runs/a/"], "next_cursor": None}
+    with (
+        patch("gamma.routers.artifacts.get_supabase_admin_client", return_value=_mock_project()),
+        patch("gamma.routers.artifacts.S3Service") as mock_s3_cls,
+    ):
+        mock_s3_cls.return_value.list_objects_page.return_value = page
+        resp = client.get(f"/api/artifacts/{PROJECT_ID}?prefix=runs&delimiter=/")
+
+    assert resp.status_code == 200
+    assert resp.json() == {"objects": [], "prefixes": ["runs/a/"], "next_cursor": None}
+    mock_s3_cls.return_value.list_objects_page.assert_called_once_with(
+        "bucket", "proj/runs/", max_keys=1000, cursor=None, delimiter="/"
+    )
+
+
+def test_returned_prefixes_browse_into_folders(client):
+    listings = {
+        "proj/": {"objects": [], "prefixes": ["proj/runs/"], "next_cursor": None},
+        "proj/runs/": {"objects": [], "prefixes": ["proj/runs/r1/"], "next_cursor": None},
+        "proj/runs/r1/": {
+            "objects": [{"key": "proj/runs/r1/model.pt"}],
+            "prefixes": [],
+            "next_cursor": None,
+        },
+    }
+    with (
+        patch("gamma.routers.artifacts.get_supabase_admin_client", return_value=_mock_project()),
+        patch("gamma.routers.artifacts.S3Service") as mock_s3_cls,
+    ):
+        mock_s3_cls.return_value.list_objects_page.side_effect = (
+            lambda bucket, prefix, **kwargs: listings[prefix]
+        )
+        prefix, keys = "", []
+        for _ in range(3):
+            page = client.get(
+                f"/api/artifacts/{PROJECT_ID}", params={"prefix": prefix, "delimiter": "/"}
+            ).json()
+            keys += [o["key"] for o in page["objects"]]
+            prefix = page["prefixes"][0] if page["prefixes"] else prefix
+
+    assert prefix == "runs/r1/"
+    assert keys == ["proj/runs/r1/model.pt"]
+
+
+def test_stream_artifacts_ndjson(client):
+    pages = [[{"key": "a"}, {"key": "b"}], [{"key": "c"}]]
+    with (
+        patch("gamma.routers.artifacts.get_supabase_admin_client", return_value=_mock_project()),
+        patch("gamma.routers.artifacts.S3Service") as mock_s3_cls,
+    ):
+        mock_s3_cls.return_value.iter_object_pages.return_value = iter(pages)
+        resp = client.get(f"/api/artifacts/{PROJECT_ID}/stream")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["key"] for line in lines] == ["a", "b", "c"]
+
+
+def test_s3_client_is_process_wide():
+    assert S3Service().client is S3Service().client
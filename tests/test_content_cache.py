@@ -0,0 +1,95 @@
+"""Unit tests for the content-addressed GitHub content cache."""
+import os
+
+import httpx
+import pytest
+
+from gamma.services.content_cache import ContentCache, content_key, is_immutable_ref
+from gamma.services.github_service import GitHubService
+
+SHA = "a" * 40
+
+
+def test_only_full_shas_are_immutable():
+    assert is_immutable_ref(SHA)
+    assert is_immutable_ref("b" * 64)
+    assert not is_immutable_ref("main")
+    assert not is_immutable_ref("abc123")
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_is_shared_between_instances(tmp_path):
+    key = content_key("rsamf/gamma", SHA)
+    writer = ContentCache(tmp_path, memory_max_bytes=1024, disk_max_bytes=1 << 20)
+    await writer.set(key, "diff --git a/x b/x")
+
+    # A second worker on the same host starts with an empty memory tier
+    reader = ContentCache(tmp_path, memory_max_bytes=1024, disk_max_bytes=1 << 20)
+    assert await reader.get(key) == "diff --git a/x b/x"
+    assert await reader.get(key) == "diff --git a/x b/x"
+    assert reader.stats()["disk_hits"] == 1
+    assert reader.stats()["memory_hits"] == 1
+    assert await reader.get(content_key("rsamf/gamma", "c" * 40)) is None
+
+
+@pytest.mark.asyncio
+async def test_disk_sweep_evicts_least_recently_used(tmp_path):
+    cache = ContentCache(tmp_path, memory_max_bytes=0, disk_max_bytes=250)
+    keys = [content_key("rsamf/gamma", SHA, f"file{i}") for i in range(3)]
+    for i, key in enumerate(keys):
+        await cache.set(key, "x" * 100)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+
+    cache._sweep()
+
+    assert not cache._path(keys[0]).exists()
+    assert cache._path(keys[2]).exists()
+    assert cache.stats()["disk_evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_service_fetches_immutable_diff_once(tmp_path, monkeypatch):
+    cache = ContentCache(tmp_path, memory_max_bytes=1 << 20, disk_max_bytes=1 << 20)
+    monkeypatch.setattr("gamma.services.github_service.get_content_cache", lambda: cache)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, text="diff --git a/train.py b/train.py")
+
+    github = GitHubService(http=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    async def token(installation_id):
+        return "inst-tok"
+
+    monkeypatch.setattr(github, "_get_installation_token", token)
+
+    for _ in range(3):
+        assert await github.get_commit_diff(1, "rsamf/gamma", SHA) == (
+            "diff --git a/train.py b/train.py"
+        )
+    # Branch refs can move, so they are never cached
+    await github.get_file_content(1, "rsamf/gamma", "train.py", ref="main")
+    await github.get_file_content(1, "rsamf/gamma", "train.py", ref="main")
+
+    assert requests.count(f"/repos/rsamf/gamma/commits/{SHA}") == 1
+    assert requests.count("/repos/rsamf/gamma/contents/train.py") == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_errors_degrade_to_misses(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    cache = ContentCache(blocker / "cache", memory_max_bytes=0, disk_max_bytes=1 << 20)
+    key = content_key("rsamf/gamma", SHA)
+
+    await cache.set(key, "diff --git a/x b/x")  # the directory can't be created
+    assert await cache.get(key) is None
+
+    # A corrupt entry on a working disk is a miss too
+    healthy = ContentCache(tmp_path / "ok", memory_max_bytes=0, disk_max_bytes=1 << 20)
+    healthy._path(key).parent.mkdir(parents=True)
+    healthy._path(key).write_bytes(b"\xff\xfe\xfa")
+    assert await healthy.get(key) is None
+    assert cache.stats()["disk_errors"] == 2
+    assert healthy.stats()["disk_errors"] == 1
@@ -0,0 +1,95 @@
+"""Unit tests for the token-budgeted diff context builder."""
+from gamma.services.diff_context import (
+    build_diff_context,
+    estimate_tokens,
+    parse_unified_diff,
+)
+
+
+def _file(path: str, hunks: list[list[str]]) -> str:
+    lines = [f"diff --git a/{path} b/{path}", f"--- a/{path}", f"+++ b/{path}"]
+    for i, body in enumerate(hunks):
+        lines.append(f"@@ -{i * 10 + 1},3 +{i * 10 + 1},3 @@")
+        lines.extend(body)
+    return "\n".join(lines)
+
+
+def _diff(*files: str) -> str:
+    return "\n".join(files) + "\n"
+
+
+TRAIN = _file("src/train.py", [["-    lr = 1e-3", "+    lr = 3e-4"]])
+CONFIG = _file("configs/base.yaml", [["-batch_size: 32", "+batch_size: 64"]])
+README = _file("README.md", [[f"+line {i}" for i in range(200)]])
+LOCK = _file("uv.lock", [[f"+pkg-{i} = 1.0" for i in range(5000)]])
+NOTEBOOK = _file("notebooks/explore.ipynb", [['+  "cell": 1']])
+BINARY = "\n".join(
+    [
+        "diff --git a/weights.bin b/weights.bin",
+        "Binary files a/weights.bin and b/weights.bin differ",
+    ]
+)
+
+
+def test_parse_splits_files_and_hunks():
+    files = parse_unified_diff(_diff(TRAIN, BINARY, _file("a.py", [["+x"], ["+y"]])))
+
+    assert [f.path for f in files] == ["src/train.py", "weights.bin", "a.py"]
+    assert files[1].binary
+    assert len(files[2].hunks) == 2
+    assert files[2].hunks[1].lines == ["@@ -11,3 +11,3 @@", "+y"]
+
+
+def test_noise_files_are_dropped_and_summarised():
+    context = build_diff_context(_diff(TRAIN, LOCK, NOTEBOOK, BINARY), 10_000)
+
+    assert "src/train.py" in context.diff
+    assert "uv.lock" not in context.diff
+    assert context.skipped_files == {
+        "lockfiles": ["uv.lock"],
+        "notebooks": ["notebooks/explore.ipynb"],
+        "binary files": ["weights.bin"],
+    }
+    assert "lockfiles (1): uv.lock" in context.summary
+
+
+def test_budget_keeps_ml_hunks_and_elides_the_rest():
+    diff = _diff(README, TRAIN, CONFIG)
+    budget = estimate_tokens(TRAIN) + estimate_tokens(CONFIG) + 10
+
+    context = build_diff_context(diff, budget)
+
+    assert context.tokens <= budget
+    # Original order is preserved for what was kept
+    assert context.diff.index("src/train.py") < context.diff.index("configs/base.yaml")
+    assert "README.md" not in context.diff
+    assert context.elided_hunks == {"README.md": 1}
+
+
+def test_oversized_top_hunk_is_truncated():
+    big = _file("model.py", [[f"+    self.layer{i} = nn.Linear(512, 512)" for i in range(2000)]])
+
+    context = build_diff_context(_diff(big), 500)
+
+    assert context.tokens <= 500
+    assert context.truncated == ["model.py"]
+    assert context.diff.endswith("... (hunk truncated)")
+
+
+def test_hunk_is_elided_when_its_file_header_eats_the_budget():
+    path = "src/" + "very_long_directory_name/" * 30 + "model.py"
+    big = _file(path, [[f"+    self.layer{i} = nn.Linear(512, 512)" for i in range(2000)]])
+
+    context = build_diff_context(_diff(big), 500)
+
+    assert context.tokens <= 500
+    assert context.truncated == []
+    assert context.elided_hunks == {path: 1}
+    assert context.diff == ""
+
+
+def test_small_diff_is_unchanged():
+    context = build_diff_context(_diff(TRAIN), 10_000)
+
+    assert context.diff == TRAIN
+    assert context.summary == ""
@@ -0,0 +1,54 @@
+"""Unit tests for metric-history downsampling."""
+from unittest.mock import AsyncMock, patch
+
+from gamma.services.downsample import align_steps, downsample_history
+
+
+def _history(n: int) -> list[dict]:
+    return [
+        {"key": "loss", "value": float((i * 7919) % 101), "timestamp": i, "step": i}
+        for i in range(n)
+    ]
+
+
+def test_align_steps_sorts_and_keeps_latest_per_step():
+    history = [
+        {"value": 3.0, "timestamp": 3, "step": 2},
+        {"value": 1.0, "timestamp": 1, "step": 1},
+        {"value": 9.0, "timestamp": 5, "step": 1},
+    ]
+    assert [(p["step"], p["value"]) for p in align_steps(history)] == [(1, 9.0), (2, 3.0)]
+
+
+def test_lttb_keeps_endpoints_and_bound():
+    history = _history(10_000)
+    reduced = downsample_history(history, 200, "lttb")
+    assert len(reduced) == 200
+    assert reduced[0]["step"] == 0
+    assert reduced[-1]["step"] == 9_999
+    steps = [p["step"] for p in reduced]
+    assert steps == sorted(steps)
+
+
+def test_minmax_preserves_extremes():
+    history = _history(10_000)
+    history[5_000]["value"] = 1e6
+    history[7_000]["value"] = -1e6
+    reduced = downsample_history(history, 100, "minmax")
+    assert len(reduced) <= 100
+    values = {p["value"] for p in reduced}
+    assert 1e6 in values and -1e6 in values
+
+
+def test_short_history_is_returned_whole():
+    history = _history(10)
+    assert downsample_history(history, 100) == history
+
+
+def test_metric_history_endpoint_downsamples(client):
+    with patch("gamma.routers.experiments.MLflowService") as mock_cls:
+        mock_cls.return_value.get_metric_history = AsyncMock(return_value=_history(5_000))
+        resp = client.get("/api/experiments/runs/r1/metrics/loss?max_points=500")
+
+    assert resp.status_code == 200
+    assert len(resp.json()) == 500
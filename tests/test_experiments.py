@@ -0,0 +1,69 @@
+"""Unit tests for /api/experiments endpoints."""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+
+def _history(run_id: str, n: int = 3) -> list[dict]:
+    return [
+        {"key": "loss", "value": float(i), "timestamp": i, "step": i} for i in range(n)
+    ]
+
+
+def test_metric_history_batch_partial_failure(client):
+    async def get_metric_history(run_id, metric_key):
+        if run_id == "missing":
+            request = httpx.Request("GET", "http://mlflow")
+            raise httpx.HTTPStatusError(
+                "not found", request=request, response=httpx.Response(404, request=request)
+            )
+        return _history(run_id)
+
+    with patch("gamma.routers.experiments.MLflowService") as mock_cls:
+        mock_cls.return_value.get_metric_history = get_metric_history
+        resp = client.post(
+            "/api/experiments/metrics/batch",
+            json={"run_ids": ["r1", "missing", "r1"], "metric_keys": ["loss", "acc"]},
+        )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["runs"]["r1"]["loss"] == {"steps": [0, 1, 2], "values": [0.0, 1.0, 2.0]}
+    assert body["runs"]["missing"] == {}
+    assert {(e["run_id"], e["metric_key"], e["status_code"]) for e in body["errors"]} == {
+        ("missing", "loss", 404),
+        ("missing", "acc", 404),
+    }
+
+
+def test_metric_history_batch_respects_concurrency_cap(client):
+    in_flight = 0
+    peak = 0
+
+    async def get_metric_history(run_id, metric_key):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _history(run_id, 100)
+
+    with (
+        patch("gamma.routers.experiments.MLflowService") as mock_cls,
+        patch("gamma.routers.experiments.get_settings") as mock_settings,
+    ):
+        mock_settings.return_value.mlflow_batch_concurrency = 2
+        mock_cls.return_value.get_metric_history = get_metric_history
+        resp = client.post(
+            "/api/experiments/metrics/batch",
+            json={
+                "run_ids": [f"r{i}" for i in range(5)],
+                "metric_keys": ["loss"],
+                "max_points": 10,
+            },
+        )
+
+    assert resp.status_code == 200
+    assert peak == 2
+    assert all(len(m["loss"]["steps"]) == 10 for m in resp.json()["runs"].values())
@@ -1,8 +1,14 @@
 """Unit tests for /api/github/repos endpoint."""
+import asyncio
+
+import httpx
 import pytest
-from unittest.mock import MagicMock, patch, AsyncMock
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
+from gamma.services.github_cache import get_github_response_cache
+from gamma.services.github_repos import get_repo_list_cache
+from gamma.services.github_service import GitHubService
 
 OWNER_ID = str(uuid4())
 GITHUB_LOGIN = "rsamf"
@@ -12,11 +18,45 @@ SAMPLE_INSTALLATION = {
     "account": {"login": GITHUB_LOGIN},
 }
 
-SAMPLE_REPO = {
-    "full_name": f"{GITHUB_LOGIN}/gamma",
-    "name": "gamma",
-    "private": False,
-}
+
+def _repo(i: int) -> dict:
+    return {"full_name": f"{GITHUB_LOGIN}/repo-{i}", "name": f"repo-{i}", "private": False}
+
+
+class FakeGitHub:
+    """Installations and paged /installation/repositories with ETags."""
+
+    def __init__(self, installations: list[dict], repo_count: int = 1) -> None:
+        self.installations = installations
+        self.repos = [_repo(i) for i in range(repo_count)]
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        page = int(request.url.params.get("page", 1))
+        if request.url.path == "/app/installations":
+            body = self.installations if page == 1 else []
+        else:
+            assert request.headers["Authorization"] == "token inst-token-abc"
+            body = {
+                "total_count": len(self.repos),
+                "repositories": self.repos[(page - 1) * 100 : page * 100],
+            }
+        etag = f'"{request.url.path}-{page}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json=body, headers={"ETag": etag})
+
+    def paths(self) -> list[str]:
+        return [r.url.path for r in self.requests]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    get_repo_list_cache.cache_clear()
+    get_github_response_cache().clear()
+    yield
+    get_repo_list_cache.cache_clear()
 
 
 def _mock_supabase_user(login: str):
@@ -25,43 +65,66 @@ def _mock_supabase_user(login: str):
     return mock
 
 
-def test_list_repos_returns_repos(client):
-    mock_sb = _mock_supabase_user(GITHUB_LOGIN)
+def _patched(fake: FakeGitHub):
+    """Patch the router to use a GitHubService backed by ``fake``."""
 
-    with (
-        patch("gamma.routers.github.get_supabase_admin_client", return_value=mock_sb),
-        patch("gamma.routers.github.GitHubService") as mock_gh_cls,
-        patch("gamma.routers.github.httpx.AsyncClient") as mock_http_cls,
-    ):
-        mock_gh = mock_gh_cls.return_value
-        mock_gh._generate_jwt.return_value = "fake-jwt"
+    def make_service():
+        service = GitHubService(http=httpx.AsyncClient(transport=httpx.MockTransport(fake)))
+        service._generate_jwt = lambda: "fake-jwt"
 
-        http_client = AsyncMock()
-        mock_http_cls.return_value.__aenter__ = AsyncMock(return_value=http_client)
-        mock_http_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        async def token(installation_id):
+            assert installation_id == 12345
+            return "inst-token-abc"
 
-        # GET /app/installations
-        inst_resp = MagicMock()
-        inst_resp.json.return_value = [SAMPLE_INSTALLATION]
+        service._get_installation_token = token
+        return service
 
-        # POST /app/installations/{id}/access_tokens
-        token_resp = MagicMock()
-        token_resp.json.return_value = {"token": "inst-token-abc"}
+    return patch("gamma.routers.github.GitHubService", side_effect=make_service)
 
-        # GET /installation/repositories
-        repos_resp = MagicMock()
-        repos_resp.json.return_value = {"repositories": [SAMPLE_REPO]}
 
-        http_client.get = AsyncMock(side_effect=[inst_resp, repos_resp])
-        http_client.post = AsyncMock(return_value=token_resp)
+def test_list_repos_returns_repos(client):
+    fake = FakeGitHub([SAMPLE_INSTALLATION], repo_count=250)
 
+    with (
+        patch(
+            "gamma.routers.github.get_supabase_admin_client",
+            return_value=_mock_supabase_user(GITHUB_LOGIN),
+        ),
+        _patched(fake),
+    ):
         resp = client.get(f"/api/github/repos?owner_id={OWNER_ID}")
 
     assert resp.status_code == 200
     data = resp.json()
-    assert len(data) == 1
-    assert data[0]["full_name"] == f"{GITHUB_LOGIN}/gamma"
-    assert data[0]["installation_id"] == 12345
+    assert len(data) == 250
+    assert data[0]["full_name"] == f"{GITHUB_LOGIN}/repo-0"
+    assert data[-1]["full_name"] == f"{GITHUB_LOGIN}/repo-249"
+    assert {repo["installation_id"] for repo in data} == {12345}
+    assert fake.paths().count("/installation/repositories") == 3
+
+
+def test_list_repos_is_cached_per_login(client):
+    fake = FakeGitHub([SAMPLE_INSTALLATION])
+
+    with (
+        patch(
+            "gamma.routers.github.get_supabase_admin_client",
+            return_value=_mock_supabase_user(GITHUB_LOGIN),
+        ),
+        _patched(fake),
+    ):
+        first = client.get(f"/api/github/repos?owner_id={OWNER_ID}")
+        second = client.get(f"/api/github/repos?owner_id={OWNER_ID}")
+        calls_after_cached_load = len(fake.requests)
+        refreshed = client.get(f"/api/github/repos?owner_id={OWNER_ID}&refresh=true")
+
+    assert first.json() == second.json() == refreshed.json()
+    assert calls_after_cached_load == 2  # installations + one repo page
+    # The forced refresh revalidated both listings with their ETags
+    assert [r.headers.get("If-None-Match") is not None for r in fake.requests[2:]] == [
+        True,
+        True,
+    ]
 
 
 def test_list_repos_user_not_found(client):
@@ -86,24 +149,36 @@ def test_list_repos_no_github_login(client):
 
 def test_list_repos_no_matching_installation(client):
     """Returns empty list when no installation matches the user's login."""
-    mock_sb = _mock_supabase_user(GITHUB_LOGIN)
+    fake = FakeGitHub([{"id": 99, "account": {"login": "someone-else"}}])
 
     with (
-        patch("gamma.routers.github.get_supabase_admin_client", return_value=mock_sb),
-        patch("gamma.routers.github.GitHubService") as mock_gh_cls,
-        patch("gamma.routers.github.httpx.AsyncClient") as mock_http_cls,
+        patch(
+            "gamma.routers.github.get_supabase_admin_client",
+            return_value=_mock_supabase_user(GITHUB_LOGIN),
+        ),
+        _patched(fake),
     ):
-        mock_gh_cls.return_value._generate_jwt.return_value = "fake-jwt"
-
-        http_client = AsyncMock()
-        mock_http_cls.return_value.__aenter__ = AsyncMock(return_value=http_client)
-        mock_http_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        inst_resp = MagicMock()
-        inst_resp.json.return_value = [{"id": 99, "account": {"login": "someone-else"}}]
-        http_client.get = AsyncMock(return_value=inst_resp)
-
         resp = client.get(f"/api/github/repos?owner_id={OWNER_ID}")
 
     assert resp.status_code == 200
     assert resp.json() == []
+    assert fake.paths() == ["/app/installations"]
+
+
+@pytest.mark.asyncio
+async def test_stale_list_is_served_while_refreshing():
+    cache = get_repo_list_cache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return [{"full_name": f"v{calls}"}]
+
+    assert await cache.get("rsamf", fetch) == [{"full_name": "v1"}]
+    cache._listings["rsamf"].fetched_at -= cache.ttl + 1  # now stale
+
+    assert await cache.get("rsamf", fetch) == [{"full_name": "v1"}]
+    await asyncio.sleep(0.01)  # let the background refresh finish
+    assert await cache.get("rsamf", fetch) == [{"full_name": "v2"}]
+    assert calls == 2
@@ -0,0 +1,323 @@
+"""Unit tests for GitHubService auth caching."""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from gamma.services.github_auth import CachedToken, InstallationTokenCache
+from gamma.services.github_service import GitHubService
+
+
+@pytest.mark.asyncio
+async def test_token_cache_hit_until_refresh_margin():
+    cache = InstallationTokenCache(refresh_margin=300)
+    minted = []
+
+    async def mint():
+        minted.append(1)
+        return CachedToken(token=f"tok-{len(minted)}", expires_at=time.time() + 3600)
+
+    assert await cache.get(1, mint) == "tok-1"
+    assert await cache.get(1, mint) == "tok-1"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # Inside the refresh margin the token is re-minted
+    cache._tokens[1].expires_at = time.time() + 60
+    assert await cache.get(1, mint) == "tok-2"
+
+
+@pytest.mark.asyncio
+async def test_token_cache_single_flight():
+    cache = InstallationTokenCache(refresh_margin=300)
+    calls = 0
+
+    async def mint():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return CachedToken(token="tok", expires_at=time.time() + 3600)
+
+    tokens = await asyncio.gather(*(cache.get(7, mint) for _ in range(10)))
+
+    assert tokens == ["tok"] * 10
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_service_reuses_installation_token(monkeypatch):
+    cache = InstallationTokenCache(refresh_margin=300)
+    monkeypatch.setattr(
+        "gamma.services.github_service.get_installation_token_cache", lambda: cache
+    )
+    token_posts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal token_posts
+        if request.url.path.endswith("/access_tokens"):
+            token_posts += 1
+            return httpx.Response(
+                201, json={"token": "inst-tok", "expires_at": "2999-01-01T00:00:00Z"}
+            )
+        assert request.headers["Authorization"] == "token inst-tok"
+        return httpx.Response(200, text="diff --git a/x b/x")
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    github = GitHubService(http=http)
+    monkeypatch.setattr(github, "_generate_jwt", lambda: "app-jwt")
+
+    for _ in range(3):
+        await github.get_commit_diff(42, "rsamf/gamma", "abc123")
+
+    assert token_posts == 1
+
+
+def _rsa_pem() -> str:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def test_app_jwt_reused_until_near_expiry():
+    import jwt
+
+    from gamma.services.github_auth import AppJWTSigner
+
+    pem = _rsa_pem()
+    signer = AppJWTSigner("123", pem.replace("\n", "\\n"))
+
+    first = signer.token()
+    assert signer.token() == first
+    assert signer.stats() == {"signed": 1, "reused": 1}
+    claims = jwt.decode(first, options={"verify_signature": False})
+    assert claims["iss"] == "123"
+
+    # Within the refresh margin a new JWT is signed
+    signer._expires_at = int(time.time()) + 30
+    signer.token()
+    assert signer.stats()["signed"] == 2
+
+
+def test_invalid_signing_key_raises_invalid_key_error():
+    import jwt
+
+    from gamma.services.github_auth import load_signing_key
+
+    with pytest.raises(jwt.exceptions.InvalidKeyError):
+        load_signing_key("not-a-key")
+
+
+class _FakeGitData:
+    """Just enough of the Git Data API for create_commit."""
+
+    def __init__(self, conflicts: int = 0) -> None:
+        self.conflicts = conflicts
+        self.head = "head-0"
+        self.calls: list[str] = []
+        self.trees: list[dict] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.calls.append(f"{request.method} {path}")
+        if path.endswith("/branches/models/exp"):
+            return httpx.Response(
+                200,
+                json={"commit": {"sha": self.head, "commit": {"tree": {"sha": f"tree-{self.head}"}}}},
+            )
+        if path.endswith("/git/blobs"):
+            return httpx.Response(201, json={"sha": f"blob-{len(self.calls)}"})
+        if path.endswith("/git/trees"):
+            self.trees.append(json.loads(request.content))
+            return httpx.Response(201, json={"sha": "new-tree"})
+        if path.endswith("/git/commits"):
+            return httpx.Response(201, json={"sha": "new-commit"})
+        if path.endswith("/git/refs/heads/models/exp"):
+            if self.conflicts:
+                self.conflicts -= 1
+                self.head = f"head-{len(self.calls)}"  # someone else pushed
+                return httpx.Response(422, json={"message": "Update is not a fast forward"})
+            return httpx.Response(200, json={"object": {"sha": "new-commit"}})
+        raise AssertionError(f"unexpected request {path}")
+
+
+def _github_for(fake, monkeypatch) -> GitHubService:
+    github = GitHubService(http=httpx.AsyncClient(transport=httpx.MockTransport(fake)))
+
+    async def token(installation_id):
+        return "inst-tok"
+
+    monkeypatch.setattr(github, "_get_installation_token", token)
+    return github
+
+
+@pytest.mark.asyncio
+async def test_create_commit_inlines_small_files(monkeypatch):
+    from gamma.services.github_service import INLINE_BLOB_MAX_BYTES
+
+    fake = _FakeGitData()
+    github = _github_for(fake, monkeypatch)
+    files = {
+        "configs/train.yaml": "lr: 3e-4\n",
+        "model.py": "x = 1\n",
+        "weights.txt": "0" * (INLINE_BLOB_MAX_BYTES + 1),
+    }
+
+    result = await github.create_commit(1, "rsamf/gamma", "models/exp", "Tune", files)
+
+    assert result["sha"] == "new-commit"
+    assert sum(call.endswith("/git/blobs") for call in fake.calls) == 1
+    assert not any("/git/commits/" in call for call in fake.calls)  # branch lookup has the tree
+    items = {item["path"]: item for item in fake.trees[0]["tree"]}
+    assert items["configs/train.yaml"]["content"] == "lr: 3e-4\n"
+    assert "sha" in items["weights.txt"]
+    assert fake.trees[0]["base_tree"] == "tree-head-0"
+
+
+@pytest.mark.asyncio
+async def test_create_commit_retries_non_fast_forward(monkeypatch):
+    fake = _FakeGitData(conflicts=1)
+    github = _github_for(fake, monkeypatch)
+
+    await github.create_commit(1, "rsamf/gamma", "models/exp", "Tune", {"a.py": "a\n"})
+
+    assert len(fake.trees) == 2
+    assert fake.trees[1]["base_tree"] == f"tree-{fake.head}"
+    assert sum(call.startswith("PATCH") for call in fake.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_commit_gives_up_after_retries(monkeypatch):
+    fake = _FakeGitData(conflicts=10)
+    github = _github_for(fake, monkeypatch)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await github.create_commit(1, "rsamf/gamma", "models/exp", "Tune", {"a.py": "a\n"})
+
+
+@pytest.mark.asyncio
+async def test_get_revalidates_with_etag(monkeypatch):
+    from gamma.services.github_cache import GitHubResponseCache
+
+    cache = GitHubResponseCache(max_bytes=1 << 20)
+    monkeypatch.setattr("gamma.services.github_service.get_github_response_cache", lambda: cache)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.headers["Authorization"], request.headers.get("If-None-Match")))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            text="lr: 3e-4\n",
+            headers={"ETag": '"v1"', "Content-Encoding": "identity"},
+        )
+
+    github = GitHubService(http=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    async def token(installation_id):
+        return f"tok-{installation_id}"
+
+    monkeypatch.setattr(github, "_get_installation_token", token)
+
+    for _ in range(2):
+        assert await github.get_file_content(1, "rsamf/gamma", "train.yaml") == "lr: 3e-4\n"
+    # Another installation never gets the first one's cached copy
+    await github.get_file_content(2, "rsamf/gamma", "train.yaml")
+
+    assert seen == [("token tok-1", None), ("token tok-1", '"v1"'), ("token tok-2", None)]
+    stats = cache.stats()
+    assert stats["not_modified"] == 1
+    assert stats["bytes_saved"] == len("lr: 3e-4\n")
+
+
+def test_response_cache_evicts_least_recently_used():
+    from gamma.services.github_cache import GitHubResponseCache
+
+    cache = GitHubResponseCache(max_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.store(key, httpx.Response(200, content=b"x" * 100, headers={"ETag": key}))
+    cache.store("untagged", httpx.Response(200, content=b"y"))
+
+    assert cache.get("a") is None
+    assert cache.get("c").validators == {"If-None-Match": "c"}
+    assert cache.get("untagged") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 200
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_response_is_retried_after_retry_after(monkeypatch):
+    from gamma.services.github_ratelimit import GitHubRateLimiter
+
+    limiter = GitHubRateLimiter(reserve=0.1, max_wait=30)
+    monkeypatch.setattr("gamma.services.github_service.get_github_rate_limiter", lambda: limiter)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("gamma.services.github_ratelimit.asyncio.sleep", fake_sleep)
+    quota = {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "4999",
+        "X-RateLimit-Reset": str(int(time.time()) + 3600),
+    }
+    responses = [
+        httpx.Response(
+            403, text="You have exceeded a secondary rate limit", headers={"Retry-After": "5"}
+        ),
+        httpx.Response(200, text="ok", headers=quota),
+    ]
+    github = _github_for(lambda request: responses.pop(0), monkeypatch)
+
+    assert await github.get_file_content(7, "rsamf/gamma", "train.py") == "ok"
+
+    assert len(sleeps) == 1 and 4 < sleeps[0] <= 5
+    stats = limiter.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["scopes"]["7"]["remaining"] == 4999
+
+
+@pytest.mark.asyncio
+async def test_low_quota_paces_requests_and_gives_up_past_max_wait(monkeypatch):
+    from gamma.services.github_ratelimit import GitHubRateLimited, GitHubRateLimiter
+
+    limiter = GitHubRateLimiter(reserve=0.1, max_wait=30)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("gamma.services.github_ratelimit.asyncio.sleep", fake_sleep)
+    reset = int(time.time()) + 100
+    low = httpx.Response(
+        200,
+        headers={
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "10",
+            "X-RateLimit-Reset": str(reset),
+        },
+    )
+    limiter.record(1, low)
+
+    # 10 requests left for ~100s: spaced ~10s apart instead of all at once
+    await limiter.acquire(1)
+    await limiter.acquire(1)
+    assert len(sleeps) == 1 and 9 < sleeps[0] <= 11
+    await limiter.acquire(1)
+    await limiter.acquire(1)
+    # The next slot is ~40s out, longer than max_wait: fail instead of queueing
+    with pytest.raises(GitHubRateLimited):
+        await limiter.acquire(1)
+    stats = limiter.stats()
+    assert stats["rejected"] == 1
+    assert stats["scopes"]["1"]["remaining"] == 6
@@ -0,0 +1,46 @@
+"""Unit tests for the shared outbound HTTP client pool."""
+import httpx
+import pytest
+
+from gamma.services.http_pool import HTTPClientPool
+
+
+class _Stream:
+    """Stand-in for an httpcore network stream (only identity matters)."""
+
+
+def _response(stream):
+    return httpx.Response(200, extensions={"network_stream": stream})
+
+
+def test_client_is_shared_per_upstream():
+    pool = HTTPClientPool()
+    assert pool.client("github") is pool.client("github")
+    assert pool.client("github") is not pool.client("mlflow")
+
+
+def test_connection_reuse_stats():
+    pool = HTTPClientPool()
+    pool.client("github")
+    first, second = _Stream(), _Stream()
+
+    pool._record("github", _response(first))
+    pool._record("github", _response(first))
+    pool._record("github", _response(first))
+    pool._record("github", _response(second))
+
+    stats = pool.stats()["github"]
+    assert stats["requests"] == 4
+    assert stats["new_connections"] == 2
+    assert stats["reused_connections"] == 2
+    assert stats["reuse_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_clients():
+    pool = HTTPClientPool()
+    client = pool.client("mlflow")
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.client("mlflow") is not client
+    await pool.aclose()
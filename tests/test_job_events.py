@@ -0,0 +1,98 @@
+"""Unit tests for the job event broker and the events the jobs API publishes."""
+import json
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from gamma.services.job_events import RESYNC, JobEventBroker, get_job_event_broker
+
+PROJECT_ID = str(uuid4())
+
+
+def _job(status: str = "running") -> dict:
+    return {"id": "job-1", "project_id": PROJECT_ID, "status": status}
+
+
+def _drain(subscription) -> list[str]:
+    messages = []
+    while not subscription._queue.empty():
+        messages.append(subscription._queue.get_nowait())
+    return messages
+
+
+def _event_ids(messages: list[str]) -> list[int]:
+    return [int(message.split("\n")[0].removeprefix("id: ")) for message in messages]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_only_get_their_project():
+    broker = JobEventBroker(buffer_size=10, queue_size=10)
+    mine = broker.subscribe(PROJECT_ID)
+    other = broker.subscribe(str(uuid4()))
+
+    broker.publish(PROJECT_ID, "updated", {**_job(), "sagemaker_details": {"big": "x"}})
+
+    message = await mine.get()
+    assert message.startswith("id: ")
+    data = json.loads(message.split("data: ", 1)[1])
+    assert data == {"type": "updated", "job": _job()}  # non-model columns dropped
+    assert _drain(other) == []
+
+    mine.close()
+    assert broker.stats()["subscribers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_missed_events_or_resyncs():
+    broker = JobEventBroker(buffer_size=3, queue_size=10)
+    first = broker.publish(PROJECT_ID, "created", _job("pending"))
+    events = [broker.publish(PROJECT_ID, "updated", _job()) for _ in range(2)]
+
+    resumed = broker.subscribe(PROJECT_ID, last_event_id=first.id)
+    assert _event_ids(_drain(resumed)) == [event.id for event in events]
+
+    # The first event has fallen out of the 3-event buffer
+    broker.publish(PROJECT_ID, "updated", _job("completed"))
+    broker.publish(PROJECT_ID, "updated", _job("completed"))
+    assert _drain(broker.subscribe(PROJECT_ID, last_event_id=first.id)) == [RESYNC]
+    # An id from before this process started can't be replayed either
+    assert _drain(broker.subscribe(str(uuid4()), last_event_id=1)) == [RESYNC]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_overflow_becomes_resync():
+    broker = JobEventBroker(buffer_size=10, queue_size=2)
+    slow = broker.subscribe(PROJECT_ID)
+
+    for _ in range(3):
+        broker.publish(PROJECT_ID, "updated", _job())
+
+    assert _drain(slow) == [RESYNC]
+    assert broker.stats()["overflows"] == 1
+
+
+def test_patch_publishes_job_update(client):
+    get_job_event_broker.cache_clear()
+    subscription = get_job_event_broker().subscribe(PROJECT_ID)
+    row = {
+        "id": str(uuid4()),
+        "project_id": PROJECT_ID,
+        "commit_sha": "abc123",
+        "branch": "models/exp",
+        "status": "completed",
+        "mlflow_run_id": None,
+        "created_at": "2026-10-18T10:00:00+00:00",
+    }
+    mock = MagicMock()
+    mock.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [
+        row
+    ]
+
+    with patch("gamma.routers.jobs.get_supabase_admin_client", return_value=mock):
+        resp = client.patch(f"/api/jobs/{row['id']}", json={"status": "completed"})
+
+    assert resp.status_code == 200
+    [message] = _drain(subscription)
+    assert json.loads(message.split("data: ", 1)[1])["job"]["status"] == "completed"
+    get_job_event_broker.cache_clear()
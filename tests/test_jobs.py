@@ -0,0 +1,103 @@
+"""Unit tests for /api/jobs endpoints."""
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from gamma.db.pagination import decode_cursor, encode_cursor
+
+PROJECT_ID = str(uuid4())
+
+
+def _job(i: int) -> dict:
+    return {
+        "id": str(uuid4()),
+        "project_id": PROJECT_ID,
+        "commit_sha": f"sha{i}",
+        "branch": "models",
+        "github_workflow_run_id": None,
+        "sagemaker_job_name": None,
+        "status": "pending",
+        "mlflow_run_id": None,
+        "started_at": None,
+        "completed_at": None,
+        "created_at": f"2024-01-{i + 1:02d}T00:00:00+00:00",
+    }
+
+
+def _mock_supabase(data):
+    """Chainable query mock; every builder method returns the same query."""
+    client = MagicMock()
+    query = MagicMock()
+    for method in ("select", "eq", "order", "limit", "or_", "single"):
+        getattr(query, method).return_value = query
+    query.execute.return_value.data = data
+    client.table.return_value = query
+    return client
+
+
+def test_list_jobs_first_page_sets_next_cursor(client):
+    rows = [_job(i) for i in range(3)]
+    mock = _mock_supabase(rows)
+    with patch("gamma.routers.jobs.get_supabase_admin_client", return_value=mock):
+        resp = client.get(f"/api/jobs?project_id={PROJECT_ID}&limit=2")
+
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+    cursor = resp.headers["X-Next-Cursor"]
+    assert decode_cursor(cursor)[1] == rows[1]["id"]
+    mock.table.return_value.limit.assert_called_with(3)
+
+
+def test_list_jobs_last_page_has_no_cursor(client):
+    mock = _mock_supabase([_job(0)])
+    with patch("gamma.routers.jobs.get_supabase_admin_client", return_value=mock):
+        resp = client.get("/api/jobs?limit=2")
+
+    assert resp.status_code == 200
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_jobs_applies_cursor_and_filters(client):
+    mock = _mock_supabase([])
+    cursor = encode_cursor(_job(5))
+    with patch("gamma.routers.jobs.get_supabase_admin_client", return_value=mock):
+        resp = client.get(
+            f"/api/jobs?project_id={PROJECT_ID}&status=running&branch=models/exp"
+            f"&cursor={cursor}"
+        )
+
+    assert resp.status_code == 200
+    query = mock.table.return_value
+    query.eq.assert_any_call("status", "running")
+    query.eq.assert_any_call("branch", "models/exp")
+    assert "created_at.lt." in query.or_.call_args.args[0]
+
+
+def test_list_jobs_field_projection(client):
+    row = {"id": str(uuid4()), "created_at": "2024-01-01T00:00:00+00:00", "status": "running"}
+    mock = _mock_supabase([row])
+    with patch("gamma.routers.jobs.get_supabase_admin_client", return_value=mock):
+        resp = client.get("/api/jobs?fields=status")
+
+    assert resp.status_code == 200
+    assert resp.json() == [row]
+    mock.table.return_value.select.assert_called_with("created_at,id,status")
+
+
+def test_list_jobs_rejects_bad_cursor_and_fields(client):
+    mock = _mock_supabase([])
+    with patch("gamma.routers.jobs.get_supabase_admin_client", return_value=mock):
+        assert client.get("/api/jobs?cursor=garbage").status_code == 400
+        assert client.get("/api/jobs?fields=secret").status_code == 400
+
+
+def test_create_job_conflict_returns_409(client):
+    mock = MagicMock()
+    mock.table.return_value.upsert.return_value.execute.return_value.data = []
+    body = {"project_id": PROJECT_ID, "commit_sha": "abc123", "branch": "models/exp"}
+    with patch("gamma.routers.jobs.get_supabase_admin_client", return_value=mock):
+        resp = client.post("/api/jobs", json=body)
+
+    assert resp.status_code == 409
+    assert mock.table.return_value.upsert.call_args.kwargs["on_conflict"] == (
+        "project_id,commit_sha,branch"
+    )
@@ -0,0 +1,94 @@
+"""Unit tests for the MLflow read cache."""
+import httpx
+import pytest
+
+from gamma.services.mlflow_cache import MLflowCache
+from gamma.services.mlflow_service import MLflowService
+
+
+def _cache(**overrides) -> MLflowCache:
+    params = {"max_bytes": 1000, "active_ttl": 10.0, "experiment_ttl": 300.0}
+    params.update(overrides)
+    return MLflowCache(**params)
+
+
+def test_lru_eviction_by_size():
+    cache = _cache(max_bytes=100)
+    cache.set("a", 1, size=40, ttl=None)
+    cache.set("b", 2, size=40, ttl=None)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3, size=40, ttl=None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.bytes == 80
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("gamma.services.mlflow_cache.time.monotonic", lambda: now[0])
+    cache = _cache()
+    cache.set("k", "v", size=1, ttl=5.0)
+    assert cache.get("k") == "v"
+    now[0] += 6
+    assert cache.get("k") is None
+
+
+def test_invalidate_run():
+    cache = _cache()
+    cache.mark_run_status("r1", "FINISHED")
+    cache.set("run", 1, size=1, ttl=None, run_id="r1")
+    cache.set("hist", 2, size=1, ttl=None, run_id="r1")
+    cache.set("other", 3, size=1, ttl=None, run_id="r2")
+    assert cache.run_ttl("r1") is None
+
+    cache.invalidate_run("r1")
+
+    assert cache.get("run") is None and cache.get("hist") is None
+    assert cache.get("other") == 3
+    assert cache.run_ttl("r1") == 10.0
+
+
+def _mlflow(handler, monkeypatch) -> tuple[MLflowService, MLflowCache]:
+    cache = _cache(max_bytes=1_000_000)
+    monkeypatch.setattr("gamma.services.mlflow_service.get_mlflow_cache", lambda: cache)
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return MLflowService(http=http), cache
+
+
+@pytest.mark.asyncio
+async def test_terminal_run_is_cached_without_ttl(monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/runs/get"):
+            return httpx.Response(
+                200, json={"run": {"info": {"run_id": "r1", "status": "FINISHED"}}}
+            )
+        return httpx.Response(200, json={"metrics": [{"step": 0, "value": 1.0}]})
+
+    mlflow, cache = _mlflow(handler, monkeypatch)
+
+    await mlflow.get_run("r1")
+    await mlflow.get_run("r1")
+    await mlflow.get_metric_history("r1", "loss")
+    await mlflow.get_metric_history("r1", "loss")
+
+    assert len(calls) == 2
+    assert all(entry.expires_at is None for entry in cache._entries.values())
+
+
+@pytest.mark.asyncio
+async def test_active_run_uses_short_ttl(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json={"run": {"info": {"run_id": "r2", "status": "RUNNING"}}}
+        )
+
+    mlflow, cache = _mlflow(handler, monkeypatch)
+    await mlflow.get_run("r2")
+
+    (entry,) = cache._entries.values()
+    assert entry.expires_at is not None
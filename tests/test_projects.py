@@ -34,6 +34,8 @@ def _mock_supabase(data):
     query.select.return_value = query
     query.eq.return_value = query
     query.order.return_value = query
+    query.limit.return_value = query
+    query.or_.return_value = query
     query.single.return_value = query
     query.execute.return_value.data = data
 
@@ -0,0 +1,156 @@
+"""Unit tests for the SageMaker status reconciler and the status endpoint."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from gamma.services.sagemaker_reconciler import SageMakerReconciler
+
+
+def _query(data):
+    query = MagicMock()
+    for method in ("select", "eq", "is_", "or_", "order", "limit", "single", "update"):
+        getattr(query, method).return_value = query
+    query.not_ = query
+    query.execute.return_value.data = data
+    return query
+
+
+def _details(name: str, status: str) -> dict:
+    return {
+        "job_name": name,
+        "status": status,
+        "secondary_status": "Training" if status == "InProgress" else status,
+        "creation_time": "2026-10-18T10:00:00+00:00",
+        "training_start_time": "2026-10-18T10:05:00+00:00",
+        "training_end_time": None if status == "InProgress" else "2026-10-18T11:00:00+00:00",
+        "failure_reason": "",
+        "billable_seconds": None,
+        "instance_type": "ml.g5.xlarge",
+        "instance_count": 1,
+        "output_path": "s3://bucket/out",
+    }
+
+
+class FakeSageMaker:
+    def __init__(self, statuses: dict[str, str], listed: set[str]) -> None:
+        self.statuses = statuses
+        self.listed = listed
+        self.described: list[str] = []
+
+    def list_training_jobs_modified_since(self, since):
+        return {name: self.statuses[name] for name in self.listed}
+
+    def get_training_job(self, name):
+        self.described.append(name)
+        if name not in self.statuses:
+            raise RuntimeError(f"Could not find requested job with name {name}")
+        return _details(name, self.statuses[name])
+
+
+def _active_job(name: str, synced_ago: float | None, status: str = "running") -> dict:
+    synced_at = None
+    if synced_ago is not None:
+        synced_at = (datetime.now(timezone.utc) - timedelta(seconds=synced_ago)).isoformat()
+    return {
+        "id": str(uuid4()),
+        "project_id": str(uuid4()),
+        "status": status,
+        "sagemaker_job_name": name,
+        "sagemaker_synced_at": synced_at,
+    }
+
+
+@pytest.mark.asyncio
+async def test_reconcile_describes_only_changed_new_and_stale_jobs():
+    jobs = [
+        _active_job("changed", synced_ago=10),
+        _active_job("new", synced_ago=None),
+        _active_job("quiet", synced_ago=10),
+        _active_job("stale", synced_ago=3600),
+        _active_job("done-by-ci", synced_ago=10, status="completed"),
+    ]
+    sagemaker = FakeSageMaker(
+        {
+            "changed": "Completed",
+            "new": "InProgress",
+            "quiet": "InProgress",
+            "stale": "InProgress",
+            "done-by-ci": "Failed",
+        },
+        listed={"changed", "done-by-ci"},
+    )
+    active, updates = _query(jobs), _query([])
+    client = MagicMock()
+    client.table.side_effect = [active, updates, updates, updates, updates]
+
+    with patch(
+        "gamma.services.sagemaker_reconciler.get_supabase_admin_client", return_value=client
+    ):
+        await SageMakerReconciler(sagemaker).reconcile()
+
+    assert sorted(sagemaker.described) == ["changed", "done-by-ci", "new", "stale"]
+    written = {
+        call.args[0]["sagemaker_details"]["job_name"]: call.args[0]
+        for call in updates.update.call_args_list
+    }
+    assert written["changed"]["status"] == "completed"
+    assert written["changed"]["completed_at"] == "2026-10-18T11:00:00+00:00"
+    assert written["new"]["status"] == "running"
+    assert written["new"]["started_at"] == "2026-10-18T10:05:00+00:00"
+    # A job the pipeline already finished keeps its status
+    assert "status" not in written["done-by-ci"]
+    assert written["done-by-ci"]["sagemaker_status"] == "Failed"
+
+
+@pytest.mark.asyncio
+async def test_failed_describe_is_recorded_and_backed_off():
+    missing = _active_job("deleted", synced_ago=None)
+    sagemaker = FakeSageMaker({}, listed=set())
+    active, updates = _query([missing]), _query([])
+    client = MagicMock()
+    client.table.side_effect = [active, updates]
+    reconciler = SageMakerReconciler(sagemaker)
+
+    with patch(
+        "gamma.services.sagemaker_reconciler.get_supabase_admin_client", return_value=client
+    ):
+        assert await reconciler.reconcile() == []
+
+    [failure] = [call.args[0] for call in updates.update.call_args_list]
+    assert failure["sagemaker_synced_at"]
+    assert "Could not find" in failure["sagemaker_sync_error"]
+    assert reconciler.stats()["errors"] == 1
+
+    # Next pass the job has a synced_at within max_age, so it is not described again
+    missing["sagemaker_synced_at"] = failure["sagemaker_synced_at"]
+    client.table.side_effect = [_query([missing])]
+    with patch(
+        "gamma.services.sagemaker_reconciler.get_supabase_admin_client", return_value=client
+    ):
+        await reconciler.reconcile()
+    assert sagemaker.described == ["deleted"]
+
+
+def test_status_endpoint_is_answered_from_the_database(client):
+    row = {
+        "id": str(uuid4()),
+        "status": "running",
+        "sagemaker_job_name": "train-1",
+        "sagemaker_details": _details("train-1", "InProgress"),
+        "sagemaker_synced_at": "2026-10-18T10:06:00+00:00",
+    }
+    db = MagicMock()
+    db.table.return_value = _query(row)
+
+    with (
+        patch("gamma.routers.jobs.get_supabase_admin_client", return_value=db),
+        patch("gamma.services.sagemaker_reconciler.run_aws") as run_aws,
+    ):
+        resp = client.get(f"/api/jobs/{row['id']}/sagemaker-status")
+
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "InProgress"
+    assert resp.json()["synced_at"] == "2026-10-18T10:06:00+00:00"
+    run_aws.assert_not_called()
@@ -0,0 +1,215 @@
+"""Unit tests for the GitHub webhook endpoint and delivery queue."""
+import hashlib
+import hmac
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from gamma.routers import webhooks
+from gamma.services.webhook_queue import WebhookQueue, get_recent_deliveries
+
+SECRET = "whsec"
+PUSH = {
+    "ref": "refs/heads/models/lr-sweep",
+    "after": "abc123",
+    "repository": {"full_name": "rsamf/gamma"},
+}
+
+
+def _sign(body: bytes) -> str:
+    return "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def webhook_secret():
+    get_recent_deliveries.cache_clear()
+    with patch("gamma.services.github_service.get_settings") as mock_settings:
+        mock_settings.return_value.github_webhook_secret = SECRET
+        yield
+
+
+def test_push_is_queued_and_acknowledged(client, webhook_secret):
+    body = json.dumps(PUSH).encode()
+    with patch(
+        "gamma.routers.webhooks.enqueue_delivery", new=AsyncMock(return_value="row-1")
+    ) as enqueue:
+        response = client.post(
+            "/api/webhooks/github",
+            content=body,
+            headers={
+                "X-Hub-Signature-256": _sign(body),
+                "X-GitHub-Event": "push",
+                "X-GitHub-Delivery": "delivery-1",
+            },
+        )
+
+    assert response.status_code == 202
+    assert response.json()["delivery"] == "row-1"
+    enqueue.assert_awaited_once_with("push", PUSH, "delivery-1")
+
+
+def test_redelivery_is_not_queued_twice(client, webhook_secret):
+    body = json.dumps(PUSH).encode()
+    headers = {
+        "X-Hub-Signature-256": _sign(body),
+        "X-GitHub-Event": "push",
+        "X-GitHub-Delivery": "delivery-2",
+    }
+    with patch(
+        "gamma.routers.webhooks.enqueue_delivery", new=AsyncMock(return_value="row-2")
+    ) as enqueue:
+        first = client.post("/api/webhooks/github", content=body, headers=headers)
+        second = client.post("/api/webhooks/github", content=body, headers=headers)
+
+    assert first.status_code == 202
+    assert second.json()["status"] == "duplicate"
+    enqueue.assert_awaited_once()
+
+
+def test_invalid_signature_is_rejected(client, webhook_secret):
+    with patch("gamma.routers.webhooks.enqueue_delivery", new=AsyncMock()) as enqueue:
+        response = client.post(
+            "/api/webhooks/github",
+            content=json.dumps(PUSH).encode(),
+            headers={"X-Hub-Signature-256": "sha256=bad", "X-GitHub-Event": "push"},
+        )
+
+    assert response.status_code == 401
+    enqueue.assert_not_awaited()
+
+
+def test_unhandled_events_are_not_queued(client, webhook_secret):
+    body = b"{}"
+    with patch("gamma.routers.webhooks.enqueue_delivery", new=AsyncMock()) as enqueue:
+        response = client.post(
+            "/api/webhooks/github",
+            content=body,
+            headers={"X-Hub-Signature-256": _sign(body), "X-GitHub-Event": "ping"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ignored"
+    enqueue.assert_not_awaited()
+
+
+def _delivery(attempts: int) -> dict:
+    return {"id": "row-1", "event": "push", "payload": PUSH, "attempts": attempts}
+
+
+async def _process(handler, attempts: int) -> dict:
+    """Run one delivery through the queue and return the recorded update."""
+    mock_sb = MagicMock()
+    with patch("gamma.services.webhook_queue.get_supabase_admin_client", return_value=mock_sb):
+        queue = WebhookQueue(handler)
+        await queue._process(_delivery(attempts))
+    update = mock_sb.table.return_value.update
+    update.assert_called_once()
+    query = update.return_value
+    query.eq.assert_called_once_with("id", "row-1")
+    query.eq.return_value.eq.assert_called_once_with("status", "processing")
+    query.eq.return_value.eq.return_value.eq.assert_called_once_with("attempts", attempts)
+    return update.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_successful_delivery_is_marked_done():
+    handler = AsyncMock(return_value={"status": "created"})
+    updates = await _process(handler, attempts=1)
+
+    handler.assert_awaited_once_with("push", PUSH)
+    assert updates["status"] == "done"
+    assert updates["result"] == {"status": "created"}
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_retried_with_backoff():
+    handler = AsyncMock(side_effect=RuntimeError("supabase down"))
+    updates = await _process(handler, attempts=1)
+
+    assert updates["status"] == "pending"
+    assert "supabase down" in updates["last_error"]
+    assert updates["next_attempt_at"]
+
+
+@pytest.mark.asyncio
+async def test_delivery_is_dead_after_max_attempts():
+    handler = AsyncMock(side_effect=RuntimeError("bad payload"))
+    queue = WebhookQueue(handler)
+    updates = await _process(handler, attempts=queue.max_attempts)
+
+    assert updates["status"] == "dead"
+
+
+def test_backoff_doubles_up_to_the_cap():
+    queue = WebhookQueue(AsyncMock())
+    delays = [queue.backoff(n) for n in range(1, 20)]
+
+    assert delays[1] == 2 * delays[0]
+    assert delays == sorted(delays)
+    assert max(delays) == queue.backoff_max
+
+
+def _query(data):
+    query = MagicMock()
+    for method in ("select", "eq", "or_", "order", "limit", "update", "upsert"):
+        getattr(query, method).return_value = query
+    query.execute.return_value.data = data
+    return query
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_on_last_attempt_is_dead_not_reclaimed():
+    handler = AsyncMock()
+    queue = WebhookQueue(handler)
+    exhausted = {"id": "row-1", "status": "processing", "attempts": queue.max_attempts}
+    retryable = {"id": "row-2", "status": "processing", "attempts": 1}
+    candidates = _query([exhausted, retryable])
+    bury, claim = _query([exhausted]), _query([{**retryable, "attempts": 2}])
+    mock_sb = MagicMock()
+    mock_sb.table.side_effect = [candidates, bury, claim]
+
+    with patch("gamma.services.webhook_queue.get_supabase_admin_client", return_value=mock_sb):
+        claimed = await queue._claim()
+
+    assert claimed["id"] == "row-2"
+    assert bury.update.call_args.args[0]["status"] == "dead"
+    bury.eq.assert_any_call("attempts", queue.max_attempts)
+    assert claim.update.call_args.args[0]["attempts"] == 2
+    assert queue.stats()["dead"] == 1
+
+
+@pytest.mark.asyncio
+async def test_push_for_existing_job_does_not_write():
+    tables = {"projects": _query([{"id": "p1"}]), "training_jobs": _query([{"id": "j1"}])}
+    mock_sb = MagicMock()
+    mock_sb.table.side_effect = lambda name: tables[name]
+    with patch("gamma.routers.webhooks.get_supabase_admin_client", return_value=mock_sb):
+        result = await webhooks.process_event("push", PUSH)
+
+    assert result == {"status": "exists", "job_id": "j1"}
+    tables["training_jobs"].upsert.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_repeated_workflow_run_is_a_no_op():
+    job = {
+        "id": "j1",
+        "project_id": "p1",
+        "mlflow_run_id": None,
+        "status": "completed",
+        "github_workflow_run_id": 42,
+    }
+    payload = {
+        "action": "in_progress",  # arrives after completion
+        "repository": {"full_name": "rsamf/gamma"},
+        "workflow_run": {"id": 42, "head_sha": "abc123"},
+    }
+    jobs = _query([job])
+    mock_sb = MagicMock()
+    mock_sb.table.return_value = jobs
+    with patch("gamma.routers.webhooks.get_supabase_admin_client", return_value=mock_sb):
+        result = await webhooks.process_event("workflow_run", payload)
+
+    assert result["status"] == "unchanged"
+    jobs.update.assert_not_called()